@@ -0,0 +1,252 @@
+from enum import Enum, auto
+
+# ----- Definições de Estado e Símbolo -----
+class State(Enum):
+    IDLE = auto()
+    IDLE_LEFT = auto()
+    WALK_RIGHT = auto()
+    WALK_LEFT = auto()
+    RUN_RIGHT = auto()
+    RUN_LEFT = auto()
+    CROUCH = auto()
+    CROUCH_LEFT = auto()
+    CROUCH_WALK = auto()
+    CROUCH_WALK_LEFT = auto()
+    JUMP = auto()
+    JUMP_LEFT = auto()
+    RAIKIRI = auto()
+    RAIKIRI_LEFT = auto()
+    ATTACK = auto()
+    ATTACK_LEFT = auto()
+    ATTACK_CROUCH = auto()
+    ATTACK_CROUCH_LEFT = auto()
+    ATTACK_RUN = auto()
+    ATTACK_RUN_LEFT = auto()
+    ATTACK_UP = auto()
+    ATTACK_UP_LEFT = auto()
+    SHARINGAN = auto()
+    SHARINGAN_LEFT = auto()
+    WIN = auto()
+    WIN_LEFT = auto()
+    NINDOG_RIGHT = auto()
+    NINDOG_LEFT = auto()
+
+
+# Símbolos de entrada (None equivale a nenhuma tecla)
+Symbol = str
+
+# ----- Tabela de Transições (δ) -----
+# Chave: (estado_atual, símbolo) -> próximo estado
+transitions: dict[tuple[State, Symbol], State] = {
+    (State.IDLE,      'A'): State.WALK_LEFT,
+    (State.IDLE,      'D'): State.WALK_RIGHT,
+    (State.IDLE,      'SHIFT+A'): State.RUN_LEFT,
+    (State.IDLE,      'SHIFT+D'): State.RUN_RIGHT,
+    (State.IDLE,      'S'): State.CROUCH,
+    (State.IDLE,      'S+A'): State.CROUCH_WALK_LEFT,
+    (State.IDLE,      'S+D'): State.CROUCH_WALK,
+    (State.IDLE,      'SPACE'): State.JUMP,
+    (State.IDLE,      'R+T'): State.RAIKIRI,
+    (State.IDLE,        'H'): State.ATTACK,
+    (State.IDLE,      None): State.IDLE,
+    (State.IDLE,    'U'): State.ATTACK_UP,
+    (State.IDLE,      'J'): State.SHARINGAN,
+    (State.IDLE,      'P'): State.WIN,
+    (State.IDLE,      'M'): State.NINDOG_RIGHT,
+
+
+
+
+
+    (State.IDLE_LEFT, 'A'): State.WALK_LEFT,
+    (State.IDLE_LEFT, 'D'): State.WALK_RIGHT,
+    (State.IDLE_LEFT, 'SHIFT+A'): State.RUN_LEFT,
+    (State.IDLE_LEFT, 'SHIFT+D'): State.RUN_RIGHT,
+    (State.IDLE_LEFT, 'S'): State.CROUCH_LEFT,
+    (State.IDLE_LEFT, 'S+A'): State.CROUCH_WALK_LEFT,
+    (State.IDLE_LEFT, 'S+D'): State.CROUCH_WALK,
+    (State.IDLE_LEFT, 'SPACE'): State.JUMP_LEFT,
+    (State.IDLE_LEFT, 'R+T'): State.RAIKIRI_LEFT,
+    (State.IDLE_LEFT, None): State.IDLE_LEFT,
+    (State.IDLE_LEFT,   'H'): State.ATTACK_LEFT,
+    (State.IDLE_LEFT, 'U'): State.ATTACK_UP_LEFT,
+    (State.IDLE_LEFT, 'J'): State.SHARINGAN_LEFT,
+    (State.IDLE_LEFT, 'P'): State.WIN_LEFT,
+    (State.IDLE_LEFT, 'M'): State.NINDOG_LEFT,
+
+
+    (State.WALK_RIGHT, 'D'): State.WALK_RIGHT,
+    (State.WALK_RIGHT, 'A'): State.WALK_LEFT,
+    (State.WALK_RIGHT, 'SHIFT+D'): State.RUN_RIGHT,
+    (State.WALK_RIGHT, 'S'): State.CROUCH,
+    (State.WALK_RIGHT, 'SPACE'): State.JUMP,
+    (State.WALK_RIGHT, None): State.IDLE,
+    (State.WALK_RIGHT, 'H'): State.ATTACK,
+    (State.WALK_RIGHT, 'R+T'): State.WALK_RIGHT,
+    (State.WALK_RIGHT, 'U'): State.ATTACK_UP,
+    (State.WALK_RIGHT, 'P'): State.WALK_RIGHT,
+
+    (State.WALK_LEFT,  'A'): State.WALK_LEFT,
+    (State.WALK_LEFT,  'D'): State.WALK_RIGHT,
+    (State.WALK_LEFT,  'SHIFT+A'): State.RUN_LEFT,
+    (State.WALK_LEFT,  'S'): State.CROUCH_LEFT,
+    (State.WALK_LEFT,  'SPACE'): State.JUMP_LEFT,
+    (State.WALK_LEFT,  None): State.IDLE_LEFT,
+    (State.WALK_LEFT, 'H'): State.ATTACK_LEFT,
+    (State.WALK_LEFT, 'R+T'): State.WALK_LEFT,
+    (State.WALK_LEFT, 'U'): State.ATTACK_UP_LEFT,
+    (State.WALK_LEFT, 'P'): State.WALK_LEFT,
+
+    (State.RUN_RIGHT,  'SHIFT+D'): State.RUN_RIGHT,
+    (State.RUN_RIGHT,  'SHIFT+A'): State.RUN_LEFT,
+    (State.RUN_RIGHT,  'D'): State.WALK_RIGHT,
+    (State.RUN_RIGHT,  'A'): State.WALK_LEFT,
+    (State.RUN_RIGHT,  'S'): State.CROUCH,
+    (State.RUN_RIGHT,  'SPACE'): State.JUMP,
+    (State.RUN_RIGHT,  None): State.IDLE,
+    (State.RUN_RIGHT, 'H'): State.ATTACK_RUN,
+    (State.RUN_RIGHT, 'R+T'): State.RUN_RIGHT,
+    (State.RUN_RIGHT, 'U'): State.ATTACK_UP,
+    (State.RUN_RIGHT, 'P'): State.RUN_RIGHT,
+
+    (State.RUN_LEFT,   'SHIFT+A'): State.RUN_LEFT,
+    (State.RUN_LEFT,  'SHIFT+D'): State.RUN_RIGHT,
+    (State.RUN_LEFT,   'A'): State.WALK_LEFT,
+    (State.RUN_LEFT,   'D'): State.WALK_RIGHT,
+    (State.RUN_LEFT,   'S'): State.CROUCH_LEFT,
+    (State.RUN_LEFT,   'SPACE'): State.JUMP_LEFT,
+    (State.RUN_LEFT,   None): State.IDLE_LEFT,
+    (State.RUN_LEFT, 'H'): State.ATTACK_RUN_LEFT,
+    (State.RUN_LEFT, 'R+T'): State.RUN_LEFT,
+    (State.RUN_LEFT, 'U'): State.ATTACK_UP_LEFT,
+    (State.RUN_LEFT, 'P'): State.RUN_LEFT,
+
+
+
+    (State.CROUCH,     'S'): State.CROUCH,
+    (State.CROUCH,     'S+A'): State.CROUCH_WALK_LEFT,
+    (State.CROUCH,     'S+D'): State.CROUCH_WALK,
+    (State.CROUCH,     'SPACE'): State.JUMP,
+    (State.CROUCH,     None): State.IDLE,
+    (State.CROUCH,     'R+T'): State.CROUCH,
+    (State.CROUCH,     'H'): State.ATTACK_CROUCH,
+    (State.CROUCH,     'U'): State.ATTACK_UP,
+    (State.CROUCH,     'P'): State.CROUCH,
+
+    (State.CROUCH_LEFT,'S'): State.CROUCH_LEFT,
+    (State.CROUCH_LEFT,'S+A'): State.CROUCH_WALK_LEFT,
+    (State.CROUCH_LEFT,'S+D'): State.CROUCH_WALK,
+    (State.CROUCH_LEFT,'SPACE'): State.JUMP_LEFT,
+    (State.CROUCH_LEFT, None): State.IDLE_LEFT,
+    (State.CROUCH_LEFT, 'R+T'): State.CROUCH_LEFT,
+    (State.CROUCH_LEFT,'H'): State.ATTACK_CROUCH_LEFT,
+    (State.CROUCH_LEFT, 'U'): State.ATTACK_UP_LEFT,
+    (State.CROUCH_LEFT, 'P'): State.CROUCH_LEFT,
+
+    (State.CROUCH_WALK,'S+D'): State.CROUCH_WALK,
+    (State.CROUCH_WALK,'S+A'): State.CROUCH_WALK_LEFT,
+    (State.CROUCH_WALK,'S'): State.CROUCH,
+    (State.CROUCH_WALK,'SPACE'): State.JUMP,
+    (State.CROUCH_WALK, None): State.CROUCH,
+    (State.CROUCH_WALK, 'R+T'): State.CROUCH_WALK,
+    (State.CROUCH_WALK, 'H'): State.ATTACK_CROUCH,
+    (State.CROUCH_WALK, 'U'): State.ATTACK_UP,
+    (State.CROUCH_WALK, 'P'): State.CROUCH_WALK,
+
+    (State.CROUCH_WALK_LEFT,'S+A'): State.CROUCH_WALK_LEFT,
+    (State.CROUCH_WALK_LEFT,'S+D'): State.CROUCH_WALK,
+    (State.CROUCH_WALK_LEFT,'S'): State.CROUCH_LEFT,
+    (State.CROUCH_WALK_LEFT,'SPACE'): State.JUMP_LEFT,
+    (State.CROUCH_WALK_LEFT, None): State.CROUCH_LEFT,
+    (State.CROUCH_WALK_LEFT, 'R+T'): State.CROUCH_WALK_LEFT,
+    (State.CROUCH_WALK_LEFT, 'H'): State.ATTACK_CROUCH_LEFT,
+    (State.CROUCH_WALK_LEFT, 'U'): State.ATTACK_UP_LEFT,
+    (State.CROUCH_WALK_LEFT, 'P'): State.CROUCH_WALK_LEFT,
+
+    # Jump and Raikiri preserve
+    (State.JUMP, None): State.JUMP,
+    (State.JUMP_LEFT, None): State.JUMP_LEFT,
+    (State.RAIKIRI, None): State.RAIKIRI,
+    (State.RAIKIRI_LEFT, None): State.RAIKIRI_LEFT,
+
+    # Attack preserve
+    (State.ATTACK, None): State.ATTACK,
+    (State.ATTACK_LEFT, None): State.ATTACK_LEFT,
+    (State.ATTACK_CROUCH, None): State.ATTACK_CROUCH,
+    (State.ATTACK_CROUCH_LEFT, None): State.ATTACK_CROUCH_LEFT,
+    (State.ATTACK_RUN, None): State.ATTACK_RUN,
+    (State.ATTACK_RUN_LEFT, None): State.ATTACK_RUN_LEFT,
+    (State.ATTACK_UP, None): State.ATTACK_UP,
+    (State.ATTACK_UP_LEFT, None): State.ATTACK_UP_LEFT,
+    (State.SHARINGAN, None): State.SHARINGAN,
+    (State.SHARINGAN_LEFT, None): State.SHARINGAN_LEFT,
+    (State.WIN, None): State.WIN,
+    (State.WIN_LEFT, None): State.WIN_LEFT,
+    (State.NINDOG_RIGHT, None): State.NINDOG_RIGHT,
+    (State.NINDOG_LEFT, None): State.NINDOG_LEFT,
+}
+
+
+# ----- Tabela δ compilada -----
+# Estados e símbolos viram índices inteiros; δ vira uma matriz densa
+# DELTA[estado][símbolo] -> próximo estado, já com o fallback de
+# transitions.get((estado, entrada), transitions.get((estado, None), State.IDLE))
+STATES = tuple(State)
+STATE_INDEX = {state: i for i, state in enumerate(STATES)}
+
+# Alfabeto de entrada, na ordem dos índices (0 = nenhuma tecla)
+SYMBOLS = (None, 'A', 'D', 'SHIFT+A', 'SHIFT+D', 'S', 'S+A', 'S+D',
+           'SPACE', 'H', 'R+T', 'U', 'J', 'P', 'M')
+SYMBOL_INDEX = {symbol: i for i, symbol in enumerate(SYMBOLS)}
+
+
+def compile_transitions(table=transitions, start=State.IDLE):
+    delta = []
+    for state in STATES:
+        default = table.get((state, None), start)
+        delta.append([STATE_INDEX[table.get((state, symbol), default)] for symbol in SYMBOLS])
+    return delta
+
+DELTA = compile_transitions()
+
+
+# Problemas da tabela: símbolos fora do alfabeto, estados sem (estado, None),
+# estados inalcançáveis a partir de `start` e células da matriz diferentes do dicionário
+def validate_transitions(table=transitions, delta=None, start=State.IDLE):
+    delta = compile_transitions(table, start) if delta is None else delta
+    problems = []
+    for (state, symbol) in table:
+        if symbol not in SYMBOL_INDEX:
+            problems.append(f"símbolo fora do alfabeto: ({state.name}, {symbol!r})")
+    for state in STATES:
+        if (state, None) not in table:
+            problems.append(f"sem transição (None): {state.name} vai para {start.name} sem tecla")
+
+    seen = {STATE_INDEX[start]}
+    stack = [STATE_INDEX[start]]
+    while stack:
+        for nxt in delta[stack.pop()]:
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    for i, state in enumerate(STATES):
+        if i not in seen:
+            problems.append(f"inalcançável a partir de {start.name}: {state.name}")
+
+    for i, state in enumerate(STATES):
+        for j, symbol in enumerate(SYMBOLS):
+            expected = table.get((state, symbol), table.get((state, None), start))
+            if STATES[delta[i][j]] != expected:
+                problems.append(f"δ({state.name}, {symbol!r}) compilado como "
+                                f"{STATES[delta[i][j]].name}, esperado {expected.name}")
+    return problems
+
+
+# Uso: python afd.py  (valida a tabela δ)
+if __name__ == '__main__':
+    import sys
+    problems = validate_transitions()
+    for problem in problems:
+        print(problem)
+    print(f"{len(STATES)} estados × {len(SYMBOLS)} símbolos, {len(problems)} problema(s)")
+    sys.exit(1 if problems else 0)
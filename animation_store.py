@@ -0,0 +1,143 @@
+# Armazém de animações sob demanda: funciona como o dicionário `frames`, mas só
+# carrega uma animação quando o estado é usado pela primeira vez, respeita um
+# orçamento de memória (bytes de pixels) e descarta as menos usadas recentemente.
+import time
+from collections import OrderedDict, deque
+
+from assets import ANIMATIONS, flip_frame, load_frames
+
+
+# Cria a função que carrega uma animação; com `mirrors`, os estados *_LEFT
+# são gerados virando os PNGs da direita em vez de ler espelhadas/
+def make_loader(scale=1.0, animations=ANIMATIONS, mirrors=None):
+    def load(state):
+        if mirrors and state in mirrors:
+            right = load_frames(*animations[mirrors[state]], scale)
+            return [flip_frame(frame) for frame in right]
+        return load_frames(*animations[state], scale)
+    return load
+
+# Bytes de pixels ocupados por uma lista de frames (cada recorte compartilhado uma vez)
+def frames_nbytes(frames):
+    crops = {id(frame.surface): frame.surface for frame in frames}
+    return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in crops.values())
+
+
+class AnimationStore:
+    def __init__(self, loader, states, budget_bytes=None, transitions=None, pinned=()):
+        self.loader = loader
+        self.states = list(states)
+        self.budget_bytes = budget_bytes
+        self.pinned = set(pinned)
+        self.resident = OrderedDict()  # estado -> frames, do menos para o mais recente
+        self.sizes = {}
+        self.current = None
+        self.queue = deque()
+
+        # sucessores de cada estado em um passo da tabela δ
+        self.successors = {}
+        for (src, _), dst in (transitions or {}).items():
+            if dst != src:
+                self.successors.setdefault(src, []).append(dst)
+
+        self.hits = 0
+        self.misses = 0
+        self.stalls = 0
+        self.stall_ms = 0.0
+        self.prefetched = 0
+        self.evictions = 0
+
+    # ----- interface de dicionário -----
+    def __getitem__(self, state):
+        frames = self.resident.get(state)
+        self.current = state
+        if frames is not None:
+            self.hits += 1
+            self.resident.move_to_end(state)
+            return frames
+        if state not in self.states:
+            raise KeyError(state)
+        self.misses += 1
+        # carga síncrona no caminho do desenho: conta como travada
+        t0 = time.perf_counter()
+        frames = self._load(state)
+        self.stalls += 1
+        self.stall_ms += (time.perf_counter() - t0) * 1000
+        return frames
+
+    def __contains__(self, state):
+        return state in self.states
+
+    def __len__(self):
+        return len(self.states)
+
+    def __iter__(self):
+        return iter(self.states)
+
+    def keys(self):
+        return list(self.states)
+
+    # ----- carga e descarte -----
+    def _load(self, state, protected=()):
+        frames = self.loader(state)
+        self.resident[state] = frames
+        self.sizes[state] = frames_nbytes(frames)
+        self._evict({state, self.current, *protected})
+        return frames
+
+    # Descarta as animações menos recentes até caber no orçamento
+    def _evict(self, protected):
+        if self.budget_bytes is None:
+            return
+        for state in list(self.resident):
+            if self.bytes_resident <= self.budget_bytes:
+                break
+            if state in protected or state in self.pinned:
+                continue
+            del self.resident[state]
+            del self.sizes[state]
+            self.evictions += 1
+
+    @property
+    def bytes_resident(self):
+        return sum(self.sizes.values())
+
+    # ----- pré-carga -----
+    # Enfileira os estados alcançáveis a partir de `state` em um passo
+    def prefetch(self, state):
+        self.queue.clear()
+        for nxt in self.successors.get(state, ()):
+            if nxt not in self.resident and nxt not in self.queue:
+                self.queue.append(nxt)
+
+    # Carrega até `max_loads` estados da fila (chamar uma vez por frame, fora do desenho)
+    def pump(self, max_loads=1):
+        loaded = 0
+        protected = self.successors.get(self.current, ())
+        while self.queue and loaded < max_loads:
+            state = self.queue.popleft()
+            if state in self.resident:
+                continue
+            self._load(state, protected)
+            if self.budget_bytes is not None and self.bytes_resident > self.budget_bytes:
+                # não cabe nem descartando o resto: desiste da pré-carga
+                del self.resident[state]
+                del self.sizes[state]
+                self.evictions += 1
+                self.queue.clear()
+                break
+            self.prefetched += 1
+            loaded += 1
+        return loaded
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stalls': self.stalls,
+            'stall_ms': round(self.stall_ms, 2),
+            'prefetched': self.prefetched,
+            'evictions': self.evictions,
+            'resident': len(self.resident),
+            'bytes_resident': self.bytes_resident,
+        }
@@ -0,0 +1,472 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pygame
+
+from afd import State
+
+# Diretórios de sprites
+base = os.path.dirname(os.path.abspath(__file__))
+stand_folder       = os.path.join(base, 'Sprite', 'Stand')
+stand_left_folder  = os.path.join(stand_folder, 'espelhadas')
+walk_r_folder      = os.path.join(base, 'Sprite', 'walk')
+walk_l_folder      = os.path.join(walk_r_folder, 'espelhadas')
+run_r_folder       = os.path.join(base, 'Sprite', 'Run')
+run_l_folder       = os.path.join(run_r_folder, 'espelhadas')
+crouch_folder      = os.path.join(base, 'Sprite', 'crouch')
+crouch_left_folder = os.path.join(crouch_folder, 'espelhadas')
+crouch_walk_folder = os.path.join(base, 'Sprite', 'crouchWalk')
+crouch_walk_left   = os.path.join(crouch_walk_folder, 'espelhadas')
+jump_r_folder      = os.path.join(base, 'Sprite', 'jump')
+jump_l_folder      = os.path.join(jump_r_folder, 'espelhadas')
+raikiri_r_folder = os.path.join(base, 'Sprite', 'raikiri')
+raikiri_l_folder = os.path.join(raikiri_r_folder, 'espelhadas')
+attack_r_folder    = os.path.join(base, 'Sprite', 'attack')
+attack_l_folder    = os.path.join(attack_r_folder, 'espelhadas')
+attack_c_folder    = os.path.join(base, 'Sprite', 'attackCombo')
+attack_c_l_folder  = os.path.join(attack_c_folder, 'espelhadas')
+attack_run_folder    = os.path.join(base, 'Sprite', 'attackCombo')
+attack_run_l_folder  = os.path.join(attack_run_folder, 'espelhadas')
+attack_up_folder   = os.path.join(base, 'Sprite', 'attackCombo')
+attack_up_l_folder = os.path.join(attack_up_folder, 'espelhadas')
+sharingan_r_folder = os.path.join(base, 'Sprite', 'sharingan')
+sharingan_l_folder = os.path.join(sharingan_r_folder, 'espelhadas')
+win_r_folder = os.path.join(base, 'Sprite', 'win')
+win_l_folder = os.path.join(win_r_folder, 'espelhadas')
+nindog_r_folder = os.path.join(base,'Sprite', 'ninDogs')
+nindog_l_folder = os.path.join(nindog_r_folder,'espelhadas')
+
+# Animações do personagem: estado -> (pasta, prefixo, quantidade de frames)
+ANIMATIONS = {
+    State.IDLE: (stand_folder, 'stand', 6),
+    State.IDLE_LEFT: (stand_left_folder, 'stand', 6),
+    State.WALK_RIGHT: (walk_r_folder, 'walk', 6),
+    State.WALK_LEFT: (walk_l_folder, 'walk', 6),
+    State.RUN_RIGHT: (run_r_folder, 'run', 6),
+    State.RUN_LEFT: (run_l_folder, 'run', 6),
+    State.CROUCH: (crouch_folder, 'crouch', 2),
+    State.CROUCH_LEFT: (crouch_left_folder, 'crouch', 2),
+    State.CROUCH_WALK: (crouch_walk_folder, 'crouchWalk', 6),
+    State.CROUCH_WALK_LEFT: (crouch_walk_left, 'crouchWalk', 6),
+    State.JUMP: (jump_r_folder, 'jump', 4),
+    State.JUMP_LEFT: (jump_l_folder, 'jump', 4),
+    State.RAIKIRI: (raikiri_r_folder, 'raikiri', 26),
+    State.RAIKIRI_LEFT: (raikiri_l_folder, 'raikiri', 26),
+    State.ATTACK: (attack_r_folder, 'attack1', 13),
+    State.ATTACK_LEFT: (attack_l_folder, 'attack1', 13),
+    State.ATTACK_CROUCH: (attack_c_folder, 'attack(crouch)', 5),
+    State.ATTACK_CROUCH_LEFT: (attack_c_l_folder, 'attack(crouch)', 5),
+    State.ATTACK_RUN: (attack_run_folder, 'attack(run)', 6),
+    State.ATTACK_RUN_LEFT: (attack_run_l_folder, 'attack(run)', 6),
+    State.ATTACK_UP: (attack_up_folder, 'attack(up)', 5),
+    State.ATTACK_UP_LEFT: (attack_up_l_folder, 'attack(up)', 5),
+    State.SHARINGAN: (sharingan_r_folder, 'sharingan', 21),
+    State.SHARINGAN_LEFT: (sharingan_l_folder, 'sharingan', 21),
+    State.WIN: (win_r_folder, 'win', 11),
+    State.WIN_LEFT: (win_l_folder, 'win', 11),
+    State.NINDOG_RIGHT: (nindog_r_folder, 'ninDogs', 25),
+    State.NINDOG_LEFT: (nindog_l_folder, 'ninDogs', 25),
+}
+
+# Pakkun, o cão ninja (Sprite/pakkun): no meio da invocação, os frames pakkun-15.<i>
+# mostram o cão sentado (3 a 12) e correndo (13 a 20), virado para a direita
+pakkun_folder = os.path.join(base, 'Sprite', 'pakkun')
+PAKKUN_ANIMATIONS = {
+    'sit': [os.path.join(pakkun_folder, f'pakkun-15.{i}.png') for i in range(3, 13)],
+    'run': [os.path.join(pakkun_folder, f'pakkun-15.{i}.png') for i in range(13, 21)],
+}
+
+# Animações viradas para a esquerda -> animação equivalente virada para a direita
+MIRRORS = {
+    State.IDLE_LEFT: State.IDLE,
+    State.WALK_LEFT: State.WALK_RIGHT,
+    State.RUN_LEFT: State.RUN_RIGHT,
+    State.CROUCH_LEFT: State.CROUCH,
+    State.CROUCH_WALK_LEFT: State.CROUCH_WALK,
+    State.JUMP_LEFT: State.JUMP,
+    State.RAIKIRI_LEFT: State.RAIKIRI,
+    State.ATTACK_LEFT: State.ATTACK,
+    State.ATTACK_CROUCH_LEFT: State.ATTACK_CROUCH,
+    State.ATTACK_RUN_LEFT: State.ATTACK_RUN,
+    State.ATTACK_UP_LEFT: State.ATTACK_UP,
+    State.SHARINGAN_LEFT: State.SHARINGAN,
+    State.WIN_LEFT: State.WIN,
+    State.NINDOG_LEFT: State.NINDOG_RIGHT,
+}
+
+# Bundle de atlas gerado por `python assets.py build-atlas`
+ATLAS_DIR = os.path.join(base, 'build', 'atlas')
+ATLAS_INDEX = 'atlas.json'
+ATLAS_VERSION = 1
+ATLAS_PAGE_SIZE = 2048
+ATLAS_PADDING = 1  # pixels vazios entre frames na página
+
+
+# Carrega imagem com canal alpha
+def load_image(path):
+    return pygame.image.load(path).convert_alpha()
+
+# Caminhos dos frames de uma animação, na ordem de reprodução
+def frame_paths(folder, prefix, count):
+    return [os.path.join(folder, f"{prefix}-{i}.png") for i in range(1, count + 1)]
+
+# Chave do conteúdo de um frame de origem: hash dos pixels recortados e o tamanho do recorte
+def content_key(img, rect):
+    data = pygame.image.tobytes(img.subsurface(rect), 'RGBA') if rect.width and rect.height else b''
+    return hashlib.blake2b(data, digest_size=16).digest(), rect.size
+
+# Frame final de uma animação: só os pixels visíveis (`surface`, já escalados), a
+# posição deles (`offset`) dentro do quadro da animação e o tamanho do quadro (`size`,
+# o maior frame da animação). O recorte é compartilhado por todos os frames com o
+# mesmo conteúdo, de qualquer animação, cada um com o seu deslocamento. Nas consultas
+# de tamanho responde como uma Surface do quadro; para desenhar, blit_modes.blit_frame.
+class Frame(NamedTuple):
+    surface: pygame.Surface
+    offset: tuple
+    size: tuple
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    # Superfície do quadro inteiro, para quem precisa dos pixels no lugar (tela cheia, conferências)
+    def padded(self):
+        surf = pygame.Surface(self.size, pygame.SRCALPHA)
+        # soma sobre o quadro vazio: cópia exata, sem mistura pelo alpha
+        surf.blit(self.surface, self.offset, special_flags=pygame.BLEND_RGBA_ADD)
+        return surf
+
+# O mesmo frame virado na horizontal, dentro do mesmo quadro
+def flip_frame(frame):
+    surf, (x, y), (w, h) = frame
+    return Frame(pygame.transform.flip(surf, True, False), (w - x - surf.get_width(), y), (w, h))
+
+# Um recorte por conteúdo diferente: frames com os mesmos pixels visíveis na mesma escala
+# recebem o mesmo objeto, dentro da animação (poses repetidas do WIN e dos NINDOG_*) ou
+# entre animações (fim do SHARINGAN e do SHARINGAN_LEFT, início do RAIKIRI e do NINDOG_RIGHT).
+class FrameInterner:
+    def __init__(self):
+        self.surfaces = {}
+        self.total = 0
+        self.saved_bytes = 0
+
+    def get(self, key):
+        self.total += 1
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.saved_bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        return surf
+
+    def add(self, key, surf):
+        self.surfaces[key] = surf
+
+    def stats(self):
+        return {'frames': self.total, 'unique': len(self.surfaces),
+                'saved_mb': round(self.saved_bytes / 2**20, 1)}
+
+# Monta os frames finais: recortados, escalados e posicionados pelo midbottom no quadro
+# do maior frame da animação
+def compose_frames(images, rects, scale=1.0, interner=None):
+    frames = []
+    max_w = max(rect.width for rect in rects)
+    max_h = max(rect.height for rect in rects)
+    size = (int(max_w * scale), int(max_h * scale))
+    for img, rect in zip(images, rects):
+        dest = rect.copy()
+        dest.midbottom = (max_w // 2, max_h)
+        offset = (int(dest.x * scale), int(dest.y * scale))
+        key = (content_key(img, rect), scale) if interner is not None else None
+        surf = interner.get(key) if key is not None else None
+        if surf is None:
+            surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+            surf.blit(img, (0, 0), rect)
+            # Escala aplicada aqui
+            if scale != 1.0:
+                surf = pygame.transform.scale(surf, (int(rect.width * scale), int(rect.height * scale)))
+            if key is not None:
+                interner.add(key, surf)
+        frames.append(Frame(surf, offset, size))
+    return frames
+
+# Carrega uma sequência de frames a partir da lista de arquivos
+def load_frame_files(paths, scale=1.0, interner=None):
+    images = [load_image(path) for path in paths]
+    rects = [img.get_bounding_rect() for img in images]
+    return compose_frames(images, rects, scale, interner)
+
+# Carrega sequência de frames a partir de pasta, prefixo e quantidade
+def load_frames(folder, prefix, count, scale=1.0, interner=None):
+    return load_frame_files(frame_paths(folder, prefix, count), scale, interner)
+
+
+# ----- Espelhamento em memória -----
+# Só as animações viradas para a direita (as pastas espelhadas/ não são lidas)
+def right_facing(animations=ANIMATIONS, mirrors=MIRRORS):
+    return {state: spec for state, spec in animations.items() if state not in mirrors}
+
+# Gera cada animação *_LEFT virando horizontalmente os frames da direita, uma vez só
+def mirror_frames(frames, mirrors=MIRRORS):
+    mirrored = dict(frames)
+    for left, right in mirrors.items():
+        mirrored[left] = [flip_frame(frame) for frame in frames[right]]
+    return mirrored
+
+# Sequência virada sob demanda: cada frame é espelhado no primeiro desenho e fica no cache
+class FlippedFrames:
+    def __init__(self, frames, cache):
+        self.frames = frames
+        self.cache = cache
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, i):
+        return self.cache.get(self.frames[i])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+# Cache LRU de superfícies espelhadas, limitado em quantidade de superfícies; um Frame
+# vira o recorte compartilhado (uma vez para todos os frames que o usam) e o deslocamento
+class FlipCache:
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+
+    def get(self, surf):
+        if isinstance(surf, Frame):
+            crop, (x, y), (w, h) = surf
+            return Frame(self.get(crop), (w - x - crop.get_width(), y), (w, h))
+        key = id(surf)
+        entry = self.surfaces.get(key)
+        if entry is not None and entry[0] is surf:
+            self.surfaces.move_to_end(key)
+            return entry[1]
+        flipped = pygame.transform.flip(surf, True, False)
+        # guarda a origem junto para o id() não ser reaproveitado por outra superfície
+        self.surfaces[key] = (surf, flipped)
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return flipped
+
+# Dicionário de frames que guarda só o lado direito e vira o esquerdo na hora do desenho
+class MirroredFrames(dict):
+    def __init__(self, frames, mirrors=MIRRORS, cache=None):
+        super().__init__(frames)
+        self.cache = cache if cache is not None else FlipCache()
+        for left, right in mirrors.items():
+            self[left] = FlippedFrames(frames[right], self.cache)
+
+# Compara o espelhamento em memória com os PNGs de espelhadas/.
+# Devolve (estado, frame, tamanho virado, tamanho do PNG, fração de pixels diferentes)
+# para cada frame que não bate.
+def verify_mirrors(animations=ANIMATIONS, mirrors=MIRRORS, tolerance=0.0):
+    shipped = {left: load_frames(*animations[left]) for left in mirrors}
+    flipped = mirror_frames({right: load_frames(*animations[right])
+                             for right in set(mirrors.values())}, mirrors)
+    report = []
+    for left in mirrors:
+        for i, (a, b) in enumerate(zip(flipped[left], shipped[left])):
+            a, b = a.padded(), b.padded()
+            if a.get_size() != b.get_size():
+                report.append((left, i, a.get_size(), b.get_size(), 1.0))
+                continue
+            pa = pygame.image.tobytes(a, 'RGBA')
+            pb = pygame.image.tobytes(b, 'RGBA')
+            if pa == pb:
+                continue
+            diff = sum(pa[j:j + 4] != pb[j:j + 4] for j in range(0, len(pa), 4))
+            ratio = diff / (a.get_width() * a.get_height())
+            if ratio > tolerance:
+                report.append((left, i, a.get_size(), b.get_size(), ratio))
+    return report
+
+
+# ----- Atlas de sprites -----
+def _rel(path):
+    return os.path.relpath(path, base).replace(os.sep, '/')
+
+# Assinatura (mtime, tamanho) de cada PNG usado pelas animações
+def source_stamps(animations=ANIMATIONS):
+    stamps = {}
+    for folder, prefix, count in animations.values():
+        for path in frame_paths(folder, prefix, count):
+            st = os.stat(path)
+            stamps[_rel(path)] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+# Empacota retângulos em prateleiras (shelf packing), abrindo novas páginas quando enche
+def _pack(sizes, page_size, padding):
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+    placements = [None] * len(sizes)
+    page = x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if w + padding > page_size or h + padding > page_size:
+            raise ValueError(f"frame {w}x{h} não cabe numa página de {page_size}px")
+        if x + w + padding > page_size:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h + padding > page_size:
+            page, x, y, shelf_h = page + 1, 0, 0, 0
+        placements[i] = (page, x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+    return placements
+
+# Gera as páginas do atlas e o índice com o retângulo de corte, âncora e animação de cada frame
+def build_atlas(out_dir=ATLAS_DIR, animations=ANIMATIONS, page_size=ATLAS_PAGE_SIZE,
+                padding=ATLAS_PADDING):
+    sources = {}
+    for folder, prefix, count in animations.values():
+        for path in frame_paths(folder, prefix, count):
+            if path not in sources:
+                img = load_image(path)
+                sources[path] = (img, img.get_bounding_rect())
+
+    paths = list(sources)
+    sizes = [(max(1, sources[p][1].width), max(1, sources[p][1].height)) for p in paths]
+    placements = dict(zip(paths, _pack(sizes, page_size, padding)))
+
+    n_pages = max(page for page, _, _ in placements.values()) + 1
+    pages = [pygame.Surface((page_size, page_size), pygame.SRCALPHA) for _ in range(n_pages)]
+    for path, (page, x, y) in placements.items():
+        img, trim = sources[path]
+        pages[page].blit(img, (x, y), trim)
+
+    os.makedirs(out_dir, exist_ok=True)
+    page_files = []
+    for n, surf in enumerate(pages):
+        # recorta a última página até a área realmente usada
+        used = surf.get_bounding_rect()
+        surf = surf.subsurface((0, 0, used.right or 1, used.bottom or 1))
+        name = f"atlas-{n}.png"
+        pygame.image.save(surf, os.path.join(out_dir, name))
+        page_files.append(name)
+
+    index = {
+        'version': ATLAS_VERSION,
+        'sources': source_stamps(animations),
+        'pages': page_files,
+        'animations': {},
+    }
+    for state, (folder, prefix, count) in animations.items():
+        entries = []
+        for path in frame_paths(folder, prefix, count):
+            img, trim = sources[path]
+            page, x, y = placements[path]
+            entries.append({
+                'source': _rel(path),
+                'page': page,
+                'rect': [x, y, trim.width, trim.height],
+                'trim': [trim.x, trim.y, trim.width, trim.height],
+                'anchor': [trim.centerx, trim.bottom],
+            })
+        index['animations'][state.name] = entries
+
+    with open(os.path.join(out_dir, ATLAS_INDEX), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+# Lê o índice do atlas; devolve None se não existir ou estiver desatualizado
+def load_atlas_index(out_dir=ATLAS_DIR, animations=ANIMATIONS):
+    try:
+        with open(os.path.join(out_dir, ATLAS_INDEX), encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != ATLAS_VERSION:
+        return None
+    if any(state.name not in index['animations'] for state in animations):
+        return None
+    try:
+        if index['sources'] != source_stamps(animations):
+            return None
+    except OSError:
+        return None
+    if not all(os.path.exists(os.path.join(out_dir, p)) for p in index['pages']):
+        return None
+    return index
+
+# Recria os frames de cada animação a partir das páginas do atlas
+def load_frames_from_atlas(index, out_dir=ATLAS_DIR, animations=ANIMATIONS, scale=1.0, interner=None):
+    pages = [load_image(os.path.join(out_dir, name)) for name in index['pages']]
+    frames = {}
+    for state in animations:
+        images, rects = [], []
+        for entry in index['animations'][state.name]:
+            x, y, w, h = entry['rect']
+            images.append(pages[entry['page']].subsurface((x, y, w, h)))
+            rects.append(pygame.Rect(0, 0, w, h))
+        frames[state] = compose_frames(images, rects, scale, interner)
+    return frames
+
+# Frames e MB de pixels do dicionário de animações: com cada frame no quadro inteiro
+# da animação, como uma cópia própria, e com os recortes compartilhados de fato
+def dedup_report(frames):
+    total = padded = 0
+    unique = {}
+    for seq in frames.values():
+        for frame in seq:
+            surf = frame.surface
+            total += 1
+            padded += frame.get_width() * frame.get_height() * surf.get_bytesize()
+            unique[id(surf)] = surf.get_width() * surf.get_height() * surf.get_bytesize()
+    mb = 2 ** 20
+    return {'frames': total, 'unique': len(unique), 'padded_mb': round(padded / mb, 1),
+            'shared_mb': round(sum(unique.values()) / mb, 1)}
+
+# Carrega todas as animações, usando o atlas quando ele estiver em dia; recortes
+# repetidos viram a mesma superfície (passe um FrameInterner para ver as contagens)
+def load_all_frames(scale=1.0, animations=ANIMATIONS, use_atlas=True, atlas_dir=ATLAS_DIR, interner=None):
+    if interner is None:
+        interner = FrameInterner()
+    if use_atlas:
+        index = load_atlas_index(atlas_dir, animations)
+        if index is not None:
+            return load_frames_from_atlas(index, atlas_dir, animations, scale, interner)
+    return {state: load_frames(folder, prefix, count, scale, interner)
+            for state, (folder, prefix, count) in animations.items()}
+
+
+if __name__ == '__main__':
+    import sys
+
+    command = sys.argv[1:2]
+    if command not in (['build-atlas'], ['verify-mirrors'], ['dedup-report']):
+        print("uso: python assets.py build-atlas | verify-mirrors [tolerância] | dedup-report [escala]")
+        sys.exit(2)
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    if command == ['build-atlas']:
+        index = build_atlas()
+        n_frames = sum(len(entries) for entries in index['animations'].values())
+        print(f"atlas: {n_frames} frames, {len(index['pages'])} página(s) em {ATLAS_DIR}")
+    elif command == ['dedup-report']:
+        scale = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+        report = dedup_report(load_all_frames(scale, use_atlas=False))
+        print(f"{report['frames']} frames, {report['unique']} recortes diferentes (escala {scale:g})")
+        print(f"pixels: {report['padded_mb']} MB com cada frame no quadro inteiro, "
+              f"{report['shared_mb']} MB nos recortes compartilhados")
+    else:
+        tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+        report = verify_mirrors(tolerance=tolerance)
+        for state, i, size_flip, size_png, ratio in report:
+            print(f"{state.name:<20} frame {i + 1:>2}: virado {size_flip}, espelhadas/ {size_png},"
+                  f" {ratio:.1%} dos pixels diferentes")
+        total = sum(ANIMATIONS[left][2] for left in MIRRORS)
+        print(f"{total - len(report)}/{total} frames espelhados batem com espelhadas/")
+        sys.exit(1 if report else 0)
@@ -0,0 +1,159 @@
+# Carregamento de recursos em segundo plano: as threads leem, decodificam, cortam e
+# escalam os arquivos; a thread principal só faz convert()/convert_alpha() dos
+# resultados, alguns por frame, enquanto desenha a tela de progresso ou o jogo.
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, compose_frames, flip_frame, frame_paths
+
+# Estados que precisam estar prontos para o jogo começar
+ESSENTIAL_STATES = (State.IDLE, State.IDLE_LEFT, State.WALK_RIGHT, State.WALK_LEFT)
+
+
+# Ordem de carga: parado/andando primeiro, depois as animações curtas e por último as longas
+def load_order(animations=ANIMATIONS):
+    rest = sorted((s for s in animations if s not in ESSENTIAL_STATES),
+                  key=lambda s: animations[s][2])
+    return [s for s in ESSENTIAL_STATES if s in animations] + rest
+
+# Decodifica e monta uma animação (roda nas threads, sem convert_alpha)
+def decode_animation(folder, prefix, count, scale=1.0, flip=False):
+    images = [pygame.image.load(path) for path in frame_paths(folder, prefix, count)]
+    frames = compose_frames(images, [img.get_bounding_rect() for img in images], scale)
+    if flip:
+        frames = [flip_frame(frame) for frame in frames]
+    return frames
+
+# Decodifica uma imagem e opcionalmente a escala para `size` (roda nas threads)
+def decode_image(path, size=None):
+    img = pygame.image.load(path)
+    if size is not None:
+        img = pygame.transform.scale(img, size)
+    return img
+
+
+class AssetLoader:
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.pending = deque()     # (tipo, chave, future, extra), na ordem de envio
+        self.converting = deque()  # animações já decodificadas, convertidas frame a frame
+        self.frames = {}
+        self.images = {}
+        self.sounds = {}
+        self.total = 0
+        self.done = 0
+        self.t_start = time.perf_counter()
+        self.t_finished = None
+
+    # ----- envio (thread principal) -----
+    def add_animation(self, state, spec, scale=1.0, flip=False):
+        future = self.pool.submit(decode_animation, *spec, scale, flip)
+        self.pending.append(('animation', state, future, None))
+        self.total += 1
+
+    def add_image(self, key, path, size=None, alpha=False):
+        future = self.pool.submit(decode_image, path, size)
+        self.pending.append(('image', key, future, alpha))
+        self.total += 1
+
+    def add_sound(self, key, path, volume=1.0):
+        future = self.pool.submit(pygame.mixer.Sound, path)
+        self.pending.append(('sound', key, future, volume))
+        self.total += 1
+
+    # Enfileira todas as animações na ordem de load_order(); com `mirrors`,
+    # os estados *_LEFT vêm dos PNGs da direita virados
+    def add_animations(self, scale=1.0, animations=ANIMATIONS, mirrors=None):
+        for state in load_order(animations):
+            if mirrors and state in mirrors:
+                self.add_animation(state, animations[mirrors[state]], scale, flip=True)
+            else:
+                self.add_animation(state, animations[state], scale)
+
+    # ----- recebimento (thread principal) -----
+    # Processa resultados prontos até gastar `budget_ms`; devolve quantos itens terminaram
+    def poll(self, budget_ms=4.0):
+        deadline = time.perf_counter() + budget_ms / 1000
+        finished = 0
+        while time.perf_counter() < deadline:
+            if self.converting:
+                state, surfs, converted = self.converting[0]
+                frame = surfs[len(converted)]
+                converted.append(frame._replace(surface=frame.surface.convert_alpha()))
+                if len(converted) == len(surfs):
+                    self.converting.popleft()
+                    self.frames[state] = converted
+                    self._item_done()
+                    finished += 1
+                continue
+            ready = next((item for item in self.pending if item[2].done()), None)
+            if ready is None:
+                break
+            self.pending.remove(ready)
+            kind, key, future, extra = ready
+            result = future.result()
+            if kind == 'animation':
+                self.converting.append((key, result, []))
+                continue
+            if kind == 'image':
+                self.images[key] = result.convert_alpha() if extra else result.convert()
+            else:
+                result.set_volume(extra)
+                self.sounds[key] = result
+            self._item_done()
+            finished += 1
+        return finished
+
+    def _item_done(self):
+        self.done += 1
+        if self.done == self.total:
+            self.t_finished = time.perf_counter()
+            self.pool.shutdown(wait=False)
+
+    # True quando todas as chaves (estados, imagens ou sons) já estão prontas
+    def ready(self, keys):
+        return all(k in self.frames or k in self.images or k in self.sounds for k in keys)
+
+    @property
+    def finished(self):
+        return self.done == self.total
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    # Cancela o que ainda não começou e espera as threads em andamento
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Tela de carregamento: barra de progresso centralizada
+def draw_loading(screen, loader, font):
+    screen.fill((0, 0, 0))
+    w, h = screen.get_size()
+    bar = pygame.Rect(0, 0, w // 2, 24)
+    bar.center = (w // 2, h // 2)
+    pygame.draw.rect(screen, (80, 80, 80), bar, 2)
+    fill = bar.inflate(-6, -6)
+    fill.width = int(fill.width * loader.progress)
+    pygame.draw.rect(screen, (200, 30, 30), fill)
+    text = font.render(f"Carregando... {loader.done}/{loader.total}", True, (220, 220, 220))
+    screen.blit(text, text.get_rect(midbottom=(w // 2, bar.top - 12)))
+
+# Mostra a tela de carregamento até `keys` ficarem prontas; devolve False se a janela for fechada
+def run_loading_screen(screen, clock, loader, keys, budget_ms=8.0):
+    font = pygame.font.Font(None, 36)
+    while not loader.ready(keys):
+        for ev in pygame.event.get():
+            if ev.type == pygame.QUIT:
+                loader.shutdown()
+                return False
+        loader.poll(budget_ms)
+        draw_loading(screen, loader, font)
+        pygame.display.flip()
+        clock.tick(60)
+    return True
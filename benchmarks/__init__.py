@@ -0,0 +1,7 @@
+import sys
+
+
+# Valor de --nome=valor na linha de comando, ou `default`
+def option(name, default):
+    prefix = f'--{name}='
+    return next((a[len(prefix):] for a in sys.argv[1:] if a.startswith(prefix)), default)
@@ -0,0 +1,96 @@
+# Mede cada modo de blit (blit_modes.BLIT_MODES) em cada animação nesta máquina, sobre
+# uma tela opaca, confere que a imagem é a mesma do frame no quadro inteiro (o
+# pré-multiplicado pode diferir em 1 por arredondamento) e grava o mais rápido por
+# animação em build/blit_modes.json, lido pelo jogo com AFD_BLIT=auto. A coluna 'quadro'
+# é o blit do frame no quadro inteiro, como antes dos recortes, só como referência.
+# Uso: python -m benchmarks.blit_modes [rodadas] [--scale=4] [--out=build/blit_modes.json]
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from assets import ANIMATIONS, base, load_frames
+from benchmarks import option
+from blit_modes import BLIT_MODES, BLIT_MODES_PATH, blit_frame, optimize, save_choices
+
+SCREEN = (1920, 1080)
+REPEATS = 5
+TOLERANCE = 1  # diferença máxima por canal aceita em relação ao quadro inteiro
+
+
+# µs por blit: cada frame da animação desenhado `rounds` vezes, melhor de REPEATS
+def timed(screen, drawn, rect, rounds):
+    best = float('inf')
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for frame in drawn:
+                blit_frame(screen, frame, rect)
+        best = min(best, (time.perf_counter() - t0) / (rounds * len(drawn)))
+    return best * 1e6
+
+
+# Maior diferença por canal entre o modo e o frame no quadro inteiro, frame a frame
+def difference(background, padded, drawn, rect):
+    worst = 0
+    area = rect.clip(background.get_rect())
+    for surf, frame in zip(padded, drawn):
+        a, b = background.copy(), background.copy()
+        a.blit(surf, rect)
+        blit_frame(b, frame, rect)
+        pa = pygame.image.tobytes(a.subsurface(area), 'RGB')
+        pb = pygame.image.tobytes(b.subsurface(area), 'RGB')
+        if pa != pb:
+            worst = max(worst, max(abs(x - y) for x, y in zip(pa, pb)))
+    return worst
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    rounds = int(args[0]) if args else 20
+    scale = float(option('scale', 4))
+    out = option('out', BLIT_MODES_PATH)
+    pygame.display.init()
+    screen = pygame.display.set_mode(SCREEN)
+    background = pygame.image.load(os.path.join(base, 'Mapa', 'mapa4.jpg'))
+    background = pygame.transform.scale(background, SCREEN).convert()
+
+    print(f"µs por blit, melhor de {REPEATS}; * = escolhido; ! = imagem diferente do quadro inteiro")
+    print(f"{'animação':<20} {'frame':>9} {'quadro':>9} " + ' '.join(f"{mode:>11}" for mode in BLIT_MODES))
+    modes, timings = {}, {}
+    total_padded = total_best = 0
+    for state, spec in ANIMATIONS.items():
+        frames = load_frames(*spec, scale)
+        padded = [frame.padded() for frame in frames]
+        rect = frames[0].get_rect(midbottom=(SCREEN[0] // 2, SCREEN[1] - 50))
+        screen.blit(background, (0, 0))
+        reference = timed(screen, padded, rect, rounds)
+        row = {}
+        for mode in BLIT_MODES:
+            drawn = [optimize(frame, mode) for frame in frames]
+            screen.blit(background, (0, 0))
+            us = timed(screen, drawn, rect, rounds)
+            ok = difference(background, padded, drawn, rect) <= TOLERANCE
+            row[mode] = (us, ok)
+        best = min((mode for mode in BLIT_MODES if row[mode][1]), key=lambda mode: row[mode][0])
+        modes[state] = best
+        timings[state] = {mode: round(us, 2) for mode, (us, _) in row.items()}
+        total_padded += reference * len(frames)
+        total_best += row[best][0] * len(frames)
+        cells = ' '.join(f"{row[mode][0]:9.1f}{'*' if mode == best else ' '}{' ' if row[mode][1] else '!'}"
+                         for mode in BLIT_MODES)
+        size = 'x'.join(map(str, frames[0].get_size()))
+        print(f"{state.name:<20} {size:>9} {reference:9.1f} {cells}")
+    save_choices(modes, timings, out)
+    print(f"\num blit de cada frame de todas as animações: quadro inteiro {total_padded / 1000:.1f} ms, "
+          f"escolhidos {total_best / 1000:.1f} ms ({total_padded / total_best:.1f}×)")
+    print(f"escolhas gravadas em {out}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Custo da captura no loop principal a 60 FPS: um frame com fundo e sprite desenhado,
+# flip() e grab(), esperando o resto dos 16,7 ms como o clock.tick(60) do jogo. Compara
+# sem captura, fluxo cru (thread), PNG (processos) e PNG salvo dentro do loop, que é o
+# que um gravador ingênuo faria. Conta os frames descartados por falta de buffer livre.
+# Uso: python -m benchmarks.capture [frames] [LARGURAxALTURA] [--workers=2] [--ring=8]
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, base, load_frames
+from benchmarks import option
+from blit_modes import blit_frame
+from capture import CAPTURE_RING, CAPTURE_WORKERS, FrameCapture
+from timestep import TICK_MS
+
+
+# `grab(screen, i)` depois do flip(); devolve (ms de trabalho por frame, ms de grab por frame)
+def run(screen, background, frames, count, grab=None):
+    w, h = screen.get_size()
+    work, grabs = [], []
+    for i in range(count):
+        t0 = time.perf_counter()
+        screen.blit(background, (0, 0))
+        surf = frames[(i // 8) % len(frames)]
+        blit_frame(screen, surf, surf.get_rect(midbottom=((i * 8) % w, h - 50)))
+        pygame.display.flip()
+        t1 = time.perf_counter()
+        if grab is not None:
+            grab(screen, i)
+        t2 = time.perf_counter()
+        work.append((t2 - t0) * 1000)
+        grabs.append((t2 - t1) * 1000)
+        # o resto do frame, como o clock.tick(60)
+        time.sleep(max(0.0, TICK_MS / 1000 - (time.perf_counter() - t0)))
+    return work, grabs
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    count = int(args[0]) if args else 300
+    size = tuple(map(int, args[1].split('x'))) if len(args) > 1 else (1920, 1080)
+    workers = int(option('workers', CAPTURE_WORKERS))
+    ring = int(option('ring', CAPTURE_RING))
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+    background = pygame.image.load(os.path.join(base, 'Mapa', 'mapa4.jpg'))
+    background = pygame.transform.scale(background, size).convert()
+    frames = load_frames(*ANIMATIONS[State.RUN_RIGHT], 4.0)
+    out = tempfile.mkdtemp(prefix='afd-capture-')
+
+    print(f"{count} frames {size[0]}x{size[1]} a 60 FPS, anel de {ring}, {workers} processos de PNG, "
+          f"{os.cpu_count()} CPU")
+    print(f"{'modo':<12} {'frame ms':>9} {'grab p50':>9} {'grab p99':>9} {'capturados':>10} {'descartados':>11}")
+
+    def report(name, work, grabs, captured, dropped):
+        ordered = sorted(grabs)
+        print(f"{name:<12} {statistics.median(work):9.2f} {statistics.median(ordered):9.2f} "
+              f"{ordered[int(len(ordered) * 0.99)]:9.2f} {captured:>10} {dropped:>11}")
+
+    work, grabs = run(screen, background, frames, count)
+    report('sem captura', work, grabs, 0, 0)
+
+    for name, path in (('raw', os.path.join(out, 'capture.raw')), ('png', os.path.join(out, 'png'))):
+        capture = FrameCapture(screen, path, ring, workers)
+        work, grabs = run(screen, background, frames, count, lambda s, i: capture.grab(s))
+        t0 = time.perf_counter()
+        capture.close()
+        report(name, work, grabs, capture.captured, capture.dropped)
+        print(f"{'':<12} resto da codificação depois do último frame: {time.perf_counter() - t0:.1f} s")
+
+    png = os.path.join(out, 'inline')
+    os.makedirs(png)
+    work, grabs = run(screen, background, frames, min(count, 30),
+                      lambda s, i: pygame.image.save(s, os.path.join(png, f'frame_{i:06d}.png')))
+    report('png no loop', work, grabs, len(grabs), 0)
+    shutil.rmtree(out)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
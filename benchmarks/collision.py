@@ -0,0 +1,145 @@
+# Colisões por frame entre N entidades com os frames do Kakashi. Fase larga por
+# varredura de todos os pares (hitbox em Python) x hash espacial uniforme (só os pares
+# que dividem uma célula chegam ao teste de hitbox, vetorizado); a fase precisa
+# (máscara nas duplas cujas hitboxes se tocam) é a mesma nos dois. A densidade é de 100 entidades por tela de
+# 1920x1080, então o mundo cresce com N. Com 10 000 a varredura completa levaria
+# minutos por frame: o tempo é estimado por uma amostra de linhas.
+# Uso: python -m benchmarks.collision [N ...] [--frames=10]
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, load_frames
+from benchmarks import option
+from collision import MaskCache, SpatialHash, overlap
+
+SCREEN = (1920, 1080)
+PER_SCREEN = 100
+STATES = (State.IDLE, State.WALK_RIGHT, State.RUN_RIGHT, State.ATTACK, State.ATTACK_LEFT)
+BRUTE_SAMPLE_ROWS = 100
+
+
+class World:
+    def __init__(self, n, masks, seed=0):
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+        # todos os (estado, frame) e suas máscaras/hitboxes
+        self.skins = [(state, i) for state in STATES for i in range(len(masks.frames[state]))]
+        entries = [masks.get(state, i) for state, i in self.skins]
+        self.masks = [mask for mask, _ in entries]
+        self.boxes = [box for _, box in entries]
+        self.box = np.array([tuple(box) for box in self.boxes], dtype=np.int64)
+        self.width = SCREEN[0] * max(1, n // PER_SCREEN)
+        self.n = n
+        self.skin = rng.integers(0, len(self.skins), n)
+        self.x = rng.uniform(0, self.width, n)
+        self.y = rng.uniform(SCREEN[1] - 500, SCREEN[1] - 200, n)
+        self.vx = rng.uniform(-6, 6, n)
+
+    def step(self):
+        self.x = np.clip(self.x + self.vx, 0, self.width)
+        change = self.rng.random(self.n) < 0.1
+        self.skin[change] = self.rng.integers(0, len(self.skins), int(change.sum()))
+
+    # Canto do frame e hitbox recortada de cada entidade
+    def layout(self):
+        left, top = self.x.astype(np.int64), self.y.astype(np.int64)
+        box = self.box[self.skin]
+        return left, top, left + box[:, 0], top + box[:, 1], box[:, 2], box[:, 3]
+
+    def precise(self, i, j, left, top):
+        si, sj = self.skin[i], self.skin[j]
+        return overlap(self.masks[si], self.boxes[si], (left[i], top[i]),
+                       self.masks[sj], self.boxes[sj], (left[j], top[j]))
+
+
+# Fase larga por todos os pares: teste de hitbox em Python para cada dupla
+def brute_rows(world, rows):
+    _, _, bx, by, bw, bh = (a.tolist() for a in world.layout())
+    n = world.n
+    found = []
+    for i in rows:
+        x0, y0, x1, y1 = bx[i], by[i], bx[i] + bw[i], by[i] + bh[i]
+        for j in range(i + 1, n):
+            if bx[j] < x1 and x0 < bx[j] + bw[j] and by[j] < y1 and y0 < by[j] + bh[j]:
+                found.append((i, j))
+    return found
+
+
+# Fase larga pelo hash espacial: pares que dividem uma célula e teste de hitbox vetorizado
+def hashed(world, grid):
+    _, _, bx, by, bw, bh = world.layout()
+    grid.build(bx, by, bw, bh)
+    i, j = grid.pairs()
+    touch = (bx[j] < bx[i] + bw[i]) & (bx[i] < bx[j] + bw[j]) & (by[j] < by[i] + bh[i]) & (by[i] < by[j] + bh[j])
+    return list(zip(i[touch].tolist(), j[touch].tolist()))
+
+
+# Fase precisa, igual nos dois casos: máscara só nas duplas com hitboxes se tocando
+def precise(world, candidates):
+    left, top = (a.tolist() for a in world.layout()[:2])
+    return {(i, j) for i, j in candidates if world.precise(i, j, left, top)}
+
+
+def measure(n, masks, frames):
+    world = World(n, masks)
+    grid = SpatialHash()
+    brute_ms, hash_ms, mask_ms, same, pairs = [], [], [], True, 0
+    full = n <= 2000
+    for _ in range(frames):
+        world.step()
+        t0 = time.perf_counter()
+        candidates = hashed(world, grid)
+        hash_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        found = precise(world, candidates)
+        mask_ms.append((time.perf_counter() - t0) * 1000)
+        pairs += len(found)
+        if full:
+            t0 = time.perf_counter()
+            expected = brute_rows(world, range(n))
+            brute_ms.append((time.perf_counter() - t0) * 1000)
+            same &= sorted(expected) == sorted(candidates)
+        else:
+            # linhas espalhadas; a linha i testa n - i - 1 pares, a média fica ~n/2
+            rows = np.linspace(0, n - 1, BRUTE_SAMPLE_ROWS).astype(int).tolist()
+            t0 = time.perf_counter()
+            brute_rows(world, rows)
+            per_pair = (time.perf_counter() - t0) / sum(n - i - 1 for i in rows)
+            brute_ms.append(per_pair * n * (n - 1) / 2 * 1000)
+    return min(brute_ms), min(hash_ms), min(mask_ms), pairs / frames, same if full else None
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:] if not a.startswith('--')] or [100, 1000, 10000]
+    frames = int(option('frames', 10))
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    anims = {state: load_frames(*ANIMATIONS[state], 4.0) for state in STATES}
+    masks = MaskCache(anims)
+    t0 = time.perf_counter()
+    masks.prebuild()
+    print(f"{masks.built} máscaras (escala 4) em {(time.perf_counter() - t0) * 1000:.0f} ms, "
+          f"feitas uma vez no carregamento")
+
+    print("ms por frame; fase larga = escolher as duplas que vão para o teste de máscara")
+    print(f"{'N':>6} {'larga: pares':>13} {'larga: hash':>12} {'máscaras':>9} "
+          f"{'total pares':>12} {'total hash':>11} {'ganho':>6} {'colisões':>9} {'iguais':>7}")
+    for n in sizes:
+        brute, grid, mask, pairs, same = measure(n, masks, frames)
+        mark = '' if same is not None else ' (pares estimado)'
+        check = '-' if same is None else ('sim' if same else 'NÃO')
+        print(f"{n:>6} {brute:13.1f} {grid:12.2f} {mask:9.1f} {brute + mask:12.1f} {grid + mask:11.1f} "
+              f"{(brute + mask) / (grid + mask):5.1f}× {pairs:9.0f} {check:>7}{mark}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
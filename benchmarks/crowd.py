@@ -0,0 +1,85 @@
+# Quantos personagens cabem num frame de 16 ms: Crowd.step() (arrays NumPy) contra um
+# loop Python chamando simulation.step() para cada personagem. Antes de medir, confere
+# que os dois dão o mesmo resultado para uma multidão só de Kakashis.
+# Uso: python -m benchmarks.crowd [N ...]
+import sys
+import time
+
+import numpy as np
+
+from afd import SYMBOLS
+from crowd import _LEFT, _RIGHT, _SHIFT, Crowd
+from simulation import INPUT_BLOCKED, GameState, Input, step
+from timestep import TICK_MS
+
+SCREEN_SIZE = (1920, 1080)
+BUDGET_MS = 16.0
+TICKS = 120
+
+
+# Loop Python de referência: um GameState por personagem, com as teclas da multidão
+class PerObject:
+    def __init__(self, crowd):
+        self.crowd = crowd
+        self.games = []
+        for i in range(crowd.n):
+            game = GameState(*SCREEN_SIZE)
+            game.x_pos = float(crowd.x[i])
+            self.games.append(game)
+
+    def step(self, now):
+        held = self.crowd.symbol.tolist()
+        for game, sym in zip(self.games, held):
+            # o símbolo só chega ao AFD fora dos estados bloqueados (como em choose_symbol)
+            symbol = None if game.state in INPUT_BLOCKED else SYMBOLS[sym]
+            inp = Input(symbol, bool(_LEFT[sym]), bool(_RIGHT[sym]), bool(_SHIFT[sym]))
+            step(game, inp, now)
+
+
+def check(n=500, ticks=3000):
+    crowd = Crowd(n, *SCREEN_SIZE, pakkun_ratio=0.0, seed=1)
+    ref = PerObject(crowd)
+    for t in range(ticks):
+        crowd.think()
+        now = (t + 1) * TICK_MS
+        ref.step(now)
+        crowd.step(now)
+    sid = np.array([g.sid for g in ref.games])
+    frame = np.array([g.frame_index for g in ref.games])
+    x = np.array([g.x_pos for g in ref.games])
+    offset = np.array([g.jump_offset for g in ref.games])
+    return (np.array_equal(sid, crowd.sid) and np.array_equal(frame, crowd.frame)
+            and np.allclose(x, crowd.x) and np.allclose(offset, crowd.jump_offset))
+
+
+def time_per_tick(update, crowd):
+    t0 = time.perf_counter()
+    for t in range(TICKS):
+        crowd.think()
+        update((t + 1) * TICK_MS)
+    return (time.perf_counter() - t0) / TICKS * 1000
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [10, 100, 1000, 10000, 100000]
+    print(f"igual ao simulation.step() (500 Kakashis, 3000 ticks): {'sim' if check() else 'NÃO'}")
+    print(f"{'N':>7} {'NumPy ms/tick':>14} {'loop ms/tick':>13} {'ganho':>6}")
+    fit = {}
+    for n in sizes:
+        crowd = Crowd(n, *SCREEN_SIZE)
+        vec = time_per_tick(crowd.step, crowd)
+        fit['NumPy'] = int(BUDGET_MS / vec * n)
+        if n > 10000:
+            # o loop Python levaria segundos por tick
+            print(f"{n:>7} {vec:>14.3f} {'-':>13}")
+            continue
+        crowd = Crowd(n, *SCREEN_SIZE)
+        loop = time_per_tick(PerObject(crowd).step, crowd)
+        fit['loop Python'] = int(BUDGET_MS / loop * n)
+        print(f"{n:>7} {vec:>14.3f} {loop:>13.3f} {loop / vec:>5.1f}×")
+    # personagens por frame de 16 ms, extrapolando o custo por personagem do maior N medido
+    print(f"cabem em {BUDGET_MS:.0f} ms: " + ", ".join(f"~{v:,} ({k})" for k, v in fit.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Toques curtos e acordes perdidos: leitura do teclado por amostragem a cada frame
+# (como pygame.key.get_pressed()) x InputBuffer alimentado pelos KEYDOWN/KEYUP.
+# Gera uma sequência de toques de H (10-60 ms) e acordes R+T com as duas teclas
+# tocadas separadamente (intervalo de até 60 ms) e conta quantos viram símbolo.
+# Uso: python -m benchmarks.input_taps [ações] [ms por frame ...]
+import random
+import sys
+from types import SimpleNamespace
+
+import pygame
+
+from input_buffer import KEY_NAMES, InputBuffer
+from simulation import GameState, choose_symbol
+
+KEYS = {name: key for key, name in KEY_NAMES.items()}
+
+
+# Lista ordenada de (ms, tecla, apertou?) e quantas ações de cada símbolo ela tem
+def timeline(actions, seed=0):
+    rng = random.Random(seed)
+    events = []
+    expected = {'H': 0, 'R+T': 0}
+    t = 100.0
+    for _ in range(actions):
+        if rng.random() < 0.5:
+            hold = rng.uniform(10, 60)
+            events += [(t, 'H', True), (t + hold, 'H', False)]
+            expected['H'] += 1
+        else:
+            gap = rng.uniform(0, 60)
+            for name, start in (('R', t), ('T', t + gap)):
+                hold = rng.uniform(10, 40)
+                events += [(start, name, True), (start + hold, name, False)]
+            expected['R+T'] += 1
+        t += rng.uniform(200, 400)
+    events.sort()
+    return events, expected, t
+
+
+# Símbolos vistos a cada frame pelos dois modos; conta as bordas de subida
+def run(events, end, frame_ms):
+    game = GameState(1920, 1080)
+    buffer = InputBuffer()
+    down = set()
+    seen = {'poll': {'H': 0, 'R+T': 0}, 'buffer': {'H': 0, 'R+T': 0}}
+    last = {'poll': None, 'buffer': None}
+    i = 0
+    frame = frame_ms
+    while frame < end:
+        batch = []
+        while i < len(events) and events[i][0] <= frame:
+            t, name, pressed = events[i]
+            (down.add if pressed else down.discard)(name)
+            batch.append(SimpleNamespace(type=pygame.KEYDOWN if pressed else pygame.KEYUP, key=KEYS[name]))
+            i += 1
+        buffer.feed(batch, frame)
+        for mode, keys in (('poll', down), ('buffer', buffer.pressed())):
+            symbol = choose_symbol(keys, game)
+            if symbol != last[mode] and symbol in seen[mode]:
+                seen[mode][symbol] += 1
+            last[mode] = symbol
+        buffer.consume(False)
+        frame += frame_ms
+    return seen
+
+
+def main():
+    actions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    frame_times = [float(a) for a in sys.argv[2:]] or [1000 / 60, 1000 / 30, 50.0]
+    events, expected, end = timeline(actions)
+    print(f"{actions} ações: {expected['H']} toques de H, {expected['R+T']} acordes R+T")
+    print(f"{'ms/frame':>9} {'modo':>7} {'H':>12} {'R+T':>12}")
+    for frame_ms in frame_times:
+        seen = run(events, end, frame_ms)
+        for mode, counts in seen.items():
+            cells = [f"{counts[s]:>5} ({counts[s] / expected[s]:4.0%})" for s in ('H', 'R+T')]
+            print(f"{frame_ms:9.1f} {mode:>7} {cells[0]:>12} {cells[1]:>12}")
+
+
+if __name__ == '__main__':
+    main()
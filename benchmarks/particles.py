@@ -0,0 +1,101 @@
+# Quantas partículas cabem num frame de 60 Hz: N partículas vivas espalhadas pela tela
+# toda (pior caso da grade), com avanço de um tick, acúmulo na grade, escrita surfarray,
+# ampliação e blit aditivo na tela. Para comparar, o mesmo desenho com um blit por
+# partícula (Surface.blits com BLEND_ADD de um quadrado de um pixel da arte).
+# Uso: python -m benchmarks.particles [N ...] [--frames=30] [--factor=1] [--naive-max=50000]
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from benchmarks import option
+from particles import PARTICLE_CELL, Emitter, ParticleSystem
+from render import RenderQueue
+from timestep import TICK_MS
+
+SCREEN = (1920, 1080)
+# partículas que não morrem durante a medição
+FILL = Emitter((), speed=(0, 40), life_ms=(1e9, 2e9),
+               colors=((170, 210, 255), (255, 40, 30), (110, 90, 60)))
+
+
+# N partículas em pontos quaisquer da tela
+def filled(n):
+    system = ParticleSystem(capacity=n)
+    system.emit(FILL, n, 0, 0)
+    system.x[:n] = system.rng.uniform(0, SCREEN[0], n)
+    system.y[:n] = system.rng.uniform(0, SCREEN[1], n)
+    return system
+
+
+def measure(n, target, factor, frames):
+    system = filled(n)
+    queue = RenderQueue(target.get_size())
+    update_ms, draw_ms = [], []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        system.update()
+        t1 = time.perf_counter()
+        system.submit(queue, factor)
+        queue.flush(target)
+        t2 = time.perf_counter()
+        update_ms.append((t1 - t0) * 1000)
+        draw_ms.append((t2 - t1) * 1000)
+    return min(update_ms), min(draw_ms)
+
+
+# Um blit por partícula, com a cor e o brilho de cada uma já prontos em superfícies
+def measure_naive(n, target, factor, frames):
+    system = filled(n)
+    side = max(1, PARTICLE_CELL // factor)
+    dots = {}
+    best = float('inf')
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        system.update()
+        fade = system.life[:n] / system.max_life[:n]
+        colors = (system.rgb[:, :n] * fade).T.astype(np.uint8)
+        batch = []
+        for x, y, rgb in zip((system.x[:n] / factor).tolist(), (system.y[:n] / factor).tolist(),
+                             map(tuple, colors.tolist())):
+            dot = dots.get(rgb)
+            if dot is None:
+                dot = dots[rgb] = pygame.Surface((side, side))
+                dot.fill(rgb)
+            batch.append((dot, (x, y), None, pygame.BLEND_ADD))
+        target.blits(batch, False)
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:] if not a.startswith('--')] or [1000, 10_000, 50_000, 100_000, 200_000, 500_000]
+    frames = int(option('frames', 30))
+    factor = int(option('factor', 1))
+    naive_max = int(option('naive-max', 50_000))
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    target = pygame.Surface((SCREEN[0] // factor, SCREEN[1] // factor)).convert()
+
+    print(f"{SCREEN[0]}x{SCREEN[1]}, superfície de desenho ÷{factor}, ms por frame (melhor de {frames}); "
+          f"orçamento {TICK_MS:.1f} ms")
+    print(f"{'N':>8} {'avanço':>7} {'desenho':>8} {'total':>7} {'ns/part.':>9} {'1 blit/part.':>13}")
+    fits = 0
+    for n in sizes:
+        update, draw = measure(n, target, factor, frames)
+        total = update + draw
+        naive = f"{measure_naive(n, target, factor, min(frames, 5)):13.1f}" if n <= naive_max else f"{'-':>13}"
+        print(f"{n:>8} {update:7.2f} {draw:8.2f} {total:7.2f} {total / n * 1e6:9.0f} {naive}")
+        if total <= TICK_MS:
+            fits = max(fits, n)
+    print(f"\nmaior N medido que cabe no frame só com as partículas: {fits}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
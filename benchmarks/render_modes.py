@@ -0,0 +1,62 @@
+# Pixels enviados, tempo por frame e memória dos sprites em cada modo de desenho:
+# redesenho completo, retângulos sujos e resolução interna baixa
+# Uso: python -m benchmarks.render_modes [ticks] [LARGURAxALTURA]
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, base, load_frames
+from render import DirtyRectRenderer, FullRenderer, LowResRenderer
+
+
+# Personagem correndo de um lado para o outro; no meio o fundo troca para o mapa3 e volta
+def run(renderer, screen, backgrounds, frames, ticks):
+    w, h = screen.get_size()
+    x, speed = w // 2, 10
+    times = []
+    for tick in range(ticks):
+        x += speed
+        if not 0 <= x <= w:
+            speed = -speed
+            x = max(0, min(x, w))
+        background = backgrounds[1] if ticks // 3 <= tick < ticks // 3 + 60 else backgrounds[0]
+        surf = frames[(tick // 8) % len(frames)]
+        rect = surf.get_rect(midbottom=renderer.to_target((x, h - 50)))
+        t0 = time.perf_counter_ns()
+        renderer.present(background, surf, rect)
+        times.append((time.perf_counter_ns() - t0) / 1e6)
+    return times, pygame.image.tobytes(screen, 'RGB')
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    size = tuple(map(int, sys.argv[2].split('x'))) if len(sys.argv) > 2 else (1920, 1080)
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+    images = [pygame.image.load(os.path.join(base, 'Mapa', name)).convert()
+              for name in ('mapa4.jpg', 'mapa3.jpg')]
+
+    results = {}
+    for name, renderer in (('full', FullRenderer(screen)), ('dirty', DirtyRectRenderer(screen)),
+                           ('lowres', LowResRenderer(screen, factor=4))):
+        backgrounds = [pygame.transform.scale(img, renderer.size) for img in images]
+        frames = load_frames(*ANIMATIONS[State.RUN_RIGHT], 4.0 / renderer.factor)
+        sprite_kb = sum(f.surface.get_width() * f.surface.get_height() * 4 for f in frames) / 1024
+        times, final = run(renderer, screen, backgrounds, frames, ticks)
+        results[name] = final
+        print(f"{name:>6}: {renderer.pixels_pushed / ticks / 1e3:9.1f} kpx/frame,"
+              f" p50 {statistics.median(times):5.2f} ms, p95 {sorted(times)[int(ticks * 0.95) - 1]:5.2f} ms,"
+              f" sprites {sprite_kb:7.1f} KiB")
+    print("tela final idêntica (full x dirty):", results['full'] == results['dirty'])
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
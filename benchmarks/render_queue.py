@@ -0,0 +1,115 @@
+# Custo de desenhar N sprites por frame: um screen.blit() por sprite contra a
+# RenderQueue (envio por sprite + um Surface.blits por camada, descartando quem está
+# fora da tela). Confere que as duas formas produzem a mesma imagem.
+# Uso: python -m benchmarks.render_queue [N ...] [--scale=4]
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, base, load_frames
+from render import LAYER_CROWD, LAYER_EFFECTS, RenderQueue
+
+SCREEN_SIZE = (1920, 1080)
+FRAMES = 60
+OFFSCREEN = 0.2  # fração dos sprites fora da tela
+
+
+# Sprites aleatórios: (superfície, posição, camada, virado); parte fica fora da tela
+def scene(n, frames, rng):
+    w, h = SCREEN_SIZE
+    sprites = []
+    for i in range(n):
+        surf = frames[i % len(frames)]
+        if rng.random() < OFFSCREEN:
+            pos = (rng.choice((-surf.get_width() - 50, w + 50)), rng.randrange(h))
+        else:
+            pos = (rng.randrange(-surf.get_width() // 2, w), rng.randrange(h // 2, h))
+        sprites.append((surf, pos, rng.choice((LAYER_CROWD, LAYER_EFFECTS)), rng.random() < 0.5))
+    # os blits individuais precisam da mesma ordem de camadas que a fila usa
+    sprites.sort(key=lambda s: s[2])
+    return sprites
+
+
+def individual(screen, background, sprites, flips):
+    screen.blit(background, (0, 0))
+    for surf, pos, layer, flip in sprites:
+        screen.blit(flips.get(surf) if flip else surf, pos)
+
+
+def queued(screen, background, sprites, queue):
+    screen.blit(background, (0, 0))
+    for surf, pos, layer, flip in sprites:
+        queue.submit(surf, pos, layer, flip)
+    queue.flush(screen)
+
+
+# Envio em bloco, como faz a multidão: lista já recortada e virada, um extend por camada
+def bulk(screen, background, batches, queue):
+    screen.blit(background, (0, 0))
+    for layer, items in batches:
+        queue.extend(items, layer)
+    queue.flush(screen)
+
+
+# Mediana por frame de cada forma de desenho, alternando as formas a cada frame
+# para que o ruído da máquina afete todas igualmente
+def measure(draws):
+    times = [[] for _ in draws]
+    for _ in range(FRAMES):
+        for i, (draw, args) in enumerate(draws):
+            t0 = time.perf_counter_ns()
+            draw(*args)
+            times[i].append((time.perf_counter_ns() - t0) / 1e6)
+    return [statistics.median(t) for t in times]
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--scale=')]
+    scale = next((float(a[8:]) for a in sys.argv[1:] if a.startswith('--scale=')), 1.0)
+    sizes = [int(n) for n in args] or [10, 100, 1000]
+    pygame.display.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    background = pygame.transform.scale(
+        pygame.image.load(os.path.join(base, 'Mapa', 'mapa4.jpg')).convert(), SCREEN_SIZE)
+    # a fila recebe superfícies: os recortes, como a multidão envia
+    frames = [frame.surface for frame in load_frames(*ANIMATIONS[State.RUN_RIGHT], scale)]
+    rng = random.Random(0)
+
+    print(f"sprites {frames[0].get_width()}x{frames[0].get_height()}, mediana de {FRAMES} frames")
+    print(f"{'N':>5} {'fundo':>7} {'blit a blit':>12} {'fila':>8} {'em bloco':>9}  (ms)")
+    for n in sizes:
+        sprites = scene(n, frames, rng)
+        queue = RenderQueue(SCREEN_SIZE)
+        check = RenderQueue(SCREEN_SIZE, queue.flips)
+        for surf, pos, layer, flip in sprites:
+            check.submit(surf, pos, layer, flip)
+        batches = sorted(check.layers.items())
+
+        images = []
+        for draw, args in ((individual, (screen, background, sprites, queue.flips)),
+                           (queued, (screen, background, sprites, queue)),
+                           (bulk, (screen, background, batches, queue))):
+            draw(*args)
+            images.append(pygame.image.tobytes(screen, 'RGB'))
+        queue.culled = queue.calls = 0
+        # o fundo sozinho, para separar o custo dos sprites
+        bg, a, b, c = measure(((screen.blit, (background, (0, 0))),
+                               (individual, (screen, background, sprites, queue.flips)),
+                               (queued, (screen, background, sprites, queue)),
+                               (bulk, (screen, background, batches, queue))))
+        print(f"{n:>5} {bg:7.3f} {a:12.3f} {b:8.3f} {c:9.3f}  "
+              f"{check.culled} fora da tela, {len(batches)} blits() por frame, "
+              f"mesma imagem: {images[0] == images[1] == images[2]}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Custo de snapshot/restore do GameState e do rollback com dois jogadores locais: a
+# entrada do jogador 2 chega `atraso` ticks depois, a sessão segue com a previsão e
+# ressimula quando ela erra. Confere que o resultado é igual ao da simulação sem
+# atraso e estima quantos ticks de rollback cabem num frame de 60 Hz.
+# Uso: python -m benchmarks.rollback [ticks] [atraso ...]
+import sys
+import time
+import timeit
+
+from benchmarks.soak import random_keys
+from benchmarks.step_throughput import SCREEN_SIZE, scripted_keys
+from rollback import RollbackSession
+from simulation import GameState, read_input, step
+from timestep import TICK_MS, FixedTimestep
+
+FRAME_BUDGET_US = TICK_MS * 1000
+
+
+# Entradas de cada tick dos dois jogadores, como o teclado de cada um as produziria,
+# e o snapshot final da simulação sem atraso
+def reference(ticks):
+    streams = (scripted_keys(ticks), random_keys(ticks, seed=1))
+    games = [GameState(*SCREEN_SIZE) for _ in streams]
+    timestep = FixedTimestep()
+    inputs = ([], [])
+    for t in range(ticks):
+        now = timestep.tick()
+        for game, keys, used in zip(games, streams, inputs):
+            inp = read_input(keys[t], game)
+            used.append(inp)
+            step(game, inp, now)
+    return inputs, [game.snapshot() for game in games]
+
+
+# `forced`: ressimula `delay` ticks em todo frame, mesmo sem erro de previsão (pior caso)
+def run(inputs, delay, forced=False):
+    session = RollbackSession([GameState(*SCREEN_SIZE) for _ in inputs], history=max(delay, 1) + 1)
+    local, remote = inputs
+    ticks = len(local)
+    t0 = time.perf_counter()
+    for t in range(ticks):
+        session.confirm(0, local[t])
+        if t >= delay:
+            session.confirm(1, remote[t - delay])
+        if forced and 0 < delay <= session.tick and session.dirty is None:
+            session.dirty = session.tick - delay
+        session.update()
+    # o que falta do jogador 2 chega no fim
+    for t in range(max(0, ticks - delay), ticks):
+        session.confirm(1, remote[t])
+    if session.dirty is not None:
+        session.rollback()
+    elapsed = time.perf_counter() - t0
+    return elapsed, session, [game.snapshot() for game in session.games]
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    delays = [int(a) for a in sys.argv[2:]] or [0, 1, 2, 4, 8, 15]
+
+    game = GameState(*SCREEN_SIZE)
+    snap = game.snapshot()
+    n = 200_000
+    snap_us = timeit.timeit(game.snapshot, number=n) / n * 1e6
+    restore_us = timeit.timeit(lambda: game.restore(snap), number=n) / n * 1e6
+    print(f"snapshot {snap_us:.2f} µs, restore {restore_us:.2f} µs ({len(snap)} campos)")
+
+    inputs, final = reference(ticks)
+    print(f"\n{ticks} ticks, 2 jogadores; orçamento de {FRAME_BUDGET_US:.0f} µs por frame")
+    print(f"{'atraso':>6} {'modo':>9} {'µs/frame':>9} {'rollbacks':>9} {'ressim./frame':>13} {'igual':>6}")
+    tick_us = None
+    for delay in delays:
+        for forced in (False, True):
+            if forced and not delay:
+                continue
+            elapsed, session, result = run(inputs, delay, forced)
+            per_frame = elapsed / ticks * 1e6
+            if not delay:
+                tick_us = per_frame
+            print(f"{delay:>6} {'forçado' if forced else 'previsão':>9} {per_frame:9.1f} "
+                  f"{session.rollbacks:>9} {session.resimulated / ticks:13.2f} "
+                  f"{'sim' if result == final else 'NÃO':>6}")
+    if tick_us:
+        print(f"\num tick dos 2 jogadores com snapshot: {tick_us:.1f} µs -> "
+              f"~{int(FRAME_BUDGET_US // tick_us) - 1} ticks de rollback cabem num frame "
+              f"(sem contar o desenho)")
+
+
+if __name__ == '__main__':
+    main()
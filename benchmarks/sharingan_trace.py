@@ -0,0 +1,102 @@
+# Trace de tempo por frame do final do Sharingan: escala a cada tick x cache em tela cheia
+# Uso: python -m benchmarks.sharingan_trace [arquivo.csv] [LARGURAxALTURA]
+import csv
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, load_frames
+from blit_modes import blit_frame
+from render import SHARINGAN_FADE_FRAME, SHARINGAN_FULLSCREEN_FRAMES, FullscreenCache, fade_alpha, set_surface_alpha
+
+FADE_MS = 300
+RATE = 4  # frame_rates['sharingan']
+
+
+# Sequência de (frame_index, ms desde o início do frame) reproduzindo as esperas do loop a 60 Hz
+def schedule(total):
+    holds = {18: RATE * 35, 19: RATE, 20: RATE * 70}
+    for i in range(total - SHARINGAN_FULLSCREEN_FRAMES - 2, total):
+        for t in range(holds.get(i, RATE)):
+            yield i, t * 1000 / 60
+
+
+# Caminho antigo: copy() + set_alpha no frame do fade e transform.scale a cada tick
+def draw_legacy(screen, frames, i, elapsed, cache):
+    surf = frames[i]
+    if i == SHARINGAN_FADE_FRAME:
+        surf = surf.copy()
+        surf.set_alpha(fade_alpha(elapsed, FADE_MS))
+    if i >= len(frames) - SHARINGAN_FULLSCREEN_FRAMES:
+        screen.blit(pygame.transform.scale(surf, screen.get_size()), (0, 0))
+    else:
+        screen.blit(surf, surf.get_rect(midbottom=(screen.get_width() // 2, screen.get_height() - 50)))
+
+
+# Caminho novo: frames em tela cheia do FullscreenCache e alpha de superfície
+def draw_cached(screen, frames, i, elapsed, cache):
+    if i >= len(frames) - SHARINGAN_FULLSCREEN_FRAMES:
+        full = cache.get(State.SHARINGAN, i, frames, screen.get_size())
+        set_surface_alpha(full, fade_alpha(elapsed, FADE_MS) if i == SHARINGAN_FADE_FRAME else None)
+        screen.blit(full, (0, 0))
+    else:
+        surf = frames[i]
+        blit_frame(screen, surf, surf.get_rect(midbottom=(screen.get_width() // 2, screen.get_height() - 50)))
+
+
+def run(screen, background, frames, draw, cache):
+    trace = []
+    for i, elapsed in schedule(len(frames)):
+        t0 = time.perf_counter_ns()
+        screen.blit(background, (0, 0))
+        draw(screen, frames, i, elapsed, cache)
+        pygame.display.flip()
+        trace.append((i, (time.perf_counter_ns() - t0) / 1e6))
+    return trace
+
+
+def main():
+    out = sys.argv[1] if len(sys.argv) > 1 else None
+    size = tuple(map(int, sys.argv[2].split('x'))) if len(sys.argv) > 2 else (1920, 1080)
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+    background = pygame.Surface(size).convert()
+    background.fill((40, 60, 40))
+    frames = load_frames(*ANIMATIONS[State.SHARINGAN], 4.0)
+
+    cache = FullscreenCache()
+    cache.prebuild(State.SHARINGAN, frames, size)
+    traces = {
+        # o caminho antigo trabalhava com os frames no quadro inteiro
+        'legacy': run(screen, background, [frame.padded() for frame in frames], draw_legacy, None),
+        'cached': run(screen, background, frames, draw_cached, cache),
+    }
+
+    print(f"tela {size[0]}x{size[1]}, {len(traces['legacy'])} ticks por modo")
+    for mode, trace in traces.items():
+        print(mode)
+        for i in sorted({i for i, _ in trace}):
+            ms = [t for j, t in trace if j == i]
+            print(f"  frame {i:>2}: p50 {statistics.median(ms):6.2f} ms"
+                  f"  p95 {sorted(ms)[int(len(ms) * 0.95) - 1]:6.2f} ms  máx {max(ms):6.2f} ms")
+
+    if out:
+        with open(out, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['mode', 'tick', 'frame_index', 'ms'])
+            for mode, trace in traces.items():
+                for tick, (i, ms) in enumerate(trace):
+                    writer.writerow([mode, tick, i, f"{ms:.3f}"])
+        print(f"trace gravado em {out}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Soak de replays: refaz gravações .afdr sem tela e sem limite de FPS, em vários
+# processos, e confere que cada uma produz a mesma sequência de estado/frame/x_pos.
+# Sem arquivos, grava antes o roteiro de step_throughput e `--random=N` sequências
+# de teclas sorteadas em build/replays/.
+# Uso: python -m benchmarks.soak [gravação.afdr ...] [--workers=N] [--repeat=K]
+#                                [--random=N] [--ticks=T]
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from assets import base
+from benchmarks import option
+from benchmarks.step_throughput import SCREEN_SIZE, scripted_keys
+from replay import Recorder, Recording, replay
+from simulation import EVENT_WIN, GameState, read_input, step
+from timestep import FixedTimestep
+
+REPLAY_DIR = os.path.join(base, 'build', 'replays')
+# teclas sorteadas nas gravações aleatórias (P fica de fora: encerra o jogo)
+KEY_SETS = ((), ('A',), ('D',), ('A', 'SHIFT'), ('D', 'SHIFT'), ('S',), ('S', 'A'), ('S', 'D'),
+            ('SPACE',), ('SPACE', 'A'), ('SPACE', 'D', 'SHIFT'), ('H',), ('R', 'T'), ('U',),
+            ('J',), ('M',))
+
+
+def random_keys(ticks, seed):
+    rng = random.Random(seed)
+    keys = []
+    while len(keys) < ticks:
+        keys += [frozenset(rng.choice(KEY_SETS))] * rng.randint(1, 90)
+    return keys[:ticks]
+
+
+# Roda os conjuntos de teclas pela simulação como o jogo faria e grava a entrada
+def record(path, keys):
+    game = GameState(*SCREEN_SIZE)
+    timestep = FixedTimestep()
+    recorder = Recorder(*SCREEN_SIZE)
+    for pressed in keys:
+        inp = read_input(pressed, game)
+        events = step(game, inp, timestep.tick())
+        recorder.add(inp, game)
+        if EVENT_WIN in events:
+            break
+    recorder.save(path)
+    return path
+
+
+def run_one(path):
+    recording = Recording(path)
+    t0 = time.perf_counter()
+    playback, won = replay(recording)
+    return path, playback.ticks, time.perf_counter() - t0, playback.matches
+
+
+def main():
+    paths = [a for a in sys.argv[1:] if not a.startswith('--')]
+    workers = int(option('workers', os.cpu_count()))
+    repeat = int(option('repeat', 1))
+    if not paths:
+        ticks = int(option('ticks', 200_000))
+        paths = [record(os.path.join(REPLAY_DIR, 'script.afdr'), scripted_keys(ticks))]
+        for seed in range(int(option('random', 7))):
+            paths.append(record(os.path.join(REPLAY_DIR, f'random-{seed}.afdr'), random_keys(ticks, seed)))
+
+    jobs = paths * repeat
+    t0 = time.perf_counter()
+    with Pool(workers) as pool:
+        results = pool.map(run_one, jobs)
+    wall = time.perf_counter() - t0
+
+    failures = []
+    total = 0
+    for path, ticks, elapsed, matches in results:
+        total += ticks
+        print(f"{os.path.basename(path):<20}{ticks:>10} ticks {ticks / elapsed:>12,.0f} ticks/s"
+              f"  {'ok' if matches else 'DIVERGIU'}")
+        if not matches:
+            failures.append(path)
+    print(f"{len(jobs)} replays em {workers} processo(s): {total} ticks em {wall:.2f} s "
+          f"({total / wall:,.0f} ticks/s, {total / wall / 60:,.0f}× tempo real)")
+    if failures:
+        print(f"{len(failures)} replay(s) divergiram")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Compara o tempo de carregamento de todas as animações: PNGs soltos x atlas x cache cru
+# Uso: python -m benchmarks.startup [repetições] [escala]
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import assets
+import frame_cache
+
+
+def measure(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    scale = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    pygame.display.init()
+    screen = pygame.display.set_mode((1280, 720), pygame.HIDDEN)
+
+    if assets.load_atlas_index() is None:
+        print("atlas ausente ou desatualizado, gerando...")
+        assets.build_atlas()
+    # a primeira chamada (re)gera o cache cru se a chave mudou
+    frame_cache.load_cached_frames(scale, screen.get_size())
+
+    n_files = len(assets.source_stamps())
+    results = {
+        'loose': measure(lambda: assets.load_all_frames(scale, use_atlas=False), repeats),
+        'atlas': measure(lambda: assets.load_all_frames(scale), repeats),
+        'mmap': measure(lambda: frame_cache.load_cached_frames(scale, screen.get_size()), repeats),
+    }
+    print(f"{n_files} PNGs, escala {scale}, {repeats} repetições")
+    for name, times in results.items():
+        print(f"{name:>6}: mediana {statistics.median(times) * 1000:8.1f} ms"
+              f"  mín {min(times) * 1000:8.1f} ms")
+    loose = statistics.median(results['loose'])
+    for name in ('atlas', 'mmap'):
+        print(f"{name} {loose / statistics.median(results[name]):.2f}x mais rápido que loose")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# Ticks por segundo de simulation.step() sem tela e sem limite de FPS, com um roteiro
+# de teclas que passa por andar, correr, pular, atacar, Raikiri, Sharingan e Nindog
+# Uso: python -m benchmarks.step_throughput [ticks]
+import sys
+import time
+
+from simulation import GameState, read_input, step
+from timestep import TICK_MS
+
+SCREEN_SIZE = (1920, 1080)
+
+# (teclas, ticks segurando)
+SCRIPT = (
+    ((), 30), (('D',), 60), (('D', 'SHIFT'), 60), (('A',), 50), (('SPACE',), 60),
+    (('H',), 40), (('S',), 20), (('S', 'D'), 40), (('S', 'H'), 20), ((), 20),
+    (('U',), 40), (('R', 'T'), 20), ((), 300), (('J',), 20), ((), 600),
+    (('M',), 20), ((), 120), (('A', 'SHIFT'), 60), (('SPACE', 'D'), 60),
+)
+
+
+# Lista de conjuntos de teclas, um por tick, repetindo o roteiro até `ticks`
+def scripted_keys(ticks):
+    one_pass = [frozenset(keys) for keys, hold in SCRIPT for _ in range(hold)]
+    return (one_pass * (ticks // len(one_pass) + 1))[:ticks]
+
+
+def run(ticks):
+    keys = scripted_keys(ticks)
+    game = GameState(*SCREEN_SIZE)
+    visited = set()
+    events = 0
+    t0 = time.perf_counter()
+    for i, pressed in enumerate(keys):
+        events += len(step(game, read_input(pressed, game), (i + 1) * TICK_MS))
+        visited.add(game.state)
+    elapsed = time.perf_counter() - t0
+    return elapsed, visited, events
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    elapsed, visited, events = run(ticks)
+    print(f"{ticks} ticks em {elapsed:.2f} s: {ticks / elapsed:,.0f} ticks/s "
+          f"({elapsed / ticks * 1e6:.2f} µs/tick, {ticks / elapsed / 60:,.0f}× tempo real)")
+    print(f"estados visitados: {len(visited)}, eventos: {events}")
+
+
+if __name__ == '__main__':
+    main()
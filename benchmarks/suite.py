@@ -0,0 +1,197 @@
+# Suíte de benchmarks sem tela: carregamento frio e quente de cada animação, ticks por
+# segundo do AFD + física com o roteiro de teclas e custo de desenho dos frames de cada
+# estado (incluindo os frames do Sharingan em tela cheia). Grava o resultado em JSON e,
+# com --baseline, compara com um resultado salvo e aponta regressões.
+# Uso: python -m benchmarks.suite [--out=build/bench.json] [--baseline=base.json]
+#                                 [--threshold=0.15] [--scale=4] [--quick] [--strict]
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import frame_cache
+from afd import STATES, State
+from assets import ANIMATIONS, base, load_frames
+from benchmarks import option
+from blit_modes import blit_frame
+from benchmarks.step_throughput import run as run_steps
+from render import SHARINGAN_FULLSCREEN_FRAMES, FullscreenCache
+
+SCREEN_SIZE = (1920, 1080)
+DEFAULT_OUT = os.path.join(base, 'build', 'bench.json')
+SUITE_VERSION = 1
+
+
+# `gate`: métricas agregadas, que decidem o código de saída da comparação; as por
+# estado são amostras curtas e ruidosas, e só reprovam com --strict
+def metric(value, unit, better='lower', gate=False):
+    return {'value': round(value, 3), 'unit': unit, 'better': better, 'gate': gate}
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+# ----- carregamento -----
+# Frio: primeira leitura dos PNGs de cada animação no processo (decodificação e escala,
+# sem nenhum cache do jogo). Quente: as leituras seguintes, e o cache cru mapeado em
+# memória (frame_cache) que o jogo usa por padrão. Tempos repetidos usam o mínimo das
+# repetições, menos sensível a ruído que a média numa máquina ocupada.
+def bench_loading(scale, repeats):
+    results = {}
+    frames = {}
+    for state, (folder, prefix, count) in ANIMATIONS.items():
+        ms, frames[state] = timed(lambda: load_frames(folder, prefix, count, scale))
+        results[f'load.cold.{state.name}'] = metric(ms, 'ms')
+    results['load.cold.total'] = metric(sum(r['value'] for r in results.values()), 'ms', gate=True)
+
+    warm_total = []
+    for state, (folder, prefix, count) in ANIMATIONS.items():
+        times = [timed(lambda: load_frames(folder, prefix, count, scale))[0] for _ in range(repeats)]
+        results[f'load.warm.{state.name}'] = metric(min(times), 'ms')
+        warm_total.append(min(times))
+    results['load.warm.total'] = metric(sum(warm_total), 'ms', gate=True)
+
+    # a primeira chamada (re)gera o cache cru se a chave mudou
+    frame_cache.load_cached_frames(scale, SCREEN_SIZE)
+    times = [timed(lambda: frame_cache.load_cached_frames(scale, SCREEN_SIZE))[0] for _ in range(repeats * 10)]
+    results['load.mmap.total'] = metric(min(times), 'ms', gate=True)
+    return results, frames
+
+
+# ----- simulação -----
+def bench_steps(ticks, repeats):
+    rates = []
+    for _ in range(repeats):
+        elapsed, visited, events = run_steps(ticks)
+        rates.append(ticks / elapsed)
+    return {'step.ticks_per_s': metric(max(rates), 'ticks/s', 'higher', gate=True),
+            'step.states_visited': metric(len(visited), 'estados', 'higher')}
+
+
+# ----- desenho -----
+# Tempo médio por frame desenhado (fundo + sprite no chão, como no jogo) para cada
+# estado; os últimos frames do Sharingan vêm do FullscreenCache em tela cheia
+def bench_render(screen, background, frames, passes):
+    results = {}
+    midbottom = (SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] - 50)
+    fullscreen = FullscreenCache()
+    fullscreen.prebuild(State.SHARINGAN, frames[State.SHARINGAN], SCREEN_SIZE)
+    for state in STATES:
+        anim = frames[state]
+        rects = [surf.get_rect(midbottom=midbottom) for surf in anim]
+        sprite = []
+        for _ in range(passes):
+            t0 = time.perf_counter_ns()
+            for surf, rect in zip(anim, rects):
+                screen.blit(background, (0, 0))
+                blit_frame(screen, surf, rect)
+            sprite.append((time.perf_counter_ns() - t0) / len(anim) / 1000)
+        results[f'render.{state.name}'] = metric(min(sprite), 'µs/frame')
+    results['render.total'] = metric(sum(r['value'] for r in results.values()), 'µs', gate=True)
+
+    anim = frames[State.SHARINGAN]
+    full = [fullscreen.get(State.SHARINGAN, i, anim, SCREEN_SIZE)
+            for i in range(len(anim) - SHARINGAN_FULLSCREEN_FRAMES, len(anim))]
+    times = []
+    for _ in range(passes * 10):  # só 3 frames: mais passadas para o mínimo estabilizar
+        t0 = time.perf_counter_ns()
+        for surf in full:
+            screen.blit(background, (0, 0))
+            screen.blit(surf, (0, 0))
+        times.append((time.perf_counter_ns() - t0) / len(full) / 1000)
+    results['render.SHARINGAN.fullscreen'] = metric(min(times), 'µs/frame', gate=True)
+    return results
+
+
+# ----- comparação -----
+# Razão "pior/melhor" de cada métrica em relação à base (>1 é pior); acima de
+# 1 + threshold conta como regressão (só nas métricas `gate`, a menos que `strict`)
+def compare(results, baseline, threshold, strict=False):
+    rows = []
+    for name, new in results['metrics'].items():
+        old = baseline['metrics'].get(name)
+        if old is None or not old['value'] or not new['value']:
+            continue
+        if new['better'] == 'higher':
+            ratio = old['value'] / new['value']
+        else:
+            ratio = new['value'] / old['value']
+        worse = ratio > 1 + threshold
+        rows.append((name, old['value'], new['value'], new['unit'], ratio, worse,
+                     worse and (strict or new.get('gate', False))))
+    return rows
+
+
+def print_results(metrics):
+    for name, m in metrics.items():
+        print(f"{name:<34}{m['value']:>14,.2f} {m['unit']}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\ncomparação com a base (regressão acima de {threshold:.0%}):")
+    for name, old, new, unit, ratio, worse, regressed in rows:
+        flag = '  REGRESSÃO' if regressed else '  (acima, sem gate)' if worse else ''
+        print(f"{name:<34}{old:>12,.2f} -> {new:>12,.2f} {unit:<9}{(ratio - 1) * 100:+7.1f}%{flag}")
+
+
+def main():
+    out = option('out', DEFAULT_OUT)
+    baseline_path = option('baseline', None)
+    threshold = float(option('threshold', 0.15))
+    scale = float(option('scale', 4.0))
+    quick = '--quick' in sys.argv[1:]
+    strict = '--strict' in sys.argv[1:]
+    repeats, ticks, passes = (2, 50_000, 3) if quick else (5, 300_000, 10)
+
+    pygame.display.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    background = pygame.transform.scale(
+        pygame.image.load(os.path.join(base, 'Mapa', 'mapa4.jpg')).convert(), SCREEN_SIZE)
+
+    metrics = {}
+    loading, frames = bench_loading(scale, repeats)
+    metrics.update(loading)
+    metrics.update(bench_steps(ticks, repeats))
+    metrics.update(bench_render(screen, background, frames, passes))
+    pygame.quit()
+
+    results = {
+        'version': SUITE_VERSION,
+        'config': {'scale': scale, 'screen': list(SCREEN_SIZE), 'ticks': ticks,
+                   'repeats': repeats, 'passes': passes},
+        'machine': {'python': platform.python_version(), 'pygame': pygame.version.ver,
+                    'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': metrics,
+    }
+    print_results(metrics)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"\nresultado gravado em {out}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get('config') != results['config']:
+            print("aviso: configuração diferente da base, a comparação pode não valer")
+        rows = compare(results, baseline, threshold, strict)
+        print_comparison(rows, threshold)
+        regressions = [row[0] for row in rows if row[6]]
+        if regressions:
+            print(f"{len(regressions)} regressão(ões): {', '.join(regressions)}")
+            sys.exit(1)
+        print("nenhuma regressão")
+
+
+if __name__ == '__main__':
+    main()
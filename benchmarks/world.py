@@ -0,0 +1,89 @@
+# Custo do fundo por frame conforme o mundo cresce: a câmera atravessa o mundo na
+# velocidade do Raikiri (ida e volta) desenhando só os ladrilhos visíveis, com a
+# pré-carga de um ladrilho por frame, como no jogo. Compara com o jeito de antes levado
+# a um mundo largo: o mundo inteiro escalado numa superfície só, montada no início.
+# Uso: python -m benchmarks.world [frames] [LARGURAxALTURA] [--repeats=1,4,16,64,256] [--naive-mb=512]
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from benchmarks import option
+from simulation import raikiri_move_speed_slow
+from world import WORLD_MAPS, Camera, TileCache, World, WorldView
+
+
+# Percorre o mundo: devolve os ms por frame (desenho do fundo e pré-carga)
+def sweep(screen, draw, world_width, count, pump=None):
+    view = screen.get_width()
+    camera = Camera(view, world_width)
+    # começa no meio do mundo, para o começo não ficar sempre no mesmo lugar do cache
+    x, speed = world_width // 2, raikiri_move_speed_slow
+    times = []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        offset = camera.follow(x)
+        draw(offset, camera.direction)
+        if pump is not None:
+            pump()
+        times.append((time.perf_counter() - t0) * 1000)
+        x += speed
+        if not view // 2 <= x <= world_width - view // 2:
+            speed = -speed
+    return times
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    count = int(args[0]) if args else 600
+    size = tuple(map(int, args[1].split('x'))) if len(args) > 1 else (1920, 1080)
+    repeats = [int(r) for r in option('repeats', '1,4,16,64,256').split(',')]
+    naive_mb = float(option('naive-mb', 512))
+    pygame.display.init()
+    screen = pygame.display.set_mode(size)
+
+    print(f"{count} frames {size[0]}x{size[1]}, câmera a {raikiri_move_speed_slow} px/frame; ms por frame")
+    print(f"{'largura':>9} {'telas':>6} | {'ladrilhos: início':>17} {'p50':>6} {'p99':>6} "
+          f"{'na hora':>7} {'MB':>6} | {'inteiro: início':>15} {'p50':>6} {'p99':>6} {'MB':>7}")
+    for repeat in repeats:
+        t0 = time.perf_counter()
+        world = World(WORLD_MAPS, size[1], repeat)
+        tiles = TileCache(world, size)
+        setup = (time.perf_counter() - t0) * 1000
+
+        def draw(offset, direction):
+            WorldView(tiles, offset).draw(screen)
+            tiles.prefetch(offset, direction)
+
+        times = sorted(sweep(screen, draw, world.width, count, tiles.pump))
+        stats = tiles.stats()
+        row = (f"{world.width:>9} {world.width / size[0]:6.1f} | {setup:15.1f}ms {statistics.median(times):6.2f} "
+               f"{times[int(len(times) * 0.99)]:6.2f} {stats['misses']:>7} {stats['resident_mb']:6.1f} |")
+
+        mb = world.width * world.height * 4 / 2**20
+        if mb <= naive_mb:
+            t0 = time.perf_counter()
+            whole = pygame.Surface((world.width, world.height)).convert()
+            for seg in world.segments:
+                whole.blit(pygame.transform.scale(seg.image, (seg.width, world.height)), (seg.x, 0))
+            setup = (time.perf_counter() - t0) * 1000
+            area = screen.get_rect()
+            times = sorted(sweep(screen, lambda offset, _: screen.blit(whole, (0, 0), area.move(offset, 0)),
+                                 world.width, count))
+            row += f" {setup:13.1f}ms {statistics.median(times):6.2f} {times[int(len(times) * 0.99)]:6.2f} {mb:7.1f}"
+            del whole
+        else:
+            row += f" {'—':>15} {'':>6} {'':>6} {mb:7.1f}"
+        print(row)
+    print("na hora: ladrilhos montados durante o desenho (a pré-carga não chegou a tempo; "
+          "os da primeira tela sempre contam)")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
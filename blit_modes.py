@@ -0,0 +1,117 @@
+# Variantes de desenho dos frames do personagem. Os frames de load_frames já são só o
+# retângulo dos pixels visíveis (assets.Frame, com o deslocamento no quadro), mas ainda
+# SRCALPHA: cada blit mistura o recorte inteiro. As variantes:
+#   'premul'  alpha pré-multiplicado, desenhado com BLEND_PREMULTIPLIED
+#   'rle'     RLEACCEL: o SDL codifica as faixas transparentes e opacas uma vez e pula o vazio
+# `python -m benchmarks.blit_modes` mede cada modo por animação nesta máquina e grava o
+# mais rápido em BLIT_MODES_PATH.
+import json
+import os
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pygame
+
+from afd import State
+from assets import Frame, base
+
+BLIT_MODES = ('plain', 'premul', 'rle')
+BLIT_MODES_PATH = os.path.join(base, 'build', 'blit_modes.json')
+
+
+# Frame pronto para o blit: superfície, deslocamento dentro do frame original e flags
+class DrawFrame(NamedTuple):
+    surface: pygame.Surface
+    offset: tuple
+    flags: int
+
+
+# Variante de um Frame (ou de uma Surface, no canto do quadro)
+def optimize(surf, mode):
+    offset = (0, 0)
+    if isinstance(surf, Frame):
+        surf, offset = surf.surface, surf.offset
+    if mode == 'premul':
+        return DrawFrame(surf.premul_alpha(), offset, pygame.BLEND_PREMULTIPLIED)
+    if mode == 'rle':
+        surf = surf.copy()
+        surf.set_alpha(255, pygame.RLEACCEL)
+        # o SDL só codifica no primeiro blit: faz agora, no carregamento
+        pygame.Surface((1, 1), 0, surf).blit(surf, (0, 0))
+    elif mode != 'plain':
+        raise ValueError(f"modo de blit desconhecido: {mode}")
+    return DrawFrame(surf, offset, 0)
+
+
+# Desenha `frame` (Surface, assets.Frame ou DrawFrame) com o retângulo do quadro em `rect`
+def blit_frame(target, frame, rect):
+    if isinstance(frame, DrawFrame):
+        surf, (dx, dy), flags = frame
+        return target.blit(surf, (rect[0] + dx, rect[1] + dy), None, flags)
+    if isinstance(frame, Frame):
+        surf, (dx, dy), _ = frame
+        return target.blit(surf, (rect[0] + dx, rect[1] + dy))
+    return target.blit(frame, rect)
+
+
+# Modo escolhido por animação, como gravado pelo benchmark ({} se ainda não houver)
+def load_choices(path=BLIT_MODES_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    modes = {}
+    for name, mode in data.get('modes', {}).items():
+        # escolhas antigas: os modos 'trim*' viraram o padrão do carregamento
+        mode = 'plain' if mode == 'trim' else mode.removeprefix('trim_')
+        if name in State.__members__ and mode in BLIT_MODES:
+            modes[State[name]] = mode
+    return modes
+
+
+def save_choices(modes, timings, path=BLIT_MODES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'modes': {state.name: mode for state, mode in modes.items()},
+            'us_per_blit': {state.name: t for state, t in timings.items()},
+        }, f, indent=1)
+
+
+# Variantes por (estado, frame), montadas na primeira vez que o frame é desenhado (ou
+# em prebuild). Uma variante por recorte compartilhado: os frames que usam o mesmo
+# recorte (FrameInterner) dividem a variante, cada um com o seu deslocamento. Guarda o
+# recorte de origem junto, como MaskCache: se a animação for recarregada ou trocada, a
+# variante é refeita. É um LRU, como o FlipCache: com AFD_MIRROR=draw os frames da
+# esquerda são viradas novas a cada volta do FlipCache, e um dict comum cresceria sem
+# parar. A capacidade padrão passa de duas variantes por frame de ANIMATIONS (284 frames).
+class DrawFrames:
+    def __init__(self, frames, modes, default='plain', capacity=1024):
+        self.frames = frames
+        self.modes = modes  # estado -> modo (os ausentes usam `default`)
+        self.default = default
+        self.capacity = capacity
+        self.shared = OrderedDict()  # (modo, id do recorte) -> (recorte, DrawFrame)
+
+    def prebuild(self, states=None):
+        for state in states if states is not None else list(self.frames.keys()):
+            for i in range(len(self.frames[state])):
+                self.get(state, i)
+
+    def get(self, state, index):
+        frame = self.frames[state][index]
+        mode = self.modes.get(state, self.default)
+        if mode == 'plain':
+            return frame
+        key = (mode, id(frame.surface))
+        hit = self.shared.get(key)
+        if hit is not None and hit[0] is frame.surface:
+            self.shared.move_to_end(key)
+            return hit[1]._replace(offset=frame.offset)
+        variant = optimize(frame, mode)
+        self.shared[key] = (frame.surface, variant)
+        self.shared.move_to_end(key)
+        if len(self.shared) > self.capacity:
+            self.shared.popitem(last=False)
+        return variant
@@ -0,0 +1,161 @@
+# Captura do jogo sem gravador externo: depois do flip() os pixels da tela são copiados
+# para um anel de buffers alocados uma vez (memória compartilhada) e a codificação
+# acontece fora do loop principal. Destino terminado em '.raw': um fluxo de vídeo cru
+# gravado por uma thread (escrever em arquivo solta o GIL). Outro destino: uma pasta
+# com uma sequência de PNGs, codificados em processos, porque o pygame.image.save
+# segura o GIL. Sem buffer livre o frame é descartado (e contado), nunca esperado; com
+# `lossless` (replay sem limite de FPS, onde não há tempo real a respeitar) o loop espera.
+import os
+import queue
+import sys
+import threading
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import pygame
+
+from profiler import percentile
+
+CAPTURE_RING = 8      # frames copiados esperando a codificação
+CAPTURE_WORKERS = 2   # processos codificando PNG
+
+
+# Nome do formato de pixel dos bytes da superfície, na ordem da memória (ex.: 'bgr0'),
+# como o ffmpeg espera em -pixel_format
+def pixel_format(surface):
+    names = {shift // 8: name for name, shift, mask in zip('rgba', surface.get_shifts(), surface.get_masks())
+             if mask}
+    order = [names.get(i, '0') for i in range(surface.get_bytesize())]
+    return ''.join(order if sys.byteorder == 'little' else reversed(order))
+
+
+# Estado dos processos de PNG: o anel compartilhado, anexado uma vez em cada processo
+_worker = {}
+
+
+def _attach(name, size, masks, frame_bytes):
+    shm = shared_memory.SharedMemory(name=name)
+    _worker.update(shm=shm, frame_bytes=frame_bytes,
+                   surface=pygame.Surface(size, 0, 32, masks))
+
+
+def _encode_png(slot, path):
+    n = _worker['frame_bytes']
+    surface = _worker['surface']
+    surface.get_buffer().write(bytes(_worker['shm'].buf[slot * n:(slot + 1) * n]))
+    pygame.image.save(surface, path)
+    return slot
+
+
+class FrameCapture:
+    def __init__(self, surface, path, ring=CAPTURE_RING, workers=CAPTURE_WORKERS, lossless=False):
+        if surface.get_bytesize() != 4 or surface.get_pitch() != surface.get_width() * 4:
+            raise ValueError("captura exige uma tela de 32 bits sem preenchimento nas linhas")
+        self.size = surface.get_size()
+        self.path = path
+        self.frame_bytes = surface.get_pitch() * surface.get_height()
+        self.shm = shared_memory.SharedMemory(create=True, size=ring * self.frame_bytes)
+        self.free = queue.SimpleQueue()
+        for slot in range(ring):
+            self.free.put(slot)
+        self.lossless = lossless
+        self.raw = path.endswith('.raw')
+        self.format = pixel_format(surface)
+        self.captured = 0
+        self.dropped = 0
+        self.overhead_ns = []  # custo de grab() no loop principal, por frame
+        self.waited_ns = 0     # parte dele esperando buffer livre (só com `lossless`)
+        self.error = None
+        if self.raw:
+            self.jobs = queue.SimpleQueue()
+            self.file = open(path, 'wb')
+            self.writer = threading.Thread(target=self._write, daemon=True)
+            self.writer.start()
+        else:
+            os.makedirs(path, exist_ok=True)
+            # 'spawn': os processos não herdam o estado do SDL do processo do jogo
+            self.pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn'), initializer=_attach,
+                                            initargs=(self.shm.name, self.size, surface.get_masks(),
+                                                      self.frame_bytes))
+
+    # Chamar logo depois do flip(): copia a tela para um buffer livre e entrega à codificação.
+    # Um erro da codificação ou da gravação é levantado aqui, antes de esperar um buffer.
+    def grab(self, surface):
+        if self.error is not None:
+            raise self.error
+        t0 = time.perf_counter_ns()
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            if not self.lossless:
+                self.dropped += 1
+                self.overhead_ns.append(time.perf_counter_ns() - t0)
+                return False
+            slot = self.free.get()
+            self.waited_ns += time.perf_counter_ns() - t0
+        n = self.frame_bytes
+        view = surface.get_view('0')
+        self.shm.buf[slot * n:(slot + 1) * n] = view
+        del view  # a superfície fica travada enquanto a view existir
+        if self.raw:
+            self.jobs.put(slot)
+        else:
+            path = os.path.join(self.path, f'frame_{self.captured:06d}.png')
+            self.pool.submit(_encode_png, slot, path).add_done_callback(partial(self._done, slot))
+        self.captured += 1
+        self.overhead_ns.append(time.perf_counter_ns() - t0)
+        return True
+
+    # o buffer volta ao anel mesmo se o PNG falhou, para o loop não ficar esperando por ele
+    def _done(self, slot, future):
+        try:
+            if future.exception() is not None:
+                self.error = future.exception()
+        finally:
+            self.free.put(slot)
+
+    # Thread do fluxo cru: grava os frames na ordem em que foram copiados; depois de um
+    # erro (ex.: disco cheio) só devolve os buffers até o close()
+    def _write(self):
+        n = self.frame_bytes
+        while True:
+            slot = self.jobs.get()
+            if slot is None:
+                break
+            try:
+                if self.error is None:
+                    self.file.write(self.shm.buf[slot * n:(slot + 1) * n])
+            except OSError as e:
+                self.error = e
+            finally:
+                self.free.put(slot)
+
+    # Espera a codificação do que já foi copiado e libera o anel
+    def close(self):
+        if self.raw:
+            self.jobs.put(None)
+            self.writer.join()
+            self.file.close()
+        else:
+            self.pool.shutdown(wait=True)
+        self.shm.close()
+        self.shm.unlink()
+        if self.error is not None:
+            raise self.error
+
+    # Comando do ffmpeg para transformar o fluxo cru num vídeo
+    def ffmpeg_command(self, fps=60):
+        w, h = self.size
+        return (f"ffmpeg -f rawvideo -pixel_format {self.format} -video_size {w}x{h} "
+                f"-framerate {fps} -i {self.path} -pix_fmt yuv420p {os.path.splitext(self.path)[0]}.mp4")
+
+    def stats(self):
+        ordered = sorted(self.overhead_ns)
+        return {
+            'captured': self.captured,
+            'dropped': self.dropped,
+            'waited_ms': round(self.waited_ns / 1e6, 1),
+            'overhead_ms': tuple(round(percentile(ordered, p) / 1e6, 2) for p in (50, 95, 99)),
+        }
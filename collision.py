@@ -0,0 +1,152 @@
+# Colisão dos ataques: máscara de pixels e hitbox recortada de cada frame, feitas uma
+# vez por frame de animação (e não a cada teste), e um hash espacial uniforme para
+# que só entidades em células vizinhas cheguem ao teste de máscara.
+import numpy as np
+import pygame
+
+from afd import STATE_INDEX, STATES, State
+from simulation import INFO, RAIKIRI
+
+# Estados cujos frames acertam alvos (no Raikiri, só a investida depois do frame 11)
+ATTACK_STATES = (
+    State.ATTACK, State.ATTACK_LEFT, State.ATTACK_RUN, State.ATTACK_RUN_LEFT,
+    State.ATTACK_UP, State.ATTACK_UP_LEFT, State.ATTACK_CROUCH, State.ATTACK_CROUCH_LEFT,
+    State.RAIKIRI, State.RAIKIRI_LEFT,
+)
+_ATTACK_SIDS = frozenset(STATE_INDEX[state] for state in ATTACK_STATES)
+RAIKIRI_DASH_FRAME = 11
+HASH_CELL = 256  # lado da célula do hash espacial, em pixels da superfície de desenho
+
+
+def is_attacking(game):
+    if game.sid not in _ATTACK_SIDS:
+        return False
+    return INFO[game.sid][5] != RAIKIRI or game.frame_index >= RAIKIRI_DASH_FRAME
+
+
+# Máscara do frame (assets.Frame) no tamanho do quadro e o retângulo que contém todos
+# os pixels opacos (relativo ao quadro)
+def frame_mask(frame):
+    mask = pygame.mask.Mask(frame.size)
+    mask.draw(pygame.mask.from_surface(frame.surface), frame.offset)
+    rects = mask.get_bounding_rects()
+    box = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+    return mask, box
+
+
+# Máscaras por (estado, frame), com a mesma chave do dicionário de frames. Guarda o
+# recorte de origem junto: se a animação for recarregada ou trocada (AnimationStore,
+# espelhamento na hora do desenho), a máscara é refeita.
+class MaskCache:
+    def __init__(self, frames):
+        self.frames = frames
+        self.entries = {}
+        self.built = 0
+
+    # Monta as máscaras de todos os frames das animações residentes (no carregamento)
+    def prebuild(self, states=None):
+        for state in states if states is not None else list(self.frames.keys()):
+            for i in range(len(self.frames[state])):
+                self.get(state, i)
+
+    def get(self, state, index):
+        frame = self.frames[state][index]
+        entry = self.entries.get((state, index))
+        if entry is None or entry[0] is not frame.surface:
+            entry = (frame.surface, *frame_mask(frame))
+            self.entries[(state, index)] = entry
+            self.built += 1
+        return entry[1], entry[2]
+
+
+# Hash espacial uniforme montado de uma vez a partir de arrays de retângulos
+# (esquerda, topo, largura, altura); cada entidade entra em todas as células que cobre.
+class SpatialHash:
+    def __init__(self, cell=HASH_CELL):
+        self.cell = cell
+        self.keys = np.empty(0, dtype=np.int64)
+        self.ids = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _key(cx, cy):
+        return (cx.astype(np.int64) << 32) + (cy.astype(np.int64) & 0xffffffff)
+
+    def build(self, left, top, width, height):
+        cell = self.cell
+        x0, y0 = left // cell, top // cell
+        x1, y1 = (left + width - 1) // cell, (top + height - 1) // cell
+        ids = np.arange(len(left))
+        span_x = int((x1 - x0).max(initial=0)) + 1
+        span_y = int((y1 - y0).max(initial=0)) + 1
+        keys, owners = [], []
+        for dx in range(span_x):
+            for dy in range(span_y):
+                inside = (x0 + dx <= x1) & (y0 + dy <= y1)
+                keys.append(self._key(x0[inside] + dx, y0[inside] + dy))
+                owners.append(ids[inside])
+        keys = np.concatenate(keys) if keys else self.keys
+        owners = np.concatenate(owners) if owners else self.ids
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.ids = owners[order]
+
+    # Ids das entidades nas células que o retângulo cobre (podem não tocá-lo)
+    def query(self, rect):
+        cell = self.cell
+        found = []
+        for cx in range(rect.left // cell, (rect.right - 1) // cell + 1):
+            for cy in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                key = (cx << 32) + (cy & 0xffffffff)
+                lo = np.searchsorted(self.keys, key, 'left')
+                hi = np.searchsorted(self.keys, key, 'right')
+                if hi > lo:
+                    found.append(self.ids[lo:hi])
+        if not found:
+            return []
+        return np.unique(np.concatenate(found)).tolist()
+
+    # Pares (i, j), i < j, que dividem alguma célula, sem repetição, em dois arrays.
+    # As chaves estão ordenadas: entradas a k posições de distância com a mesma chave
+    # estão na mesma célula, para k = 1, 2, ... até não haver mais nenhuma.
+    def pairs(self):
+        keys, ids = self.keys, self.ids
+        first, second = [], []
+        k = 1
+        while k < len(keys):
+            same = keys[k:] == keys[:-k]
+            if not same.any():
+                break
+            a, b = ids[:-k][same], ids[k:][same]
+            first.append(np.minimum(a, b))
+            second.append(np.maximum(a, b))
+            k += 1
+        if not first:
+            return self.ids[:0], self.ids[:0]
+        first, second = np.concatenate(first), np.concatenate(second)
+        # a mesma dupla pode dividir mais de uma célula
+        n = int(ids.max()) + 1
+        unique = np.unique(first * n + second)
+        return unique // n, unique % n
+
+
+# Teste preciso entre duas entidades: hitboxes recortadas e depois as máscaras.
+# `pos_*` é o canto superior esquerdo do frame na superfície de desenho.
+def overlap(mask_a, box_a, pos_a, mask_b, box_b, pos_b):
+    if not box_a.move(pos_a).colliderect(box_b.move(pos_b)):
+        return False
+    return mask_a.overlap(mask_b, (pos_b[0] - pos_a[0], pos_b[1] - pos_a[1])) is not None
+
+
+# Índices da multidão atingidos pelo frame do jogador em `rect` (na superfície de
+# desenho); `crowd_masks`: um MaskCache por tipo de personagem
+def crowd_hits(crowd, crowd_masks, grid, player_mask, player_box, rect, factor=1):
+    left, top, w, h = crowd.layout(factor)
+    grid.build(left, top, w, h)
+    hits = []
+    kind, sid, frame = crowd.kind, crowd.sid, crowd.frame
+    for i in grid.query(player_box.move(rect.topleft)):
+        mask, box = crowd_masks[kind[i]].get(STATES[sid[i]], int(frame[i]))
+        if overlap(player_mask, player_box, rect.topleft, mask, box, (int(left[i]), int(top[i]))):
+            hits.append(i)
+    return hits
+
@@ -0,0 +1,242 @@
+# Multidão de personagens controlados pelo computador (Kakashis e Pakkuns) usando o
+# mesmo AFD do jogador. O estado de cada um fica em arrays NumPy (um array por campo)
+# e step() atualiza todos de uma vez com operações vetorizadas, seguindo exatamente
+# as regras de simulation.step().
+import numpy as np
+
+from afd import DELTA, STATES, STATE_INDEX, SYMBOL_INDEX, State
+from assets import PAKKUN_ANIMATIONS, flip_frame, load_frame_files
+from render import LAYER_CROWD
+from simulation import (FINAL, FRAME_COUNTS, GROUND, HOLD, INFO, INPUT_BLOCKED, JUMP, LOOP,
+                        ONCE, RAIKIRI, STATE_INFO, jump_duration, jump_height,
+                        raikiri_anim_rate_fast, run_speed, walk_speed)
+
+KAKASHI = 0
+PAKKUN = 1
+
+# Estados usados pelo Pakkun -> animação (os demais nunca são alcançados com as teclas dele)
+PAKKUN_STATES = {
+    State.IDLE: 'sit', State.IDLE_LEFT: 'sit',
+    State.WALK_RIGHT: 'run', State.WALK_LEFT: 'run',
+    State.RUN_RIGHT: 'run', State.RUN_LEFT: 'run',
+}
+
+# Teclas que cada tipo "aperta" (J e P ficam de fora: trocam o mapa e encerram o jogo)
+REPERTOIRE = {
+    KAKASHI: (None, None, 'A', 'D', 'SHIFT+A', 'SHIFT+D', 'S', 'S+A', 'S+D',
+              'SPACE', 'H', 'U', 'M', 'R+T'),
+    PAKKUN: (None, 'A', 'D', 'SHIFT+A', 'SHIFT+D'),
+}
+
+# ----- tabelas do AFD e do comportamento por estado em arrays -----
+_N = len(STATES)
+DELTA_NP = np.array(DELTA, dtype=np.int32)
+_info = list(zip(*INFO))
+RATE = np.array(_info[0], dtype=np.int32)
+MODE = np.array(_info[1], dtype=np.int32)
+DONE = np.array(_info[2], dtype=np.int32)
+DONE_LAST = np.array([STATE_INFO[s].done_last for s in STATES])
+DX = np.array(_info[4], dtype=np.float64)
+MOTION = np.array(_info[5], dtype=np.int32)
+BLOCKED = np.zeros(_N, dtype=bool)
+BLOCKED[[STATE_INDEX[s] for s in INPUT_BLOCKED]] = True
+
+# multiplicador da taxa por (estado, frame): as pausas do Sharingan
+_MAX_FRAMES = max(FRAME_COUNTS.values())
+HOLD_MULT = np.ones((_N, _MAX_FRAMES), dtype=np.int32)
+for _i, _rec in enumerate(INFO):
+    for _frame, _mult in (_rec[6] or {}).items():
+        HOLD_MULT[_i, _frame] = _mult
+
+# frames por (tipo, estado)
+COUNT = np.empty((2, _N), dtype=np.int32)
+for _i, _state in enumerate(STATES):
+    COUNT[KAKASHI, _i] = FRAME_COUNTS[_state]
+    COUNT[PAKKUN, _i] = len(PAKKUN_ANIMATIONS[PAKKUN_STATES.get(_state, 'sit')])
+
+# símbolos de cada repertório, completados para formar uma matriz
+_rep_len = max(len(r) for r in REPERTOIRE.values())
+REP = np.zeros((2, _rep_len), dtype=np.int32)
+REP_LEN = np.zeros(2, dtype=np.int32)
+for _kind, _symbols in REPERTOIRE.items():
+    REP[_kind, :len(_symbols)] = [SYMBOL_INDEX[s] for s in _symbols]
+    REP_LEN[_kind] = len(_symbols)
+
+# direção e shift "seguradas" por símbolo (usadas no ar, como no jogador)
+_LEFT = np.array([s in ('A', 'SHIFT+A', 'S+A') for s in SYMBOL_INDEX], dtype=bool)
+_RIGHT = np.array([s in ('D', 'SHIFT+D', 'S+D') for s in SYMBOL_INDEX], dtype=bool)
+_SHIFT = np.array([s in ('SHIFT+A', 'SHIFT+D') for s in SYMBOL_INDEX], dtype=bool)
+_SPACE = SYMBOL_INDEX['SPACE']
+_JUMP_RIGHT = STATE_INDEX[State.JUMP]
+_JUMP_LEFT = STATE_INDEX[State.JUMP_LEFT]
+
+
+# Frames do Pakkun por estado, virados para a esquerda nos estados *_LEFT
+def load_pakkun_frames(scale=1.0):
+    anims = {name: load_frame_files(paths, scale) for name, paths in PAKKUN_ANIMATIONS.items()}
+    flipped = {name: [flip_frame(frame) for frame in frames]
+               for name, frames in anims.items()}
+    return {state: (flipped if state in (State.IDLE_LEFT, State.WALK_LEFT, State.RUN_LEFT)
+                    else anims)[PAKKUN_STATES.get(state, 'sit')]
+            for state in STATES}
+
+
+class Crowd:
+    def __init__(self, n, width, height, pakkun_ratio=0.5, seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.n = n
+        self.width = width
+        self.kind = (self.rng.random(n) < pakkun_ratio).astype(np.int32)
+        self.sid = np.full(n, STATE_INDEX[State.IDLE], dtype=np.int32)
+        self.frame = np.zeros(n, dtype=np.int32)
+        self.tick = np.zeros(n, dtype=np.int32)
+        self.x = self.rng.uniform(0, width, n)
+        # espalhados em profundidade um pouco acima do chão do jogador
+        self.y = height - 50 - self.rng.integers(0, 160, n).astype(np.float64)
+        self.jump_timer = np.zeros(n, dtype=np.int32)
+        self.jump_offset = np.zeros(n)
+        self.raikiri_start = np.zeros(n)
+        self.symbol = np.zeros(n, dtype=np.int32)  # tecla "segurada" por cada um
+        self.order = np.argsort(self.y, kind='stable')  # desenha do fundo para a frente
+        self.skins = None
+
+    # Cada personagem troca de tecla com probabilidade `p` por tick
+    def think(self, p=0.02):
+        change = self.rng.random(self.n) < p
+        if change.any():
+            kind = self.kind[change]
+            pick = (self.rng.random(kind.size) * REP_LEN[kind]).astype(np.int32)
+            self.symbol[change] = REP[kind, pick]
+
+    # Um tick para todos, com as mesmas regras de simulation.step()
+    def step(self, now):
+        kind = self.kind
+        sid = self.sid
+        frame = self.frame
+        tick = self.tick
+        held = self.symbol
+        jt = self.jump_timer
+
+        # Atualiza estado (δ); nos estados bloqueados a tecla é ignorada
+        sym = np.where(BLOCKED[sid], 0, held)
+        jt[sym == _SPACE] = jump_duration
+        new = DELTA_NP[sid, sym]
+        changed = new != sid
+        frame[changed] = 0
+        tick[changed] = 0
+        sid = new
+
+        # Atualiza frame
+        rate = RATE[sid]
+        mode = MODE[sid]
+        count = COUNT[kind, sid]
+        due = tick % rate == 0
+        frame = np.where(due & (mode == LOOP), (frame + 1) % count, frame)
+        frame = np.where(due & (mode == HOLD), np.minimum(frame + 1, count - 1), frame)
+        once = due & (mode == ONCE)
+        once &= tick % (rate * HOLD_MULT[sid, np.minimum(frame, _MAX_FRAMES - 1)]) == 0
+        more = frame + 1 < count
+        frame = frame + ((once | (due & (mode == FINAL))) & more)
+        fin = once & ~more
+        if fin.any():
+            done = DONE[sid]
+            frame = np.where(fin, np.where(DONE_LAST[sid], COUNT[kind, done] - 1, 0), frame)
+            sid = np.where(fin, done, sid)
+            tick[fin] = 0
+            count = COUNT[kind, sid]
+
+        # garantia extra: nunca saia dos limites
+        frame = np.clip(frame, 0, count - 1)
+
+        # Física do pulo e movimento
+        motion = MOTION[sid]
+        x = self.x + np.where(motion == GROUND, DX[sid], 0.0)
+        offset = np.zeros(self.n)
+
+        jumping = motion == JUMP
+        if jumping.any():
+            left, right, shift = _LEFT[held], _RIGHT[held], _SHIFT[held]
+            air = jumping & (jt > 0)
+            land = jumping & (jt <= 0)
+            prog = 1 - jt / jump_duration
+            offset = np.where(air, -np.sin(prog * np.pi) * jump_height, 0.0)
+            jt -= air
+            # Flipping de direção no ar
+            to_left = air & left & (sid == _JUMP_RIGHT)
+            to_right = air & right & (sid == _JUMP_LEFT)
+            sid = np.where(to_left, _JUMP_LEFT, np.where(to_right, _JUMP_RIGHT, sid))
+            # Movimento horizontal no ar
+            speed = np.where(shift, run_speed, walk_speed)
+            x += np.where(air & left, -speed, np.where(air & right, speed, 0))
+            sid = np.where(land, DONE[sid], sid)
+            frame[land] = 0
+            tick[land] = 0
+
+        raikiri = motion == RAIKIRI
+        if raikiri.any():
+            rs = self.raikiri_start
+            starting = raikiri & (frame == 0) & (rs == 0)
+            rs[starting] = now
+            elapsed = now - rs
+            early = raikiri & (frame < 11)
+            late = raikiri & ~early & (tick % raikiri_anim_rate_fast == 0)
+            frame = np.where(early, np.minimum((elapsed / 3000 * 11).astype(np.int32), 11), frame + late)
+            x += np.where(raikiri & (frame >= 11), DX[sid], 0.0)
+            end = raikiri & (frame >= COUNT[kind, sid])
+            sid = np.where(end, DONE[sid], sid)
+            frame[end] = 0
+            tick[end] = 0
+            rs[end] = 0
+
+        # Manter dentro da tela
+        np.clip(x, 0, self.width, out=x)
+
+        self.sid = sid
+        self.frame = frame
+        self.tick = tick + 1
+        self.x = x
+        self.jump_offset = offset
+
+    # ----- desenho -----
+    # `skins`: tipo -> {State: frames}, já na escala da superfície de desenho
+    def bind(self, skins):
+        self.skins = [[skins[k][state] for state in STATES] for k in (KAKASHI, PAKKUN)]
+        self.w = np.array([[frames[0].get_width() for frames in s] for s in self.skins], dtype=np.int32)
+        self.h = np.array([[frames[0].get_height() for frames in s] for s in self.skins], dtype=np.int32)
+
+    # Retângulo do frame de cada um (esquerda, topo, largura, altura) na superfície de
+    # desenho; `factor` converte unidades de tela para ela e `camera` é o deslocamento
+    # da câmera do mundo, em pixels dela
+    def layout(self, factor=1, camera=0):
+        w, h = self.w[self.kind, self.sid], self.h[self.kind, self.sid]
+        left = (self.x / factor).astype(np.int32) - w // 2 - camera
+        top = ((self.y + self.jump_offset) / factor).astype(np.int32) - h
+        return left, top, w, h
+
+    # Empurra os atingidos para longe de `x` com um pulo (reação ao golpe)
+    def knock(self, hits, x, distance=80):
+        hits = np.asarray(hits, dtype=np.int64)
+        left = self.x[hits] < x
+        self.sid[hits] = np.where(left, _JUMP_LEFT, _JUMP_RIGHT)
+        self.frame[hits] = 0
+        self.tick[hits] = 0
+        self.jump_timer[hits] = jump_duration
+        self.x[hits] += np.where(left, -distance, distance)
+        np.clip(self.x, 0, self.width, out=self.x)
+
+    # Envia a multidão para a fila de desenho, do fundo para a frente, já sem quem
+    # está fora da tela
+    def submit(self, queue, factor=1, camera=0, layer=LAYER_CROWD):
+        order = self.order
+        left, top, w, h = self.layout(factor, camera)
+        kind, sid, frame = self.kind[order], self.sid[order], self.frame[order]
+        left, top, w, h = left[order], top[order], w[order], h[order]
+        visible = (left < queue.width) & (top < queue.height) & (left + w > 0) & (top + h > 0)
+        skins = self.skins
+        # cada frame é um recorte compartilhado e o deslocamento dele no quadro
+        items = []
+        for k, s, f, l, t in zip(kind[visible].tolist(), sid[visible].tolist(), frame[visible].tolist(),
+                                 left[visible].tolist(), top[visible].tolist()):
+            surf, (dx, dy), _ = skins[k][s][f]
+            items.append((surf, (l + dx, t + dy)))
+        queue.extend(items, layer, culled=self.n - len(items))
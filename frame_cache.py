@@ -0,0 +1,156 @@
+# Cache em disco dos frames finais (recortes já escalados, assets.Frame) em RGBA cru.
+# O arquivo é mapeado em memória e as superfícies apontam direto para o buffer,
+# sem decodificar PNG nem reescalar. Um arquivo por chave (frame_cache_path): o jogo
+# abre mais de um conjunto de animações na mesma execução (só o lado direito com
+# AFD_MIRROR, todas para a multidão), e com um arquivo só um apagaria o outro a cada vez.
+# Cada gravação apaga os arquivos além dos CACHE_KEEP usados mais recentemente (abrir um
+# cache atualiza o mtime dele), para mudanças de sprite, escala ou resolução não
+# deixarem 50–70 MB para trás a cada vez.
+#
+# Formato (little-endian):
+#   cabeçalho: magic 'AFDF', versão u32, chave sha1 (20 bytes), formato de pixel (4 bytes),
+#              quantidade de frames u32
+#   tabela:    por frame -> estado u16, índice u16, quadro largura/altura u32, recorte
+#              largura/altura u32, deslocamento x/y i32, offset dos pixels u64
+#   dados:     pixels de cada recorte, alinhados em CACHE_ALIGN bytes; recortes
+#              compartilhados (FrameInterner) são gravados uma vez
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from afd import State
+from assets import ANIMATIONS, Frame, base, load_all_frames, source_stamps
+
+FRAME_CACHE_DIR = os.path.join(base, 'build')
+CACHE_MAGIC = b'AFDF'
+CACHE_VERSION = 3
+CACHE_ALIGN = 64
+CACHE_KEEP = 4  # arquivos de cache mantidos em FRAME_CACHE_DIR
+
+_HEADER = struct.Struct('<4sI20s4sI')
+_ENTRY = struct.Struct('<HHIIIIiiQ')
+
+# Último mapeamento aberto de cada arquivo. As superfícies criadas com frombuffer
+# seguram o buffer delas; reabrir o mesmo arquivo só troca a entrada, e o mapeamento
+# antigo é liberado quando as superfícies dele deixarem de existir.
+_mappings = {}
+
+
+# Formato de bytes que reproduz o layout de convert_alpha() na tela atual
+def native_pixel_format():
+    probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    if probe.get_masks() == (0xff0000, 0xff00, 0xff, 0xff000000):
+        return 'BGRA'
+    return 'RGBA'
+
+# Chave do cache: mtimes dos PNGs de origem, escala, resolução e formato de pixel
+def frame_cache_key(scale, screen_size, pixel_format, animations=ANIMATIONS):
+    payload = json.dumps({
+        'version': CACHE_VERSION,
+        'sources': source_stamps(animations),
+        'animations': [[s.name, prefix, count] for s, (_, prefix, count) in animations.items()],
+        'scale': scale,
+        'screen': list(screen_size),
+        'format': pixel_format,
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).digest()
+
+# Arquivo do cache de uma chave: build/frames-<início da chave>.bin
+def frame_cache_path(key, directory=FRAME_CACHE_DIR):
+    return os.path.join(directory, f'frames-{key.hex()[:8]}.bin')
+
+def _align(n):
+    return (n + CACHE_ALIGN - 1) // CACHE_ALIGN * CACHE_ALIGN
+
+# Grava o dicionário de frames no formato binário do cache
+def write_frame_cache(frames, key, pixel_format, path=None):
+    path = path or frame_cache_path(key)
+    entries = [(state, i, frame) for state, seq in frames.items() for i, frame in enumerate(seq)]
+    offset = _align(_HEADER.size + _ENTRY.size * len(entries))
+    # recortes compartilhados (FrameInterner) são gravados uma vez e apontam para o mesmo offset
+    table, written, offsets = [], {}, []
+    for state, i, (surf, (x, y), (w, h)) in entries:
+        cw, ch = surf.get_size()
+        start = written.get(id(surf))
+        if start is None:
+            start = written[id(surf)] = offset
+            offsets.append((surf, start))
+            offset = _align(offset + cw * ch * 4)
+        table.append(_ENTRY.pack(state.value, i, w, h, cw, ch, x, y, start))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, key, pixel_format.encode('ascii'), len(entries)))
+        f.write(b''.join(table))
+        for surf, start in offsets:
+            f.seek(start)
+            f.write(pygame.image.tobytes(surf, pixel_format))
+        f.truncate(offset)
+    # troca atômica: nunca deixa um cache pela metade no lugar do antigo
+    os.replace(tmp, path)
+    prune_frame_caches(os.path.dirname(path))
+
+# Apaga os caches de `directory` além dos `keep` usados mais recentemente (inclusive o
+# build/frames.bin das versões com um arquivo só)
+def prune_frame_caches(directory=FRAME_CACHE_DIR, keep=CACHE_KEEP):
+    paths = sorted(glob.glob(os.path.join(directory, 'frames*.bin')), key=os.path.getmtime, reverse=True)
+    for old in paths[keep:]:
+        _mappings.pop(old, None)
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+# Abre o cache e cria as superfícies direto do mmap; None se ausente ou com outra chave
+def open_frame_cache(key, path=None):
+    path = path or frame_cache_path(key)
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, file_key, fmt, count = _HEADER.unpack_from(mm, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or file_key != key:
+        mm.close()
+        return None
+    try:
+        os.utime(path)  # usado agora: fica entre os CACHE_KEEP mais recentes
+    except OSError:
+        pass
+
+    fmt = fmt.decode('ascii')
+    view = memoryview(mm)
+    frames = {}
+    shared = {}  # offset -> recorte: o mesmo recorte em várias animações é um objeto só
+    for n in range(count):
+        value, i, w, h, cw, ch, x, y, offset = _ENTRY.unpack_from(mm, _HEADER.size + n * _ENTRY.size)
+        surf = shared.get(offset)
+        if surf is None:
+            surf = shared[offset] = pygame.image.frombuffer(view[offset:offset + cw * ch * 4], (cw, ch), fmt)
+        frames.setdefault(State(value), []).append(Frame(surf, (x, y), (w, h)))
+    _mappings[path] = mm
+    return frames
+
+# Carrega os frames pelo cache cru, reconstruindo-o quando a chave mudar
+def load_cached_frames(scale, screen_size, animations=ANIMATIONS, path=None):
+    fmt = native_pixel_format()
+    key = frame_cache_key(scale, screen_size, fmt, animations)
+    path = path or frame_cache_path(key)
+    frames = open_frame_cache(key, path)
+    if frames is not None and all(state in frames for state in animations):
+        return frames
+    frames = load_all_frames(scale, animations)
+    try:
+        write_frame_cache(frames, key, fmt, path)
+    except OSError:
+        return frames
+    return open_frame_cache(key, path) or frames
@@ -0,0 +1,113 @@
+# Entrada por eventos: KEYDOWN/KEYUP são lidos uma vez por frame e guardados num
+# buffer circular com a hora em que foram lidos. Um toque que desce e sobe entre dois
+# ticks ainda vale para o tick seguinte, e as duas teclas de um acorde (R+T, S+A, ...)
+# valem juntas se foram apertadas dentro de `window_ms` uma da outra, mesmo que a
+# primeira já tenha sido solta. A latência é medida da leitura do evento até o frame
+# que mostra a mudança de estado causada por ele.
+from collections import deque
+
+import pygame
+
+from profiler import percentile
+from simulation import read_input
+
+# Teclas do jogo e seus nomes em simulation.choose_symbol() (REWIND volta no tempo, fora do AFD)
+KEY_NAMES = {
+    pygame.K_SPACE: 'SPACE', pygame.K_p: 'P', pygame.K_u: 'U', pygame.K_m: 'M',
+    pygame.K_j: 'J', pygame.K_h: 'H', pygame.K_r: 'R', pygame.K_t: 'T',
+    pygame.K_s: 'S', pygame.K_a: 'A', pygame.K_d: 'D',
+    pygame.K_LSHIFT: 'SHIFT', pygame.K_RSHIFT: 'SHIFT',
+    pygame.K_BACKSPACE: 'REWIND',
+}
+
+# Pares de teclas que formam um símbolo juntos em choose_symbol()
+CHORDS = (('R', 'T'), ('S', 'A'), ('S', 'D'), ('SHIFT', 'A'), ('SHIFT', 'D'))
+PARTNERS = {}
+for _a, _b in CHORDS:
+    PARTNERS.setdefault(_a, set()).add(_b)
+    PARTNERS.setdefault(_b, set()).add(_a)
+
+COMBO_WINDOW_MS = 80
+
+
+class InputBuffer:
+    def __init__(self, window_ms=COMBO_WINDOW_MS, size=64, history=1000):
+        self.window_ms = window_ms
+        self.ring = deque(maxlen=size)  # (ms, nome, apertou?)
+        self.held = {}      # nome -> quantas teclas físicas com esse nome estão descidas
+        self.latched = {}   # nome -> hora do aperto ainda não visto por nenhum tick
+        self.pending = None  # hora do aperto que mudou o estado, até o frame ser mostrado
+        self.latencies = deque(maxlen=history)  # ms do aperto até o frame desenhado
+        self.taps = 0       # toques que desceram e subiram entre dois ticks
+        self.chords = 0     # acordes completados pela janela
+
+    # Consome os eventos de teclado do frame; `now` é a hora da leitura em ms
+    def feed(self, events, now):
+        for ev in events:
+            if ev.type == pygame.KEYDOWN:
+                name = KEY_NAMES.get(ev.key)
+                if name is not None:
+                    self.press(name, now)
+            elif ev.type == pygame.KEYUP:
+                name = KEY_NAMES.get(ev.key)
+                if name is not None:
+                    self.release(name, now)
+            elif ev.type == pygame.WINDOWFOCUSLOST:
+                # os KEYUP não chegam com a janela sem foco
+                self.held.clear()
+
+    def press(self, name, now):
+        self.ring.append((now, name, True))
+        self.held[name] = self.held.get(name, 0) + 1
+        self.latched.setdefault(name, now)
+        # parceiro de acorde apertado há pouco: vale de novo, junto com esta tecla
+        partners = PARTNERS.get(name)
+        if partners:
+            for t, other, down in reversed(self.ring):
+                if now - t > self.window_ms:
+                    break
+                if down and other in partners and other not in self.latched:
+                    self.latched[other] = t
+                    self.chords += 1
+
+    def release(self, name, now):
+        self.ring.append((now, name, False))
+        count = self.held.get(name, 0) - 1
+        if count > 0:
+            self.held[name] = count
+        else:
+            self.held.pop(name, None)
+            if name in self.latched:
+                self.taps += 1
+
+    # Teclas que o próximo tick vê: as descidas mais os apertos ainda não vistos
+    def pressed(self):
+        if not self.latched:
+            return self.held.keys()
+        return self.held.keys() | self.latched.keys()
+
+    def read(self, game):
+        return read_input(self.pressed(), game)
+
+    # Chamar depois de cada tick: os apertos foram vistos; se mudaram o estado, a
+    # latência é fechada no próximo present()
+    def consume(self, changed):
+        if self.latched:
+            if changed and self.pending is None:
+                self.pending = min(self.latched.values())
+            self.latched.clear()
+
+    # Chamar depois de desenhar o frame, com a hora em ms
+    def presented(self, now):
+        if self.pending is not None:
+            self.latencies.append(now - self.pending)
+            self.pending = None
+
+    def stats(self):
+        ordered = sorted(self.latencies)
+        return {
+            'actions': len(ordered),
+            'taps': self.taps,
+            'chords': self.chords,
+            'latency_ms': tuple(round(percentile(ordered, p), 1) for p in (50, 95, 99)),
+        }
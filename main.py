@@ -1,194 +1,25 @@
 import pygame
 import os
-import math
-from enum import Enum, auto
-import sys
+import time
+
+from afd import State, transitions
+from animation_store import AnimationStore, make_loader
+from async_loader import ESSENTIAL_STATES, AssetLoader, run_loading_screen
+from assets import ANIMATIONS, MIRRORS, MirroredFrames, base, mirror_frames, right_facing
+from blit_modes import DrawFrames, load_choices
+from capture import FrameCapture
+from frame_cache import load_cached_frames
+from input_buffer import COMBO_WINDOW_MS, InputBuffer
+from render import (SHARINGAN_FADE_FRAME, SHARINGAN_FULLSCREEN_FRAMES, DirtyRectRenderer,
+                    LAYER_HUD, FullRenderer, FullscreenCache, LowResRenderer, RenderQueue,
+                    fade_alpha, set_surface_alpha)
+from replay import Playback, Recorder, Recording, allow, veto
+from rollback import SnapshotRing
+from profiler import FrameProfiler
+from simulation import EVENT_RAIKIRI, EVENT_SHARINGAN, EVENT_WIN, GameState, step
+from timestep import TICK_MS, FixedTimestep, lerp
+from world import WORLD_MAPS, Camera, TileCache, World, WorldView
 
-# ----- Definições de Estado e Símbolo -----
-class State(Enum):
-    IDLE = auto()
-    IDLE_LEFT = auto()
-    WALK_RIGHT = auto()
-    WALK_LEFT = auto()
-    RUN_RIGHT = auto()
-    RUN_LEFT = auto()
-    CROUCH = auto()
-    CROUCH_LEFT = auto()
-    CROUCH_WALK = auto()
-    CROUCH_WALK_LEFT = auto()
-    JUMP = auto()
-    JUMP_LEFT = auto()
-    RAIKIRI = auto()
-    RAIKIRI_LEFT = auto()
-    ATTACK = auto()
-    ATTACK_LEFT = auto()
-    ATTACK_CROUCH = auto()
-    ATTACK_CROUCH_LEFT = auto()
-    ATTACK_RUN = auto()
-    ATTACK_RUN_LEFT = auto()
-    ATTACK_UP = auto()
-    ATTACK_UP_LEFT = auto()
-    SHARINGAN = auto()
-    SHARINGAN_LEFT = auto()
-    WIN = auto()
-    WIN_LEFT = auto()
-    NINDOG_RIGHT = auto()
-    NINDOG_LEFT = auto()
-
-
-# Símbolos de entrada (None equivale a nenhuma tecla)
-Symbol = str
-
-# ----- Tabela de Transições (δ) -----
-# Chave: (estado_atual, símbolo) -> próximo estado
-transitions: dict[tuple[State, Symbol], State] = {
-    (State.IDLE,      'A'): State.WALK_LEFT,
-    (State.IDLE,      'D'): State.WALK_RIGHT,
-    (State.IDLE,      'SHIFT+A'): State.RUN_LEFT,
-    (State.IDLE,      'SHIFT+D'): State.RUN_RIGHT,
-    (State.IDLE,      'S'): State.CROUCH,
-    (State.IDLE,      'S+A'): State.CROUCH_WALK_LEFT,
-    (State.IDLE,      'S+D'): State.CROUCH_WALK,
-    (State.IDLE,      'SPACE'): State.JUMP,
-    (State.IDLE,      'R+T'): State.RAIKIRI,
-    (State.IDLE,        'H'): State.ATTACK,
-    (State.IDLE,      None): State.IDLE,
-    (State.IDLE,    'U'): State.ATTACK_UP,
-    (State.IDLE,      'J'): State.SHARINGAN,
-    (State.IDLE,      'P'): State.WIN,
-    (State.IDLE,      'M'): State.NINDOG_RIGHT,
-
-
-
-
-
-    (State.IDLE_LEFT, 'A'): State.WALK_LEFT,
-    (State.IDLE_LEFT, 'D'): State.WALK_RIGHT,
-    (State.IDLE_LEFT, 'SHIFT+A'): State.RUN_LEFT,
-    (State.IDLE_LEFT, 'SHIFT+D'): State.RUN_RIGHT,
-    (State.IDLE_LEFT, 'S'): State.CROUCH_LEFT,
-    (State.IDLE_LEFT, 'S+A'): State.CROUCH_WALK_LEFT,
-    (State.IDLE_LEFT, 'S+D'): State.CROUCH_WALK,
-    (State.IDLE_LEFT, 'SPACE'): State.JUMP_LEFT,
-    (State.IDLE_LEFT, 'R+T'): State.RAIKIRI_LEFT,
-    (State.IDLE_LEFT, None): State.IDLE_LEFT,
-    (State.IDLE_LEFT,   'H'): State.ATTACK_LEFT,
-    (State.IDLE_LEFT, 'U'): State.ATTACK_UP_LEFT,
-    (State.IDLE_LEFT, 'J'): State.SHARINGAN_LEFT,
-    (State.IDLE_LEFT, 'P'): State.WIN_LEFT,
-    (State.IDLE_LEFT, 'M'): State.NINDOG_LEFT,
-
-
-    (State.WALK_RIGHT, 'D'): State.WALK_RIGHT,
-    (State.WALK_RIGHT, 'A'): State.WALK_LEFT,
-    (State.WALK_RIGHT, 'SHIFT+D'): State.RUN_RIGHT,
-    (State.WALK_RIGHT, 'S'): State.CROUCH,
-    (State.WALK_RIGHT, 'SPACE'): State.JUMP,
-    (State.WALK_RIGHT, None): State.IDLE,
-    (State.WALK_RIGHT, 'H'): State.ATTACK,
-    (State.WALK_RIGHT, 'R+T'): State.WALK_RIGHT,
-    (State.WALK_RIGHT, 'U'): State.ATTACK_UP,
-    (State.WALK_RIGHT, 'P'): State.WALK_RIGHT,
-
-    (State.WALK_LEFT,  'A'): State.WALK_LEFT,
-    (State.WALK_LEFT,  'D'): State.WALK_RIGHT,
-    (State.WALK_LEFT,  'SHIFT+A'): State.RUN_LEFT,
-    (State.WALK_LEFT,  'S'): State.CROUCH_LEFT,
-    (State.WALK_LEFT,  'SPACE'): State.JUMP_LEFT,
-    (State.WALK_LEFT,  None): State.IDLE_LEFT,
-    (State.WALK_LEFT, 'H'): State.ATTACK_LEFT,
-    (State.WALK_LEFT, 'R+T'): State.WALK_LEFT,
-    (State.WALK_LEFT, 'U'): State.ATTACK_UP_LEFT,
-    (State.WALK_LEFT, 'P'): State.WALK_LEFT,
-
-    (State.RUN_RIGHT,  'SHIFT+D'): State.RUN_RIGHT,
-    (State.RUN_RIGHT,  'SHIFT+A'): State.RUN_LEFT,
-    (State.RUN_RIGHT,  'D'): State.WALK_RIGHT,
-    (State.RUN_RIGHT,  'A'): State.WALK_LEFT,
-    (State.RUN_RIGHT,  'S'): State.CROUCH,
-    (State.RUN_RIGHT,  'SPACE'): State.JUMP,
-    (State.RUN_RIGHT,  None): State.IDLE,
-    (State.RUN_RIGHT, 'H'): State.ATTACK_RUN,
-    (State.RUN_RIGHT, 'R+T'): State.RUN_RIGHT,
-    (State.RUN_RIGHT, 'U'): State.ATTACK_UP,
-    (State.RUN_RIGHT, 'P'): State.RUN_RIGHT,
-
-    (State.RUN_LEFT,   'SHIFT+A'): State.RUN_LEFT,
-    (State.RUN_LEFT,  'SHIFT+D'): State.RUN_RIGHT,
-    (State.RUN_LEFT,   'A'): State.WALK_LEFT,
-    (State.RUN_LEFT,   'D'): State.WALK_RIGHT,
-    (State.RUN_LEFT,   'S'): State.CROUCH_LEFT,
-    (State.RUN_LEFT,   'SPACE'): State.JUMP_LEFT,
-    (State.RUN_LEFT,   None): State.IDLE_LEFT,
-    (State.RUN_LEFT, 'H'): State.ATTACK_RUN_LEFT,
-    (State.RUN_LEFT, 'R+T'): State.RUN_LEFT,
-    (State.RUN_LEFT, 'U'): State.ATTACK_UP_LEFT,
-    (State.RUN_LEFT, 'P'): State.RUN_LEFT,
-
-
-
-    (State.CROUCH,     'S'): State.CROUCH,
-    (State.CROUCH,     'S+A'): State.CROUCH_WALK_LEFT,
-    (State.CROUCH,     'S+D'): State.CROUCH_WALK,
-    (State.CROUCH,     'SPACE'): State.JUMP,
-    (State.CROUCH,     None): State.IDLE,
-    (State.CROUCH,     'R+T'): State.CROUCH,
-    (State.CROUCH,     'H'): State.ATTACK_CROUCH,
-    (State.CROUCH,     'U'): State.ATTACK_UP,
-    (State.CROUCH,     'P'): State.CROUCH,
-
-    (State.CROUCH_LEFT,'S'): State.CROUCH_LEFT,
-    (State.CROUCH_LEFT,'S+A'): State.CROUCH_WALK_LEFT,
-    (State.CROUCH_LEFT,'S+D'): State.CROUCH_WALK,
-    (State.CROUCH_LEFT,'SPACE'): State.JUMP_LEFT,
-    (State.CROUCH_LEFT, None): State.IDLE_LEFT,
-    (State.CROUCH_LEFT, 'R+T'): State.CROUCH_LEFT,
-    (State.CROUCH_LEFT,'H'): State.ATTACK_CROUCH_LEFT,
-    (State.CROUCH_LEFT, 'U'): State.ATTACK_UP_LEFT,
-    (State.CROUCH_LEFT, 'P'): State.CROUCH_LEFT,
-
-    (State.CROUCH_WALK,'S+D'): State.CROUCH_WALK,
-    (State.CROUCH_WALK,'S+A'): State.CROUCH_WALK_LEFT,
-    (State.CROUCH_WALK,'S'): State.CROUCH,
-    (State.CROUCH_WALK,'SPACE'): State.JUMP,
-    (State.CROUCH_WALK, None): State.CROUCH,
-    (State.CROUCH_WALK, 'R+T'): State.CROUCH_WALK,
-    (State.CROUCH_WALK, 'H'): State.ATTACK_CROUCH,
-    (State.CROUCH_WALK, 'U'): State.ATTACK_UP,
-    (State.CROUCH_WALK, 'P'): State.CROUCH_WALK,
-
-    (State.CROUCH_WALK_LEFT,'S+A'): State.CROUCH_WALK_LEFT,
-    (State.CROUCH_WALK_LEFT,'S+D'): State.CROUCH_WALK,
-    (State.CROUCH_WALK_LEFT,'S'): State.CROUCH_LEFT,
-    (State.CROUCH_WALK_LEFT,'SPACE'): State.JUMP_LEFT,
-    (State.CROUCH_WALK_LEFT, None): State.CROUCH_LEFT,
-    (State.CROUCH_WALK_LEFT, 'R+T'): State.CROUCH_WALK_LEFT,
-    (State.CROUCH_WALK_LEFT, 'H'): State.ATTACK_CROUCH_LEFT,
-    (State.CROUCH_WALK_LEFT, 'U'): State.ATTACK_UP_LEFT,
-    (State.CROUCH_WALK_LEFT, 'P'): State.CROUCH_WALK_LEFT,
-
-    # Jump and Raikiri preserve
-    (State.JUMP, None): State.JUMP,
-    (State.JUMP_LEFT, None): State.JUMP_LEFT,
-    (State.RAIKIRI, None): State.RAIKIRI,
-    (State.RAIKIRI_LEFT, None): State.RAIKIRI_LEFT,
-
-    # Attack preserve
-    (State.ATTACK, None): State.ATTACK,
-    (State.ATTACK_LEFT, None): State.ATTACK_LEFT,
-    (State.ATTACK_CROUCH, None): State.ATTACK_CROUCH,
-    (State.ATTACK_CROUCH_LEFT, None): State.ATTACK_CROUCH_LEFT,
-    (State.ATTACK_RUN, None): State.ATTACK_RUN,
-    (State.ATTACK_RUN_LEFT, None): State.ATTACK_RUN_LEFT,
-    (State.ATTACK_UP, None): State.ATTACK_UP,
-    (State.ATTACK_UP_LEFT, None): State.ATTACK_UP_LEFT,
-    (State.SHARINGAN, None): State.SHARINGAN,
-    (State.SHARINGAN_LEFT, None): State.SHARINGAN_LEFT,
-    (State.WIN, None): State.WIN,
-    (State.WIN_LEFT, None): State.WIN_LEFT,
-    (State.NINDOG_RIGHT, None): State.NINDOG_RIGHT,
-    (State.NINDOG_LEFT, None): State.NINDOG_LEFT,
-}
 
 def init_pygame(width=1500, height=800):
     pygame.init()
@@ -199,424 +30,368 @@ def init_pygame(width=1500, height=800):
     clock = pygame.time.Clock()
     return screen, clock
 
-# Carrega imagem com canal alpha
-def load_image(path):
-    return pygame.image.load(path).convert_alpha()
-
-# Carrega sequência de frames a partir de pasta, prefixo e quantidade
-def load_frames(folder, prefix, count, scale=1.0):
-    frames = []
-    raw = []
-    max_w = max_h = 0
-    for i in range(1, count + 1):
-        img = load_image(os.path.join(folder, f"{prefix}-{i}.png"))
-        rect = img.get_bounding_rect()
-        raw.append((img, rect))
-        max_w = max(max_w, rect.width)
-        max_h = max(max_h, rect.height)
-    for img, rect in raw:
-        surf = pygame.Surface((max_w, max_h), pygame.SRCALPHA)
-        dest = rect.copy()
-        dest.midbottom = (max_w // 2, max_h)
-        surf.blit(img, dest.topleft, rect)
-        # Escala aplicada aqui
-        if scale != 1.0:
-            new_size = (int(surf.get_width() * scale), int(surf.get_height() * scale))
-            surf = pygame.transform.scale(surf, new_size)
-        frames.append(surf)
-    return frames
-
 
-# Diretórios de sprites
-base = os.path.dirname(__file__)
-stand_folder       = os.path.join(base, 'Sprite', 'stand')
-stand_left_folder  = os.path.join(stand_folder, 'espelhadas')
-walk_r_folder      = os.path.join(base, 'Sprite', 'walk')
-walk_l_folder      = os.path.join(walk_r_folder, 'espelhadas')
-run_r_folder       = os.path.join(base, 'Sprite', 'run')
-run_l_folder       = os.path.join(run_r_folder, 'espelhadas')
-crouch_folder      = os.path.join(base, 'Sprite', 'crouch')
-crouch_left_folder = os.path.join(crouch_folder, 'espelhadas')
-crouch_walk_folder = os.path.join(base, 'Sprite', 'crouchWalk')
-crouch_walk_left   = os.path.join(crouch_walk_folder, 'espelhadas')
-jump_r_folder      = os.path.join(base, 'Sprite', 'jump')
-jump_l_folder      = os.path.join(jump_r_folder, 'espelhadas')
-raikiri_r_folder = os.path.join(base, 'Sprite', 'raikiri')
-raikiri_l_folder = os.path.join(raikiri_r_folder, 'espelhadas')
-attack_r_folder    = os.path.join(base, 'Sprite', 'attack')
-attack_l_folder    = os.path.join(attack_r_folder, 'espelhadas')
-attack_c_folder    = os.path.join(base, 'Sprite', 'attackCombo')
-attack_c_l_folder  = os.path.join(attack_c_folder, 'espelhadas')
-attack_run_folder    = os.path.join(base, 'Sprite', 'attackCombo')
-attack_run_l_folder  = os.path.join(attack_run_folder, 'espelhadas')
-attack_up_folder   = os.path.join(base, 'Sprite', 'attackCombo')
-attack_up_l_folder = os.path.join(attack_up_folder, 'espelhadas')
-sharingan_r_folder = os.path.join(base, 'Sprite', 'sharingan')
-sharingan_l_folder = os.path.join(sharingan_r_folder, 'espelhadas')
-win_r_folder = os.path.join(base, 'Sprite', 'win')
-win_l_folder = os.path.join(win_r_folder, 'espelhadas')
-nindog_r_folder = os.path.join(base,'Sprite', 'ninDogs')
-nindog_l_folder = os.path.join(nindog_r_folder,'espelhadas')
-
-
-
-# Parâmetros
-crouch_walk_speed = 1.6
-walk_speed = 3
-run_speed = 10
-jump_height = 400
-jump_duration = 50  # frames
-frame_rates = {
-    'default':8,
-    'attack':4,
-    'crouch_attack':4,
-    'run_attack':4,
-    'up_attack':4,
-    'sharingan': 4,
-}
+# Origem das animações viradas para a esquerda (variável de ambiente AFD_MIRROR):
+#   'files' -> PNGs das pastas espelhadas/
+#   'flip'  -> vira os frames da direita uma vez no carregamento
+#   'draw'  -> guarda só a direita e vira na hora do desenho (cache de superfícies viradas)
+MIRROR_MODE = os.environ.get('AFD_MIRROR', 'files')
+# Orçamento em MB do AnimationStore (AFD_STORE_MB); sem ele todas as animações são carregadas no início
+STORE_BUDGET_MB = os.environ.get('AFD_STORE_MB')
+# Threads do carregamento em segundo plano (AFD_LOADER_WORKERS); sem ele tudo é carregado antes do jogo
+LOADER_WORKERS = os.environ.get('AFD_LOADER_WORKERS')
+# Modo de desenho (AFD_RENDER): 'full' redesenha a tela toda, 'dirty' só os retângulos do sprite,
+#   'lowres' monta a cena na resolução da arte e amplia 4× de uma vez só
+RENDER_MODE = os.environ.get('AFD_RENDER', 'full')
+# Quantidade de personagens da multidão controlados pelo computador (AFD_CROWD); exige NumPy
+CROWD_SIZE = os.environ.get('AFD_CROWD')
+# Partículas do Raikiri, dos cães ninja e da troca de mapa do Sharingan (AFD_PARTICLES=1, ou o
+# máximo de partículas vivas; 0 ou vazio desliga); exige NumPy
+PARTICLES = int(os.environ.get('AFD_PARTICLES') or 0)
+# Perfil por fase com overlay (AFD_PROFILE=1, ou um caminho .csv/.json para gravar o trace ao sair;
+# 0 ou vazio desliga); F3 liga/desliga durante o jogo
+PROFILE = os.environ.get('AFD_PROFILE', '')
+PROFILE_TRACE = PROFILE if PROFILE.endswith(('.csv', '.json')) else None
+# Janela em ms para as duas teclas de um acorde (R+T, S+A, ...) valerem juntas (AFD_COMBO_MS)
+COMBO_MS = float(os.environ.get('AFD_COMBO_MS', COMBO_WINDOW_MS))
+# Grava a entrada de cada tick num arquivo .afdr (AFD_RECORD) ou joga uma gravação no
+# lugar do teclado (AFD_REPLAY); veja replay.py
+RECORD_PATH = os.environ.get('AFD_RECORD')
+REPLAY_PATH = os.environ.get('AFD_REPLAY')
+# Modo de blit dos frames do jogador (AFD_BLIT): 'plain' (padrão), 'premul', 'rle', ou
+#   'auto' para o mais rápido por animação medido por benchmarks.blit_modes; veja
+#   blit_modes.py
+BLIT_MODE = os.environ.get('AFD_BLIT', 'plain')
+# Captura dos frames desenhados (AFD_CAPTURE): arquivo .raw (vídeo cru) ou pasta de PNGs;
+# junto com AFD_REPLAY roda sem limite de FPS, um tick por frame; veja capture.py
+CAPTURE_PATH = os.environ.get('AFD_CAPTURE')
+# Mundo maior que a tela, com câmera e fundo em ladrilhos (AFD_WORLD=1, ou quantas vezes a
+# sequência de mapas se repete); veja world.py
+WORLD = os.environ.get('AFD_WORLD')
 
 # Função principal
 def main():
     screen, clock = init_pygame()
-    background = pygame.image.load(os.path.join(base, 'Mapa', 'mapa4.jpg')).convert()
-    background = pygame.transform.scale(background, screen.get_size())
-    orig_background = background
-    mapa3 = pygame.image.load(os.path.join(base, 'Mapa', 'mapa3.jpg')).convert()
-    mapa3 = pygame.transform.scale(mapa3, screen.get_size())
-
-    sound_sharingan = pygame.mixer.Sound(os.path.join(base, 'Sons', 'sharingan.mp3'))
-    sound_raikiri = pygame.mixer.Sound(os.path.join(base, 'Sons', 'raikiri.mp3'))
-
-    sound_sharingan.set_volume(0.5)
-    sound_raikiri.set_volume(0.5)
-
-    scale = 4.0
-    frames = {
-        State.IDLE: load_frames(stand_folder, 'stand', 6, scale),
-        State.IDLE_LEFT: load_frames(stand_left_folder, 'stand', 6, scale),
-        State.WALK_RIGHT: load_frames(walk_r_folder, 'walk', 6, scale),
-        State.WALK_LEFT: load_frames(walk_l_folder, 'walk', 6, scale),
-        State.RUN_RIGHT: load_frames(run_r_folder, 'run', 6, scale),
-        State.RUN_LEFT: load_frames(run_l_folder, 'run', 6, scale),
-        State.CROUCH: load_frames(crouch_folder, 'crouch', 2, scale),
-        State.CROUCH_LEFT: load_frames(crouch_left_folder, 'crouch', 2, scale),
-        State.CROUCH_WALK: load_frames(crouch_walk_folder, 'crouchWalk', 6, scale),
-        State.CROUCH_WALK_LEFT: load_frames(crouch_walk_left, 'crouchWalk', 6, scale),
-        State.JUMP: load_frames(jump_r_folder, 'jump', 4, scale),
-        State.JUMP_LEFT: load_frames(jump_l_folder, 'jump', 4, scale),
-        State.RAIKIRI: load_frames(raikiri_r_folder, 'raikiri', 26, scale),
-        State.RAIKIRI_LEFT: load_frames(raikiri_l_folder, 'raikiri', 26, scale),
-        State.ATTACK: load_frames(attack_r_folder, 'attack1', 13, scale),
-        State.ATTACK_LEFT: load_frames(attack_l_folder, 'attack1', 13, scale),
-        State.ATTACK_CROUCH: load_frames(attack_c_folder,'attack(crouch)', 5, scale),
-        State.ATTACK_CROUCH_LEFT: load_frames(attack_c_l_folder, 'attack(crouch)', 5, scale),
-        State.ATTACK_RUN: load_frames(attack_run_folder, 'attack(run)', 6, scale),
-        State.ATTACK_RUN_LEFT: load_frames(attack_run_l_folder, 'attack(run)', 6, scale),
-        State.ATTACK_UP: load_frames(attack_up_folder, 'attack(up)', 5, scale),
-        State.ATTACK_UP_LEFT: load_frames(attack_up_l_folder, 'attack(up)', 5, scale),
-        State.SHARINGAN: load_frames(sharingan_r_folder,'sharingan', 21, scale),
-        State.SHARINGAN_LEFT: load_frames(sharingan_l_folder, 'sharingan', 21,scale),
-        State.WIN: load_frames(win_r_folder, 'win', 11, scale),
-        State.WIN_LEFT: load_frames(win_l_folder, 'win', 11, scale),
-        State.NINDOG_RIGHT: load_frames(nindog_r_folder, 'ninDogs', 25, scale),
-        State.NINDOG_LEFT: load_frames(nindog_l_folder, 'ninDogs', 25, scale),
-    }
-
-    state = State.IDLE
-    frame_index = 0
-    tick = 0
-    x_pos = screen.get_width() // 2
-    y_pos = screen.get_height() - 50
-    jump_timer = 0
+    # superfície de desenho: a própria tela ou, no modo 'lowres', uma 4× menor ampliada no fim
+    if RENDER_MODE == 'lowres':
+        renderer = LowResRenderer(screen, factor=4)
+    elif RENDER_MODE == 'dirty':
+        renderer = DirtyRectRenderer(screen)
+    else:
+        renderer = FullRenderer(screen)
+    # a arte é desenhada 4× maior; no modo 'lowres' quem amplia é o renderer
+    scale = 4.0 / renderer.factor
+    mapa4_path = os.path.join(base, 'Mapa', 'mapa4.jpg')
+    mapa3_path = os.path.join(base, 'Mapa', 'mapa3.jpg')
+    sharingan_path = os.path.join(base, 'Sons', 'sharingan.mp3')
+    raikiri_path = os.path.join(base, 'Sons', 'raikiri.mp3')
+    loader = None
+
+    if LOADER_WORKERS:
+        # tudo é lido nas threads; o jogo começa assim que parado/andando estiverem prontos
+        loader = AssetLoader(int(LOADER_WORKERS))
+        loader.add_image('mapa4', mapa4_path, renderer.size)
+        loader.add_image('mapa3', mapa3_path, renderer.size)
+        loader.add_sound('sharingan', sharingan_path, 0.5)
+        loader.add_sound('raikiri', raikiri_path, 0.5)
+        loader.add_animations(scale, mirrors=MIRRORS if MIRROR_MODE != 'files' else None)
+        essentials = ('mapa4', 'mapa3', 'sharingan', 'raikiri', *ESSENTIAL_STATES)
+        if REPLAY_PATH:
+            # no replay quem decide os vetos é a gravação: tudo precisa estar carregado
+            essentials += tuple(ANIMATIONS)
+        if not run_loading_screen(screen, clock, loader, essentials):
+            pygame.quit()
+            return
+        orig_background = loader.images['mapa4']
+        mapa3 = loader.images['mapa3']
+        sound_sharingan = loader.sounds['sharingan']
+        sound_raikiri = loader.sounds['raikiri']
+        frames = loader.frames
+    else:
+        background = pygame.image.load(mapa4_path).convert()
+        background = pygame.transform.scale(background, renderer.size)
+        orig_background = background
+        mapa3 = pygame.image.load(mapa3_path).convert()
+        mapa3 = pygame.transform.scale(mapa3, renderer.size)
+
+        sound_sharingan = pygame.mixer.Sound(sharingan_path)
+        sound_raikiri = pygame.mixer.Sound(raikiri_path)
+
+        sound_sharingan.set_volume(0.5)
+        sound_raikiri.set_volume(0.5)
+
+        if STORE_BUDGET_MB:
+            mirrors = MIRRORS if MIRROR_MODE != 'files' else None
+            frames = AnimationStore(make_loader(scale, mirrors=mirrors), ANIMATIONS,
+                                    int(float(STORE_BUDGET_MB) * 1024 * 1024), transitions,
+                                    pinned=(State.IDLE, State.IDLE_LEFT))
+            frames.prefetch(State.IDLE)
+        elif MIRROR_MODE == 'files':
+            frames = load_cached_frames(scale, renderer.size)
+        else:
+            frames = load_cached_frames(scale, renderer.size, right_facing())
+            frames = mirror_frames(frames) if MIRROR_MODE == 'flip' else MirroredFrames(frames)
+
+    # com o mundo ligado o personagem anda até o fim dele, não só até a borda da tela
+    width = screen.get_width()
+    tiles = camera = None
+    if WORLD:
+        world = World(WORLD_MAPS, renderer.size[1], int(WORLD))
+        tiles = TileCache(world, renderer.size)
+        camera = Camera(renderer.size[0], world.width)
+        width = world.width * renderer.factor
+
+    crowd = None
+    if CROWD_SIZE:
+        from collision import MaskCache, SpatialHash, crowd_hits, is_attacking
+        from crowd import KAKASHI, PAKKUN, Crowd, load_pakkun_frames
+        crowd = Crowd(int(CROWD_SIZE), width, screen.get_height())
+        # a multidão pode estar em qualquer estado: precisa de todas as animações residentes
+        complete = isinstance(frames, dict) and len(frames) == len(ANIMATIONS)
+        skins = {KAKASHI: frames if complete else load_cached_frames(scale, renderer.size),
+                 PAKKUN: load_pakkun_frames(scale)}
+        crowd.bind(skins)
+        # máscaras para os ataques do jogador contra a multidão, montadas no carregamento;
+        # com todas as animações residentes o jogador usa as mesmas do Kakashi da multidão
+        crowd_masks = tuple(MaskCache(skins[kind]) for kind in (KAKASHI, PAKKUN))
+        for masks in crowd_masks:
+            masks.prebuild()
+        player_masks = crowd_masks[KAKASHI] if complete else MaskCache(frames)
+        grid = SpatialHash()
+
+    draw_frames = None
+    if BLIT_MODE != 'plain':
+        if BLIT_MODE == 'auto':
+            draw_frames = DrawFrames(frames, load_choices())
+        else:
+            draw_frames = DrawFrames(frames, {}, default=BLIT_MODE)
+        # com AFD_MIRROR=draw as variantes da esquerda são feitas no primeiro desenho
+        if isinstance(frames, dict) and not isinstance(frames, MirroredFrames):
+            draw_frames.prebuild()
+
+    particles = None
+    if PARTICLES:
+        from particles import PARTICLE_CAPACITY, ParticleSystem
+        particles = ParticleSystem(PARTICLES if PARTICLES > 1 else PARTICLE_CAPACITY)
+
+    playback = Playback(Recording(REPLAY_PATH)) if REPLAY_PATH else None
+    # no replay a área vem da gravação: o limite da tela muda x_pos
+    if playback is not None:
+        area = (playback.recording.width, playback.recording.height)
+    else:
+        area = (width, screen.get_height())
+    game = GameState(*area)
     running = True
     fade_duration = 300  # duração do fade em ms
-    fade_start = 0
-
-    sharingan_triggered = False  # já disparamos a troca?
-    sharingan_start = 0  # hora em que trocamos o mapa
-    raikiri_start = 0
-    drucao_mapa3_ms = 20000  # 20 000 ms = 20 segundos (ajuste para 15000 se quiser 15 s)
-    raikiri_anim_rate_fast = max(1, frame_rates['sharingan'] // 2)  # animação 2× mais rápida
-    raikiri_move_speed_slow = 25  # pixels por tick (menor que 8)
-
+    fullscreen = FullscreenCache()  # frames finais do Sharingan já escalados para a tela
+    queue = RenderQueue(renderer.size)  # o que é desenhado além do jogador, por camada
+    # animação ainda carregando em segundo plano: ignora a entrada
+    can_enter = frames.__contains__
+
+
+    timestep = FixedTimestep()
+    prev_pos = (game.x_pos, game.y_pos)
+    profiler = FrameProfiler(enabled=PROFILE not in ('', '0'), trace=PROFILE_TRACE is not None)
+    inputs = InputBuffer(COMBO_MS)
+    recorder = Recorder(*area) if RECORD_PATH else None
+    if recorder is not None:
+        can_enter = recorder.wrap_can_enter(can_enter)
+    # últimos segundos de snapshots para voltar no tempo com BACKSPACE; desligado ao
+    # gravar ou repetir, que precisam de uma sequência contínua de ticks
+    history = SnapshotRing() if recorder is None and playback is None else None
+    # capturando um replay: cada frame é exatamente um tick, sem esperar o relógio, e
+    # nenhum frame é descartado
+    uncapped = CAPTURE_PATH is not None and playback is not None
+    capture = FrameCapture(screen, CAPTURE_PATH, lossless=uncapped) if CAPTURE_PATH else None
+    mark = profiler.mark
 
     while running:
-        pygame.event.pump()
-        keys = pygame.key.get_pressed()
-
-
-        # Determina símbolo de entrada
-        entrada = None
-        shift = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
-
-        if state not in (
-                State.JUMP, State.JUMP_LEFT,
-                State.ATTACK, State.ATTACK_LEFT,
-                State.ATTACK_CROUCH, State.ATTACK_CROUCH_LEFT,
-                State.ATTACK_RUN, State.ATTACK_RUN_LEFT
-        ):
-            if keys[pygame.K_SPACE]:
-                entrada, jump_timer = 'SPACE', jump_duration
-            elif keys[pygame.K_p]:
-                entrada = 'P'
-            elif keys[pygame.K_u]:
-                entrada = 'U'
-            elif keys[pygame.K_m]:
-                entrada = 'M'
-            elif keys[pygame.K_j] and not sharingan_triggered:
-                entrada = 'J'
-            elif keys[pygame.K_h]:
-                entrada = 'H'
-            elif keys[pygame.K_r] and keys[pygame.K_t]:
-                entrada = 'R+T'
-            elif keys[pygame.K_s] and keys[pygame.K_a]:
-                entrada = 'S+A'
-            elif keys[pygame.K_s] and keys[pygame.K_d]:
-                entrada = 'S+D'
-            elif keys[pygame.K_s]:
-                entrada = 'S'
-            elif shift and keys[pygame.K_a]:
-                entrada = 'SHIFT+A'
-            elif shift and keys[pygame.K_d]:
-                entrada = 'SHIFT+D'
-            elif keys[pygame.K_a]:
-                entrada = 'A'
-            elif keys[pygame.K_d]:
-                entrada = 'D'
-
-        # Atualiza estado (δ)
-        prev = state
-        state = transitions.get((state, entrada),
-                                 transitions.get((state, None), State.IDLE))
-        if state != prev:
-            frame_index = 0
-            tick = 0
-
-        # Atualiza frame
-        rate = (
-            frame_rates['attack'] if state in (State.ATTACK, State.ATTACK_LEFT) else
-            frame_rates['crouch_attack'] if state in (State.ATTACK_CROUCH, State.ATTACK_CROUCH_LEFT) else
-            frame_rates['run_attack'] if state in (State.ATTACK_RUN, State.ATTACK_RUN_LEFT) else
-            frame_rates['up_attack'] if state in (State.ATTACK_UP, State.ATTACK_UP_LEFT) else
-            frame_rates['sharingan'] if state in (State.SHARINGAN, State.SHARINGAN_LEFT) else
-            frame_rates['default']
-        )
-        if tick % rate == 0 and state not in (State.RAIKIRI, State.RAIKIRI_LEFT):
-            if state in (State.ATTACK_RUN, State.ATTACK_RUN_LEFT):
-                if frame_index + 1 < len(frames[state]):
-                    frame_index += 1
-                else:
-                    # ao fim do ataque correndo, volta a correr
-                    state = State.RUN_RIGHT if state == State.ATTACK_RUN else State.RUN_LEFT
-                    frame_index = 0
-                    tick = 0
-
-            elif state in (State.ATTACK_UP, State.ATTACK_UP_LEFT):
-                if frame_index + 1 < len(frames[state]):
-                    frame_index += 1
-                else:
-                    state = State.IDLE if state == State.ATTACK_UP else State.IDLE_LEFT
-                    frame_index, tick = 0, 0
-            elif state in (State.NINDOG_RIGHT, State.NINDOG_LEFT):
-                total = len(frames[state])  # 25
-                # avança um frame a cada tick compatível com a sua taxa default:
-                if tick % frame_rates['sharingan'] == 0:
-                    frame_index += 1
-                # quando passar do último, volta ao idle correspondente
-                if frame_index >= total:
-                    state = State.IDLE if state == State.NINDOG_RIGHT else State.IDLE_LEFT
-                    frame_index = 0
-                    tick = 0
-            elif state in (State.CROUCH, State.CROUCH_LEFT):
-                frame_index = min(frame_index + 1, len(frames[state]) - 1)
-            elif state in (State.ATTACK, State.ATTACK_LEFT):
-                # avança somente se houver próximo frame, senão retorna a idle
-                if frame_index + 1 < len(frames[state]):
-                    frame_index += 1
-                else:
-                    state = State.IDLE if state == State.ATTACK else State.IDLE_LEFT
-                    frame_index = 0
-                    tick = 0
-            elif state in (State.SHARINGAN, State.SHARINGAN_LEFT):
-                # se estiver nos quadros 19,20 ou 21, aplica o SLOW_FACTOR
-                if frame_index == 18:
-                    current_rate = frame_rates['sharingan'] * 35
-                elif frame_index == 19:
-                    current_rate = frame_rates['sharingan']
-                elif frame_index in (20,21):
-                    current_rate = frame_rates['sharingan'] * 70
-                else:
-                    current_rate = frame_rates['sharingan']
-
-                if tick % current_rate == 0:
-                    frame_index += 1
-                    # quando acabar a animação, volta a idle
-                    if frame_index >= len(frames[state]):
-                        state = State.IDLE if state == State.SHARINGAN else State.IDLE_LEFT
-                        frame_index = tick = 0
-            elif state in (State.WIN, State.WIN_LEFT):
-                if frame_index + 1 < len(frames[state]):
-                    if tick % frame_rates['default'] == 0:
-                        frame_index += 1
-                else:
-                    pygame.time.delay(1000)
-                    pygame.quit()
-                    sys.exit()
-            elif state in (State.ATTACK_CROUCH, State.ATTACK_CROUCH_LEFT):
-                # avança somente se houver próximo frame, senão retorna ao crouch
-                if frame_index + 1 < len(frames[state]):
-                    frame_index += 1
-                else:
-                    if state == State.ATTACK_CROUCH:
-                        state = State.CROUCH
-                        frame_index = len(frames[State.CROUCH]) - 1
-                    else:
-                        state = State.CROUCH_LEFT
-                        frame_index = len(frames[State.CROUCH_LEFT]) - 1
-                    tick = 0
-            else:
-                # outras animações ciclam normalmente
-                frame_index = (frame_index + 1) % len(frames[state])
-
-        # garantia extra: nunca saia dos limites
-        frame_index = max(0, min(frame_index, len(frames[state]) - 1))
-
-
-
-
-        # Física do pulo e movimento
-        jump_offset = 0
-        if state in (State.JUMP, State.JUMP_LEFT):
-            if jump_timer > 0:
-                prog = 1 - (jump_timer / jump_duration)
-                jump_offset = -math.sin(prog * math.pi) * jump_height
-                jump_timer -= 1
-                # Flipping de direção no ar
-                if keys[pygame.K_a] and state == State.JUMP:
-                    state = State.JUMP_LEFT
-                elif keys[pygame.K_d] and state == State.JUMP_LEFT:
-                    state = State.JUMP
-                # Movimento horizontal no ar
-                if shift and keys[pygame.K_a]:
-                    x_pos -= run_speed
-                elif shift and keys[pygame.K_d]:
-                    x_pos += run_speed
-                elif keys[pygame.K_a]:
-                    x_pos -= walk_speed
-                elif keys[pygame.K_d]:
-                    x_pos += walk_speed
-            else:
-                state = State.IDLE if state == State.JUMP else State.IDLE_LEFT
-                frame_index = tick = 0
-        elif state in (State.RAIKIRI, State.RAIKIRI_LEFT):
-            # 1) marca início e toca som apenas uma vez
-            if frame_index == 0 and raikiri_start == 0:
-                raikiri_start = pygame.time.get_ticks()
-                sound_raikiri.play()
-
-            now = pygame.time.get_ticks()
-            elapsed = now - raikiri_start
-
-            # 2) primeiros 11 frames em 3 segundos
-            if frame_index < 11:
-                frame_index = min(int((elapsed / 3000) * 11), 11)
-
-                # animação rápida depois do 11
-            elif tick % raikiri_anim_rate_fast == 0:
-                frame_index += 1
-
-                # movimento reduzido (mas animação mais rápida) a partir do 11
-            if frame_index >= 11:
-                if state == State.RAIKIRI:
-                    x_pos += raikiri_move_speed_slow
-                else:
-                    x_pos -= raikiri_move_speed_slow
-
-                # final da animação…
-            if frame_index >= len(frames[state]):
-                state = State.IDLE if state == State.RAIKIRI else State.IDLE_LEFT
-                frame_index = tick = 0
-                raikiri_start = 0
+        profiler.begin_frame()
+        timer = mark if profiler.enabled else None
+        renderer.timer = timer
+        # tempo real desde o último desenho (clock.tick(60) também limita o desenho a 60 FPS);
+        # se o desenho atrasar, rodam vários ticks antes do próximo frame
+        if uncapped:
+            clock.tick()
+            steps = timestep.advance(TICK_MS)
         else:
-            # Movimento no chão
-            if state == State.WALK_RIGHT:
-                x_pos += walk_speed
-            elif state == State.WALK_LEFT:
-                x_pos -= walk_speed
-            elif state == State.RUN_RIGHT:
-                x_pos += run_speed
-            elif state == State.RUN_LEFT:
-                x_pos -= run_speed
-            elif state == State.CROUCH_WALK:
-                x_pos += crouch_walk_speed
-            elif state == State.CROUCH_WALK_LEFT:
-                x_pos -= crouch_walk_speed
-
-        # Manter dentro da tela
-        x_pos = max(0, min(x_pos, screen.get_width()))
-
-        # —————— lógica de troca de mapa no Sharingan ——————
-        # se estou em SHARINGAN e atingi o frame 19 e ainda não troquei
-        if state in (State.SHARINGAN, State.SHARINGAN_LEFT) and frame_index == 19 and not sharingan_triggered:
-            sharingan_triggered = True
-            sound_sharingan.play()
-            sharingan_start = pygame.time.get_ticks()
-
-
-        # enquanto durar o periodo, mantenho mapa3
-        if sharingan_triggered:
-            if pygame.time.get_ticks() - sharingan_start <= drucao_mapa3_ms:
-                current_background = mapa3
+            steps = timestep.advance(clock.tick(60))
+        mark('wait')
+        # a fila de eventos é esvaziada uma vez por frame
+        queued = pygame.event.get()
+        inputs.feed(queued, time.perf_counter() * 1000)
+        for ev in queued:
+            if ev.type == pygame.QUIT:
+                running = False
+            elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_F3:
+                profiler.toggle()
+        mark('input')
+
+        replayed = playback.ticks if playback is not None else 0
+        for _ in range(steps):
+            prev_pos = (game.x_pos, game.y_pos + game.jump_offset)
+            prev = game.state
+            if history is not None:
+                if 'REWIND' in inputs.pressed():
+                    if history:
+                        timestep.time_ms, snap = history.pop()
+                        game.restore(snap)
+                    # o toque foi visto: sem isso REWIND ficaria travado até o próximo tick normal
+                    inputs.consume(False)
+                    mark('update')
+                    continue
+                history.push((timestep.time_ms, game.snapshot()))
+            now = timestep.tick()
+            tick_can_enter = can_enter
+            if playback is not None:
+                recorded = playback.next()
+                if recorded is None:
+                    running = False
+                    break
+                inp, vetoed = recorded
+                # só a gravação decide: o que está carregado agora depende do tempo
+                tick_can_enter = veto if vetoed else allow
             else:
-                # volta ao original após expirar
-                current_background = orig_background
-                sharingan_triggered = False
+                inp = inputs.read(game)
+            mark('input')
+            events = step(game, inp, now, can_enter=tick_can_enter, timer=timer)
+            inputs.consume(game.state != prev)
+            if playback is not None:
+                playback.check(game)
+            if recorder is not None:
+                recorder.add(inp, game)
+            if crowd is not None:
+                crowd.think()
+                crowd.step(now)
+                if is_attacking(game):
+                    # frame do ataque onde ele seria desenhado, contra a multidão
+                    attack = frames[game.state][game.frame_index].get_rect(midbottom=renderer.to_target(
+                        (game.x_pos, game.y_pos + game.jump_offset)))
+                    mask, box = player_masks.get(game.state, game.frame_index)
+                    hits = crowd_hits(crowd, crowd_masks, grid, mask, box, attack, renderer.factor)
+                    if hits:
+                        crowd.knock(hits, game.x_pos)
+                mark('crowd')
+            if particles is not None:
+                particles.emit_for(game)
+                particles.update()
+                mark('particles')
+            if game.state != prev:
+                if isinstance(frames, AnimationStore):
+                    frames.prefetch(game.state)
+                if game.state in (State.SHARINGAN, State.SHARINGAN_LEFT):
+                    fullscreen.prebuild(game.state, frames[game.state], renderer.size)
+            if EVENT_RAIKIRI in events:
+                sound_raikiri.play()
+            if EVENT_SHARINGAN in events:
+                sound_sharingan.play()
+            if EVENT_WIN in events:
+                running = False
+            mark('update')
+            if not running:
+                break
+        # a gravação acabou sem nenhum tick novo neste frame: desenhar repetiria o frame
+        # anterior, e a captura teria um frame a mais que os ticks
+        if playback is not None and not running and playback.ticks == replayed:
+            break
+
+        state, frame_index = game.state, game.frame_index
+        # posição interpolada entre o tick anterior e o atual
+        blend = timestep.alpha
+        pos = renderer.to_target((lerp(prev_pos[0], game.x_pos, blend),
+                                  lerp(prev_pos[1], game.y_pos + game.jump_offset, blend)))
+        offset = 0
+        if camera is not None:
+            # o mundo, a multidão e as partículas ficam em coordenadas do mundo; a câmera
+            # desloca tudo pelo mesmo número inteiro de pixels
+            offset = camera.follow(pos[0])
+            tiles.prefetch(offset, camera.direction)
+            pos = (pos[0] - offset, pos[1])
+            current_background = mapa3 if game.mapa3_active else WorldView(tiles, offset)
         else:
-            # se não estiver numa sessão de Sharingan ativa, garanto o fundo normal
-            current_background = orig_background
+            current_background = mapa3 if game.mapa3_active else orig_background
 
         # Desenho final
-        screen.blit(current_background, (0, 0))
-
+        is_fullscreen = False
+        full = None
         if state in (State.SHARINGAN, State.SHARINGAN_LEFT):
             total = len(frames[state])
 
             # Se estiver no frame 19 (índice 18, já que começa em 0)
-            if frame_index == 18:
-                now = pygame.time.get_ticks()
-                if fade_start == 0:
-                    fade_start = now
-                elapsed = now - fade_start
+            alpha = None
+            if frame_index == SHARINGAN_FADE_FRAME:
+                now = timestep.time_ms
+                if game.fade_start == 0:
+                    game.fade_start = now
                 # calcula alpha entre 0 e 255
-                alpha = min(255, int((elapsed / fade_duration) * 255))
-                surf = frames[state][frame_index].copy()
-                surf.set_alpha(alpha)
+                alpha = fade_alpha(now - game.fade_start, fade_duration)
             else:
-                # fora do fade, desenha normalmente e reseta fade_start
-                surf = frames[state][frame_index]
-                fade_start = 0
-
-            # se for um dos 3 últimos frames, desenha full-screen
-            if frame_index >= total - 3:
-                full = pygame.transform.scale(surf, screen.get_size())
-                screen.blit(full, (0, 0))
-            else:
-                rect = surf.get_rect(midbottom=(x_pos, y_pos + jump_offset))
-                screen.blit(surf, rect)
+                # fora do fade, reseta fade_start
+                game.fade_start = 0
+
+            # se for um dos 3 últimos frames, desenha full-screen (escalado uma vez só);
+            # o frame do fade (SHARINGAN_FADE_FRAME) é sempre um deles
+            if frame_index >= total - SHARINGAN_FULLSCREEN_FRAMES:
+                full = fullscreen.get(state, frame_index, frames[state], renderer.size)
+                # fade por alpha de superfície, sem copiar o frame a cada tick
+                set_surface_alpha(full, alpha)
+
+        if full is not None:
+            surf, rect, is_fullscreen = full, full.get_rect(), True
         else:
             surf = frames[state][frame_index]
-            rect = surf.get_rect(midbottom=(x_pos, y_pos + jump_offset))
-            screen.blit(surf, rect)
-
-        pygame.display.flip()
-
-        tick += 1
-        clock.tick(60)
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                running = False
-
+            rect = surf.get_rect(midbottom=pos)
+            if draw_frames is not None:
+                surf = draw_frames.get(state, frame_index)
+
+        if crowd is not None:
+            crowd.submit(queue, renderer.factor, offset)
+        if particles is not None:
+            particles.submit(queue, renderer.factor, offset)
+        mark('compose')
+        profiler.submit_hud(queue, LAYER_HUD, max(10, 16 // renderer.factor))
+        mark('hud')
+        renderer.present(current_background, surf, rect, is_fullscreen, queue)
+        inputs.presented(time.perf_counter() * 1000)
+        mark('flip')
+        if capture is not None:
+            capture.grab(screen)
+            mark('capture')
+        if isinstance(frames, AnimationStore):
+            frames.pump()
+        if loader is not None and not loader.finished:
+            loader.poll()
+        if tiles is not None:
+            tiles.pump()
+        mark('stream')
+        profiler.end_frame(timestep.time_ms, game.state, game.frame_index, steps)
+
+    if isinstance(frames, AnimationStore):
+        print("AnimationStore:", frames.stats())
+    if tiles is not None:
+        print("Mundo (ladrilhos):", tiles.stats())
+    if inputs.latencies:
+        print("Entrada (latência ms p50/p95/p99 do aperto ao frame):", inputs.stats())
+    if recorder is not None:
+        recorder.save(RECORD_PATH)
+        print(f"Gravação: {recorder.ticks} ticks em {RECORD_PATH}")
+    if playback is not None:
+        print(f"Replay: {playback.ticks} ticks,",
+              "idêntico à gravação" if playback.matches else "DIVERGIU da gravação")
+    if capture is not None:
+        capture.close()
+        print("Captura (grab ms p50/p95/p99 no loop principal):", capture.stats())
+        if capture.raw:
+            print("Para virar vídeo:", capture.ffmpeg_command())
+    if timestep.skipped or timestep.dropped_ms:
+        print("FixedTimestep:", timestep.stats())
+    if profiler.frame:
+        print("FrameProfiler (ms p50/p95/p99):",
+              {phase: tuple(round(v, 2) for v in p) for phase, p in profiler.summary().items()})
+        if PROFILE_TRACE:
+            profiler.save(PROFILE_TRACE)
+    if loader is not None:
+        loader.shutdown()
     pygame.quit()
 
 
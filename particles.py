@@ -0,0 +1,203 @@
+# Partículas dos golpes especiais (raios do Raikiri, poeira do Nindog, faíscas da troca
+# de mapa do Sharingan). Posição, velocidade, vida e cor ficam em arrays NumPy e são
+# atualizadas de uma vez; o desenho acumula todas numa grade com bincount, escreve a
+# grade numa superfície com uma chamada surfarray e a soma à cena com um blit aditivo.
+from typing import NamedTuple
+
+import sys
+
+import numpy as np
+import pygame
+
+from afd import State
+from render import LAYER_EFFECTS
+from timestep import TICK_MS
+
+PARTICLE_CAPACITY = 200_000
+# lado em pixels de tela de cada ponto da grade: 4, um pixel da arte (os frames são
+# ampliados 4×); no modo 'lowres' a grade é a própria superfície de desenho
+PARTICLE_CELL = 4
+
+
+# Fonte de partículas presa a estados e a um intervalo de frames
+class Emitter(NamedTuple):
+    states: tuple
+    first_frame: int = 0       # emite com frame_index entre first_frame e last_frame
+    last_frame: int = 10_000
+    rate: float = 0            # partículas por tick enquanto a condição vale
+    burst: int = 0             # partículas de uma vez no primeiro tick da condição
+    offset: tuple = (0, 0)     # do pé do personagem, em pixels de tela (x espelhado à esquerda)
+    spread: float = 0          # raio da área de nascimento
+    speed: tuple = (0, 0)      # pixels de tela por segundo
+    angle: tuple = (0, 360)    # graus; 0 aponta para a frente do personagem, 90 para cima
+    life_ms: tuple = (200, 400)
+    gravity: float = 0         # pixels por segundo², positivo para baixo
+    colors: tuple = ((255, 255, 255),)
+
+
+_LEFT_STATES = {State.RAIKIRI_LEFT, State.NINDOG_LEFT, State.SHARINGAN_LEFT}
+
+EMITTERS = (
+    # rastro elétrico da investida do Raikiri, a partir do frame 11
+    Emitter((State.RAIKIRI, State.RAIKIRI_LEFT), first_frame=11, rate=60, offset=(110, -110),
+            spread=30, speed=(40, 260), angle=(120, 240), life_ms=(120, 320),
+            colors=((170, 210, 255), (120, 170, 255), (240, 250, 255))),
+    # faíscas que pulam da mão
+    Emitter((State.RAIKIRI, State.RAIKIRI_LEFT), first_frame=11, rate=15, offset=(130, -110),
+            spread=10, speed=(300, 700), life_ms=(80, 200), gravity=900,
+            colors=((255, 255, 255), (200, 230, 255))),
+    # poeira dos cães ninja
+    Emitter((State.NINDOG_RIGHT, State.NINDOG_LEFT), rate=20, offset=(0, -10), spread=200,
+            speed=(20, 90), angle=(30, 150), life_ms=(400, 900), gravity=-40,
+            colors=((110, 90, 60), (90, 75, 55), (130, 110, 80))),
+    # explosão vermelha na troca para o mapa3 (frame 19 do Sharingan)
+    Emitter((State.SHARINGAN, State.SHARINGAN_LEFT), first_frame=19, last_frame=19, burst=4000,
+            offset=(0, -220), spread=20, speed=(200, 1400), life_ms=(300, 900), gravity=300,
+            colors=((255, 40, 30), (200, 0, 0), (255, 120, 80))),
+)
+
+
+class ParticleSystem:
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=0, cell=PARTICLE_CELL):
+        self.rng = np.random.default_rng(seed)
+        self.capacity = capacity
+        self.cell = cell
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.rgb = np.zeros((3, capacity))  # um array por canal
+        self.columns = (self.x, self.y, self.vx, self.vy, self.gravity, self.life, self.max_life, *self.rgb)
+        self.active = {}  # emissor -> já estava ativo no tick anterior (para o burst)
+        self.dropped = 0  # partículas não emitidas por falta de espaço
+        self.grid = None   # canais da grade como bytes de pixels de 32 bits
+        self.small = None  # grade (surfarray) e a mesma ampliada, reaproveitadas entre frames
+        self.big = None
+
+    def __len__(self):
+        return self.count
+
+    # `n` partículas de `emitter` nascendo em volta de (x, y) em pixels de tela
+    def emit(self, emitter, n, x, y, facing=1):
+        room = self.capacity - self.count
+        if n > room:
+            self.dropped += n - room
+            n = room
+        if n <= 0:
+            return
+        rng = self.rng
+        s = slice(self.count, self.count + n)
+        radius = emitter.spread * np.sqrt(rng.random(n))
+        around = rng.uniform(0, 2 * np.pi, n)
+        self.x[s] = x + facing * emitter.offset[0] + radius * np.cos(around)
+        self.y[s] = y + emitter.offset[1] + radius * np.sin(around)
+        speed = rng.uniform(*emitter.speed, n)
+        angle = np.radians(rng.uniform(*emitter.angle, n))
+        self.vx[s] = facing * speed * np.cos(angle)
+        self.vy[s] = -speed * np.sin(angle)
+        self.gravity[s] = emitter.gravity
+        self.life[s] = self.max_life[s] = rng.uniform(*emitter.life_ms, n)
+        palette = np.array(emitter.colors, dtype=np.float64)
+        self.rgb[:, s] = palette[rng.integers(0, len(palette), n)].T
+        self.count += n
+
+    # Emissores ligados ao estado/frame do personagem neste tick
+    def emit_for(self, game, emitters=EMITTERS):
+        state, frame = game.state, game.frame_index
+        for emitter in emitters:
+            on = state in emitter.states and emitter.first_frame <= frame <= emitter.last_frame
+            was_on = self.active.get(emitter, False)
+            self.active[emitter] = on
+            if not on:
+                continue
+            n = emitter.rate
+            if emitter.burst and not was_on:
+                n += emitter.burst
+            # taxa fracionária: o resto vira uma partícula com a probabilidade certa
+            n = int(n) + (self.rng.random() < n - int(n))
+            if n:
+                facing = -1 if state in _LEFT_STATES else 1
+                self.emit(emitter, n, game.x_pos, game.y_pos + game.jump_offset, facing)
+
+    # Avança todas `dt_ms` e remove as que morreram
+    def update(self, dt_ms=TICK_MS):
+        n = self.count
+        if not n:
+            return
+        dt = dt_ms / 1000
+        vy = self.vy[:n]
+        vy += self.gravity[:n] * dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += vy * dt
+        life = self.life[:n]
+        life -= dt_ms
+        alive = life > 0
+        keep = int(alive.sum())
+        if keep < n:
+            for column in self.columns:
+                column[:keep] = column[:n][alive]
+            self.count = keep
+
+    def clear(self):
+        self.count = 0
+
+    # Grade w×h e a ampliada `cell` vezes, como recortes de superfícies que só crescem
+    def _buffers(self, w, h, cell):
+        small = self.small
+        if small is None or w > small.get_width() or h > small.get_height():
+            w_max = max(w, small.get_width() if small else 0)
+            h_max = max(h, small.get_height() if small else 0)
+            self.small = small = pygame.Surface((w_max, h_max), depth=32)
+            self.big = None
+            # byte de cada canal dentro do pixel, na ordem da memória
+            shifts = small.get_shifts()[:3]
+            self.bytes = [s // 8 if sys.byteorder == 'little' else 3 - s // 8 for s in shifts]
+        if cell == 1:
+            return small.subsurface((0, 0, w, h)), None
+        if self.big is None or self.big.get_width() != small.get_width() * cell:
+            self.big = pygame.Surface((small.get_width() * cell, small.get_height() * cell), depth=32)
+        return small.subsurface((0, 0, w, h)), self.big.subsurface((0, 0, w * cell, h * cell))
+
+    # Acumula as partículas na grade e envia à fila de desenho como um blit aditivo;
+    # `factor` converte pixels de tela para a superfície de desenho, e `camera` é o
+    # deslocamento da câmera do mundo em pixels dela
+    def submit(self, queue, factor=1, camera=0, layer=LAYER_EFFECTS):
+        n = self.count
+        if not n:
+            return
+        cell = max(1, self.cell // factor)  # lado do ponto na superfície de desenho
+        step = factor * cell                # lado do ponto em pixels de tela
+        x, y = self.x[:n], self.y[:n]
+        if camera:
+            x = x - camera * factor
+        inside = (x >= 0) & (y >= 0) & (x < queue.width * factor) & (y < queue.height * factor)
+        kept = int(inside.sum())
+        if not kept:
+            return
+        fade = self.life[:n] / self.max_life[:n]
+        rgb = self.rgb[:, :n]
+        if kept < n:
+            x, y, fade, rgb = x[inside], y[inside], fade[inside], rgb[:, inside]
+        # positivos: a conversão para inteiro já arredonda para baixo
+        gx = (x * (1 / step)).astype(np.int64)
+        gy = (y * (1 / step)).astype(np.int64)
+        x0, y0 = int(gx.min()), int(gy.min())
+        w, h = int(gx.max()) - x0 + 1, int(gy.max()) - y0 + 1
+        flat = (gx - x0) * h + (gy - y0)  # surfarray usa [x, y]
+        small, big = self._buffers(w, h, cell)
+        # soma por ponto da grade, canal a canal, direto nos bytes do pixel
+        grid = self.grid
+        if grid is None or len(grid) < w * h:
+            grid = self.grid = np.zeros((w * h, 4), dtype=np.uint8)
+        grid = grid[:w * h]
+        for channel, byte in zip(rgb, self.bytes):
+            total = np.bincount(flat, weights=channel * fade, minlength=w * h)
+            grid[:, byte] = np.minimum(total, 255, out=total)
+        pygame.surfarray.blit_array(small, grid.view(np.uint32).reshape(w, h))
+        if big is not None:
+            pygame.transform.scale(small, big.get_size(), big)
+        queue.submit(big or small, (x0 * cell, y0 * cell), layer, special_flags=pygame.BLEND_ADD)
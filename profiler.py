@@ -0,0 +1,131 @@
+# Perfil por fase do loop principal: cada fase é medida com perf_counter_ns, as
+# últimas `window` medições dão p50/p95/p99 para o overlay e, com `trace`, cada frame
+# vira uma linha do trace (CSV ou JSON) com o estado e o frame da animação ativos.
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+# Fases na ordem em que acontecem num frame
+PHASES = (
+    'wait',     # clock.tick(): espera do limite de FPS
+    'input',    # eventos, teclado e escolha do símbolo
+    'delta',    # consulta da tabela δ
+    'advance',  # avanço de frame da animação
+    'physics',  # pulo, Raikiri, movimento, troca de mapa
+    'crowd',    # multidão
+    'particles',  # emissão e avanço das partículas
+    'update',   # sons, pré-carga e pré-escala ao trocar de estado
+    'compose',  # fundo, frame (e a escala do Sharingan em tela cheia), fila de desenho
+    'hud',      # overlay do perfil
+    'blit',     # blits do renderer
+    'flip',     # pygame.display.flip()/update()
+    'capture',  # cópia da tela para a captura
+    'stream',   # AnimationStore.pump(), AssetLoader.poll() e pré-carga dos ladrilhos do mundo
+)
+HUD_REFRESH = 30  # frames entre atualizações do overlay
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=300, trace=False):
+        self.enabled = enabled
+        self.window = {phase: deque(maxlen=window) for phase in PHASES + ('total',)}
+        # (frame, ms de simulação, estado, frame_index, ticks, ns por fase..., total); só
+        # guardado com `trace`, para não crescer a sessão inteira sem ter onde ser gravado
+        self.trace = [] if trace else None
+        self.current = dict.fromkeys(PHASES, 0)
+        self.frame = 0
+        self.t_frame = self.t_last = 0
+        self.hud = None
+        self.font = None
+        self.font_size = None
+        self.starting = False  # ligado no meio de um frame: mede a partir do próximo
+
+    def toggle(self):
+        self.starting = not (self.enabled or self.starting)
+        self.enabled = False
+        self.hud = None
+
+    def begin_frame(self):
+        if self.starting:
+            self.enabled, self.starting = True, False
+        if not self.enabled:
+            return
+        self.t_frame = self.t_last = time.perf_counter_ns()
+        for phase in self.current:
+            self.current[phase] = 0
+
+    # Soma à `phase` o tempo desde a marca anterior
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.current[phase] += now - self.t_last
+        self.t_last = now
+
+    def end_frame(self, sim_ms, state, frame_index, steps):
+        if not self.enabled:
+            return
+        total = time.perf_counter_ns() - self.t_frame
+        values = [self.current[phase] for phase in PHASES]
+        for phase, ns in zip(PHASES, values):
+            self.window[phase].append(ns)
+        self.window['total'].append(total)
+        if self.trace is not None:
+            self.trace.append((self.frame, round(sim_ms, 1), state.name, frame_index, steps, *values, total))
+        self.frame += 1
+
+    # {fase: (p50, p95, p99)} em ms sobre a janela
+    def summary(self):
+        result = {}
+        for phase, values in self.window.items():
+            ordered = sorted(values)
+            result[phase] = tuple(percentile(ordered, p) / 1e6 for p in (50, 95, 99))
+        return result
+
+    # ----- overlay -----
+    # Envia o overlay para a fila de desenho; o texto é refeito a cada HUD_REFRESH frames
+    def submit_hud(self, queue, layer, font_size=16):
+        if not self.enabled:
+            return
+        if self.hud is None or self.frame % HUD_REFRESH == 0:
+            self.hud = self.render_hud(font_size)
+        queue.submit(self.hud, (4, 4), layer)
+
+    def render_hud(self, font_size=16):
+        if font_size != self.font_size:
+            self.font = pygame.font.SysFont('monospace', font_size)
+            self.font_size = font_size
+        lines = [f"{'fase':<8}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, (p50, p95, p99) in self.summary().items():
+            lines.append(f"{phase:<8}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        rows = [self.font.render(line, True, (230, 230, 230)) for line in lines]
+        line_h = self.font.get_linesize()
+        hud = pygame.Surface((max(r.get_width() for r in rows) + 8, line_h * len(rows) + 8))
+        hud.fill((0, 0, 0))
+        hud.set_alpha(190)
+        for i, row in enumerate(rows):
+            hud.blit(row, (4, 4 + i * line_h))
+        return hud
+
+    # ----- trace -----
+    # Grava o trace por frame em CSV ou JSON (pela extensão); tempos em microssegundos
+    def save(self, path):
+        header = ('frame', 'sim_ms', 'state', 'frame_index', 'ticks', *PHASES, 'total')
+        rows = [(*row[:5], *(round(ns / 1000, 1) for ns in row[5:])) for row in self.trace]
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({'unit': 'us', 'frames': [dict(zip(header, row)) for row in rows]}, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
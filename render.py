@@ -0,0 +1,261 @@
+# Utilitários de desenho
+import pygame
+
+from assets import FlipCache
+from blit_modes import blit_frame
+
+# Os últimos frames do Sharingan ocupam a tela inteira; o primeiro deles faz fade-in
+SHARINGAN_FULLSCREEN_FRAMES = 3
+SHARINGAN_FADE_FRAME = 18
+
+
+# True se todos os pixels da superfície forem totalmente opacos
+def is_opaque(surf):
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return True
+    return pygame.mask.from_surface(surf, 254).count() == surf.get_width() * surf.get_height()
+
+
+# Versões em tela cheia de frames escolhidos, escaladas uma vez por resolução
+class FullscreenCache:
+    def __init__(self):
+        self.size = None
+        self.surfaces = {}
+
+    def _check_size(self, size):
+        if size != self.size:
+            self.surfaces.clear()
+            self.size = size
+
+    # Escala de uma vez os últimos `count` frames da animação (chamar ao entrar no estado)
+    def prebuild(self, state, frames, size, count=SHARINGAN_FULLSCREEN_FRAMES):
+        self._check_size(size)
+        for i in range(len(frames) - count, len(frames)):
+            self.get(state, i, frames, size)
+
+    def get(self, state, index, frames, size):
+        self._check_size(size)
+        full = self.surfaces.get((state, index))
+        if full is None:
+            surf = frames[index].padded()
+            full = pygame.transform.scale(surf, size)
+            if is_opaque(surf):
+                # sem alpha por pixel o blit vira cópia e o fade usa só o alpha da superfície
+                full = full.convert()
+            self.surfaces[(state, index)] = full
+        return full
+
+
+# Alpha do fade-in: 0 no início, 255 depois de `duration` ms
+def fade_alpha(elapsed, duration):
+    return min(255, int((elapsed / duration) * 255))
+
+# Aplica o alpha do fade; com 255 (ou None) o blend é desligado e o blit volta a ser cópia
+def set_surface_alpha(surf, alpha):
+    surf.set_alpha(None if alpha is None or alpha >= 255 else alpha)
+
+
+# Desenha o fundo inteiro ou só `area`: uma Surface do tamanho da tela ou um fundo com
+# draw(target, area), como o world.WorldView do mundo com câmera
+def draw_background(target, background, area=None):
+    if isinstance(background, pygame.Surface):
+        return target.blit(background, area or (0, 0), area)
+    return background.draw(target, area)
+
+
+# Camadas da fila de desenho, de trás para a frente; o jogador é desenhado pelo
+# renderer entre as camadas abaixo de LAYER_PLAYER e as demais
+LAYER_CROWD = 0
+LAYER_PLAYER = 1
+LAYER_EFFECTS = 2
+LAYER_HUD = 3
+
+
+# Fila de desenho: as entidades enviam (superfície, posição, camada, virar) durante o
+# frame; o renderer esvazia a fila com uma chamada Surface.blits (ou fblits, no
+# pygame-ce) por camada, em ordem. Sprites totalmente fora da tela são descartados no envio.
+# Itens com special_flags (ex.: BLEND_ADD das partículas) vão como (superfície,
+# posição, None, flags) e a camada deles usa sempre blits, que aceita flags por item.
+class RenderQueue:
+    def __init__(self, size, flip_cache=None):
+        self.width, self.height = size
+        self.layers = {}  # camada -> lista de (superfície, posição)
+        self.blended = set()  # camadas com itens de special_flags
+        self.flips = flip_cache if flip_cache is not None else FlipCache(256)
+        self.submitted = 0
+        self.culled = 0
+        self.calls = 0
+
+    def __len__(self):
+        return sum(len(batch) for batch in self.layers.values())
+
+    def submit(self, surf, pos, layer=LAYER_CROWD, flip=False, special_flags=0):
+        x, y = pos
+        self.submitted += 1
+        if x >= self.width or y >= self.height or x + surf.get_width() <= 0 or y + surf.get_height() <= 0:
+            self.culled += 1
+            return
+        if flip:
+            surf = self.flips.get(surf)
+        batch = self.layers.get(layer)
+        if batch is None:
+            batch = self.layers[layer] = []
+        if special_flags:
+            batch.append((surf, pos, None, special_flags))
+            self.blended.add(layer)
+        else:
+            batch.append((surf, pos))
+
+    # Envio em bloco de (superfície, posição) já recortados pela tela (ex.: multidão)
+    def extend(self, items, layer=LAYER_CROWD, culled=0):
+        self.submitted += len(items) + culled
+        self.culled += culled
+        self.layers.setdefault(layer, []).extend(items)
+
+    # Desenha e remove as camadas até `max_layer` (todas, se None), da de trás para a frente
+    def flush(self, target, max_layer=None):
+        blits = getattr(target, 'fblits', None)
+        for layer in sorted(self.layers):
+            if max_layer is not None and layer > max_layer:
+                break
+            batch = self.layers.pop(layer)
+            if not batch:
+                continue
+            if blits is not None and layer not in self.blended:
+                blits(batch)
+            else:
+                self.blended.discard(layer)
+                target.blits(batch, False)
+            self.calls += 1
+
+    def clear(self):
+        self.layers.clear()
+        self.blended.clear()
+
+
+# Desenho completo: fundo inteiro + sprite e flip() da tela toda a cada frame
+class FullRenderer:
+    factor = 1
+    timer = None  # FrameProfiler.mark: separa os blits do flip()
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.target = screen
+        self.size = screen.get_size()
+        self.pixels_pushed = 0
+
+    # Converte um ponto em unidades de tela para unidades da superfície de desenho
+    def to_target(self, pos):
+        return pos
+
+    def invalidate(self):
+        pass
+
+    # `surf`: frame do jogador (Surface ou blit_modes.DrawFrame), `rect`: retângulo do frame
+    # original; `queue`: RenderQueue com o que fica atrás e na frente do jogador (multidão, efeitos)
+    def present(self, background, surf, rect, fullscreen=False, queue=None):
+        draw_background(self.screen, background)
+        if queue:
+            queue.flush(self.screen, LAYER_PLAYER - 1)
+        blit_frame(self.screen, surf, rect)
+        if queue:
+            queue.flush(self.screen)
+        if self.timer is not None:
+            self.timer('blit')
+        pygame.display.flip()
+        self.pixels_pushed += self.screen.get_width() * self.screen.get_height()
+
+
+# Retângulos sujos: só restaura do fundo a área antiga do sprite, desenha a nova e
+# atualiza essas áreas com display.update(rects). Redesenha tudo quando o fundo troca
+# (mapa3 do Sharingan e a volta, ou a câmera do mundo andou) e nos frames em tela cheia.
+class DirtyRectRenderer:
+    factor = 1
+    timer = None
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.target = screen
+        self.size = screen.get_size()
+        self.background = None
+        self.prev_rect = None
+        self.full = True
+        self.pixels_pushed = 0
+
+    def to_target(self, pos):
+        return pos
+
+    # Força um redesenho completo no próximo frame
+    def invalidate(self):
+        self.full = True
+
+    # com a fila de desenho ocupada (multidão) a tela toda muda a cada frame: sempre redesenha tudo
+    def present(self, background, surf, rect, fullscreen=False, queue=None):
+        screen = self.screen
+        if self.full or fullscreen or queue or background != self.background:
+            draw_background(screen, background)
+            if queue:
+                queue.flush(screen, LAYER_PLAYER - 1)
+            blit_frame(screen, surf, rect)
+            if queue:
+                queue.flush(screen)
+            if self.timer is not None:
+                self.timer('blit')
+            pygame.display.flip()
+            self.pixels_pushed += screen.get_width() * screen.get_height()
+            self.background = background
+            # depois de um frame em tela cheia o próximo também precisa ser completo
+            self.full = fullscreen or bool(queue)
+            self.prev_rect = rect
+            return
+
+        prev = self.prev_rect
+        draw_background(screen, background, prev)
+        blit_frame(screen, surf, rect)
+        bounds = screen.get_rect()
+        if prev.colliderect(rect):
+            dirty = [prev.union(rect).clip(bounds)]
+        else:
+            dirty = [prev.clip(bounds), rect.clip(bounds)]
+        if self.timer is not None:
+            self.timer('blit')
+        pygame.display.update(dirty)
+        self.pixels_pushed += sum(r.width * r.height for r in dirty)
+        self.prev_rect = rect
+
+
+# Resolução interna baixa: a cena é montada numa superfície `factor` vezes menor que a
+# tela, com os sprites no tamanho original da arte, e ampliada uma vez por frame
+# (vizinho mais próximo) direto na tela. A simulação continua em unidades de tela.
+class LowResRenderer:
+    timer = None
+
+    def __init__(self, screen, factor=4):
+        self.screen = screen
+        self.factor = factor
+        w, h = screen.get_size()
+        self.size = (w // factor, h // factor)
+        self.target = pygame.Surface(self.size).convert()
+        scaled = (self.size[0] * factor, self.size[1] * factor)
+        # área da tela que recebe a ampliação, centralizada se a tela não for múltipla do fator
+        self.view = screen.subsurface(pygame.Rect(((w - scaled[0]) // 2, (h - scaled[1]) // 2), scaled))
+        self.pixels_pushed = 0
+
+    def to_target(self, pos):
+        return (round(pos[0] / self.factor), round(pos[1] / self.factor))
+
+    def invalidate(self):
+        pass
+
+    def present(self, background, surf, rect, fullscreen=False, queue=None):
+        draw_background(self.target, background)
+        if queue:
+            queue.flush(self.target, LAYER_PLAYER - 1)
+        blit_frame(self.target, surf, rect)
+        if queue:
+            queue.flush(self.target)
+        pygame.transform.scale(self.target, self.view.get_size(), self.view)
+        if self.timer is not None:
+            self.timer('blit')
+        pygame.display.flip()
+        self.pixels_pushed += self.screen.get_width() * self.screen.get_height()
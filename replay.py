@@ -0,0 +1,219 @@
+# Gravação compacta da entrada de cada tick e replay determinístico.
+# Grava o Input que foi para simulation.step() (símbolo + A/D/SHIFT do controle no ar)
+# e se a troca de estado foi vetada naquele tick (animação ainda carregando). A
+# maioria dos ticks repete a entrada anterior, então o arquivo guarda corridas.
+# Junto vai um CRC32 da sequência (estado, frame, x_pos) da gravação: o replay sem
+# tela refaz os mesmos ticks e confere o CRC.
+#
+# Formato (little-endian):
+#   cabeçalho: magic 'AFDR', versão u16, ticks por segundo u16, largura u32, altura u32,
+#              total de ticks u32, CRC32 u32 (na v1 largura e altura eram u16, o que não
+#              cabe num mundo com AFD_WORLD; a v1 continua sendo lida)
+#   corridas:  código u8 (índice do símbolo nos bits 0-3, A no 4, D no 5, SHIFT no 6,
+#              veto no 7) + quantidade de ticks em varint (LEB128)
+import os
+import struct
+import sys
+import zlib
+
+from afd import STATES, SYMBOL_INDEX, SYMBOLS
+from simulation import EVENT_WIN, GameState, Input, step
+from timestep import TICK_RATE, FixedTimestep
+
+REPLAY_MAGIC = b'AFDR'
+REPLAY_VERSION = 2
+
+_HEADER = struct.Struct('<4sHHIIII')
+_HEADERS = {1: struct.Struct('<4sHHHHII'), REPLAY_VERSION: _HEADER}
+_TICK = struct.Struct('<Bid')  # estado, frame, x_pos que entram no CRC
+
+_LEFT = 1 << 4
+_RIGHT = 1 << 5
+_SHIFT = 1 << 6
+_VETO = 1 << 7
+
+
+def encode_input(inp, vetoed=False):
+    code = SYMBOL_INDEX[inp.symbol]
+    if inp.left:
+        code |= _LEFT
+    if inp.right:
+        code |= _RIGHT
+    if inp.shift:
+        code |= _SHIFT
+    if vetoed:
+        code |= _VETO
+    return code
+
+def decode_input(code):
+    inp = Input(SYMBOLS[code & 0x0f], bool(code & _LEFT), bool(code & _RIGHT), bool(code & _SHIFT))
+    return inp, bool(code & _VETO)
+
+# CRC32 acumulado do que o tick deixou no estado do jogo
+def digest(crc, game):
+    return zlib.crc32(_TICK.pack(game.sid, game.frame_index, game.x_pos), crc)
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+class Recorder:
+    def __init__(self, width, height, tick_rate=TICK_RATE):
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.runs = bytearray()
+        self.code = None
+        self.count = 0
+        self.ticks = 0
+        self.crc = 0
+        self.vetoed = False
+
+    # Para usar como can_enter de step(): anota se a troca foi vetada neste tick
+    def wrap_can_enter(self, can_enter):
+        def recording_can_enter(state):
+            allowed = can_enter(state)
+            if not allowed:
+                self.vetoed = True
+            return allowed
+        return recording_can_enter
+
+    # Chamar depois de cada step() com a entrada usada
+    def add(self, inp, game):
+        code = encode_input(inp, self.vetoed)
+        self.vetoed = False
+        if code == self.code:
+            self.count += 1
+        else:
+            self._flush_run()
+            self.code, self.count = code, 1
+        self.ticks += 1
+        self.crc = digest(self.crc, game)
+
+    def _flush_run(self):
+        if self.count:
+            self.runs.append(self.code)
+            _write_varint(self.runs, self.count)
+
+    def save(self, path):
+        self._flush_run()
+        self.code, self.count = None, 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate, self.width,
+                                 self.height, self.ticks, self.crc))
+            f.write(self.runs)
+
+
+class Recording:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version = struct.unpack_from('<4sH', data, 0) if len(data) >= 6 else (None, None)
+        header = _HEADERS.get(version)
+        if magic != REPLAY_MAGIC or header is None:
+            raise ValueError(f"{path}: não é uma gravação AFDR v1 a v{REPLAY_VERSION}")
+        _, _, self.tick_rate, self.width, self.height, self.ticks, self.crc = header.unpack_from(data, 0)
+        self.runs = []  # (Input, vetado, ticks)
+        pos = header.size
+        while pos < len(data):
+            code = data[pos]
+            count, pos = _read_varint(data, pos + 1)
+            self.runs.append((*decode_input(code), count))
+        self.size = len(data)
+
+    # (Input, vetado) de cada tick
+    def inputs(self):
+        for inp, vetoed, count in self.runs:
+            for _ in range(count):
+                yield inp, vetoed
+
+
+def allow(state):
+    return True
+
+def veto(state):
+    return False
+
+
+# Entrada de uma gravação tick a tick, conferindo o CRC do que cada tick produziu
+class Playback:
+    def __init__(self, recording):
+        self.recording = recording
+        self._inputs = recording.inputs()
+        self.ticks = 0
+        self.crc = 0
+
+    # (Input, vetado) do próximo tick, ou None no fim da gravação
+    def next(self):
+        return next(self._inputs, None)
+
+    # Chamar depois de cada step()
+    def check(self, game):
+        self.crc = digest(self.crc, game)
+        self.ticks += 1
+
+    @property
+    def matches(self):
+        return self.ticks == self.recording.ticks and self.crc == self.recording.crc
+
+
+# Refaz a gravação sem tela e sem limite de FPS. `on_tick(i, game)`, se dado, é
+# chamado depois de cada tick. Devolve o Playback (ticks, CRC, matches) e se venceu
+def replay(recording, on_tick=None):
+    game = GameState(recording.width, recording.height)
+    timestep = FixedTimestep(recording.tick_rate)
+    playback = Playback(recording)
+    won = False
+    for inp, vetoed in recording.inputs():
+        events = step(game, inp, timestep.tick(), can_enter=veto if vetoed else allow)
+        playback.check(game)
+        if on_tick is not None:
+            on_tick(playback.ticks - 1, game)
+        if EVENT_WIN in events:
+            won = True
+    return playback, won
+
+
+# Uso: python replay.py gravação.afdr [--trace=saída.csv]
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--trace=')]
+    trace_path = next((a[8:] for a in sys.argv[1:] if a.startswith('--trace=')), None)
+    if len(args) != 1:
+        print("uso: python replay.py gravação.afdr [--trace=saída.csv]")
+        sys.exit(2)
+    recording = Recording(args[0])
+    rows = []
+    on_tick = None
+    if trace_path:
+        def on_tick(i, game):
+            rows.append(f"{i},{STATES[game.sid].name},{game.frame_index},{game.x_pos}")
+    playback, won = replay(recording, on_tick)
+    print(f"{playback.ticks} ticks em {len(recording.runs)} corridas ({recording.size} bytes), "
+          f"CRC {playback.crc:08x}, esperado {recording.crc:08x}")
+    if trace_path:
+        with open(trace_path, 'w') as f:
+            f.write("tick,state,frame_index,x_pos\n")
+            f.write('\n'.join(rows) + '\n')
+    if not playback.matches:
+        print("DIVERGIU da gravação")
+        sys.exit(1)
+    print("idêntico à gravação")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Histórico de snapshots do jogo para voltar no tempo (rewind) e para rollback:
+# com dois jogadores locais cuja entrada chega atrasada, a simulação segue com a
+# entrada prevista (a última confirmada) e, quando a confirmação discorda da
+# previsão, volta ao snapshot daquele tick e ressimula até o presente.
+from simulation import NO_INPUT, step
+from timestep import TICK_RATE, FixedTimestep
+
+REWIND_SECONDS = 5
+
+
+# Buffer circular de tamanho fixo: guarda os últimos `size` itens
+class SnapshotRing:
+    def __init__(self, size=REWIND_SECONDS * TICK_RATE):
+        self.items = [None] * size
+        self.size = size
+        self.head = 0  # posição do próximo push
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, item):
+        self.items[self.head] = item
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    # Item de `back` pushes atrás (1 = o último)
+    def get(self, back):
+        if not 0 < back <= self.count:
+            raise IndexError(back)
+        return self.items[(self.head - back) % self.size]
+
+    # Remove e devolve o último item
+    def pop(self):
+        item = self.get(1)
+        self.head = (self.head - 1) % self.size
+        self.count -= 1
+        return item
+
+    # Descarta os últimos `back` itens
+    def truncate(self, back):
+        back = min(back, self.count)
+        self.head = (self.head - back) % self.size
+        self.count -= back
+
+    def clear(self):
+        self.count = 0
+
+
+# Simulação de vários jogadores com rollback. Cada tick guarda o snapshot de todos
+# e as entradas usadas; confirm() registra a entrada real de um jogador para o
+# próximo tick dele ainda não confirmado, e update() faz o rollback pendente (no
+# máximo `history` ticks) antes de avançar um tick.
+class RollbackSession:
+    def __init__(self, games, history=TICK_RATE // 4, tick_rate=TICK_RATE):
+        self.games = games
+        self.history = history
+        self.timestep = FixedTimestep(tick_rate)
+        self.ring = SnapshotRing(history)  # (tempo, snapshots, entradas usadas) de cada tick
+        self.confirmed = [[] for _ in games]  # entradas confirmadas de cada jogador, por tick
+        self.tick = 0
+        self.dirty = None  # tick mais antigo com previsão errada
+        self.rollbacks = 0
+        self.resimulated = 0
+
+    # Entrada do jogador `player` no tick `tick`: a confirmada ou a última conhecida
+    def predict(self, player, tick):
+        confirmed = self.confirmed[player]
+        if tick < len(confirmed):
+            return confirmed[tick]
+        return confirmed[-1] if confirmed else NO_INPUT
+
+    def confirm(self, player, inp):
+        tick = len(self.confirmed[player])
+        self.confirmed[player].append(inp)
+        back = self.tick - tick
+        if back > 0:
+            if back > len(self.ring):
+                raise ValueError(f"entrada de {back} ticks atrás, histórico de {len(self.ring)}")
+            if self.ring.get(back)[2][player] != inp:
+                self.dirty = tick if self.dirty is None else min(self.dirty, tick)
+
+    def _step(self):
+        inputs = tuple(self.predict(p, self.tick) for p in range(len(self.games)))
+        self.ring.push((self.timestep.time_ms, tuple(g.snapshot() for g in self.games), inputs))
+        now = self.timestep.tick()
+        events = [step(game, inp, now) for game, inp in zip(self.games, inputs)]
+        self.tick += 1
+        return events
+
+    # Volta ao tick com previsão errada e ressimula até o presente
+    def rollback(self):
+        back = self.tick - self.dirty
+        self.dirty = None
+        time_ms, snaps, _ = self.ring.get(back)
+        self.ring.truncate(back)
+        for game, snap in zip(self.games, snaps):
+            game.restore(snap)
+        self.timestep.time_ms = time_ms
+        self.tick -= back
+        for _ in range(back):
+            self._step()
+        self.rollbacks += 1
+        self.resimulated += back
+
+    # Um tick novo; devolve os eventos de cada jogador
+    def update(self):
+        if self.dirty is not None:
+            self.rollback()
+        return self._step()
@@ -0,0 +1,370 @@
+# Núcleo da simulação: AFD + física do personagem, sem tela e sem display do pygame.
+# step() recebe o estado do jogo, a entrada do tick e o tempo atual em ms e
+# atualiza o estado; o desenho e os sons ficam com quem chama.
+import math
+from operator import attrgetter
+from typing import NamedTuple
+
+from afd import DELTA, STATE_INDEX, STATES, SYMBOL_INDEX, State, Symbol
+from assets import ANIMATIONS
+
+# Parâmetros (velocidades em pixels por tick, durações em ticks; um tick = 1/timestep.TICK_RATE s)
+crouch_walk_speed = 1.6
+walk_speed = 3
+run_speed = 10
+jump_height = 400
+jump_duration = 50  # frames
+frame_rates = {
+    'default':8,
+    'attack':4,
+    'crouch_attack':4,
+    'run_attack':4,
+    'up_attack':4,
+    'sharingan': 4,
+}
+drucao_mapa3_ms = 20000  # 20 000 ms = 20 segundos (ajuste para 15000 se quiser 15 s)
+raikiri_anim_rate_fast = max(1, frame_rates['sharingan'] // 2)  # animação 2× mais rápida
+raikiri_move_speed_slow = 25  # pixels por tick (menor que 8)
+win_hold_ms = 1000  # último frame da vitória fica na tela antes de encerrar
+
+# Quantidade de frames de cada animação (o mesmo que len(frames[state]))
+FRAME_COUNTS = {state: count for state, (_, _, count) in ANIMATIONS.items()}
+
+# Como cada estado avança os frames ao receber um tick da sua taxa
+LOOP = 0   # cicla
+HOLD = 1   # para no último frame (agachar)
+ONCE = 2   # toca uma vez e vai para `done`
+FINAL = 3  # toca uma vez, segura o último frame por win_hold_ms e encerra (vitória)
+TIMED = 4  # controlado pelo relógio, fora da escada de frames (Raikiri)
+
+# Movimento aplicado depois do frame
+GROUND = 0
+JUMP = 1
+RAIKIRI = 2
+
+
+# Registro de comportamento de um estado
+class StateInfo(NamedTuple):
+    rate: int              # ticks por frame
+    mode: int = LOOP
+    done: State = None     # para onde vai ao fim de ONCE/TIMED/pulo
+    done_last: bool = False  # entra em `done` no último frame (volta ao agachado)
+    dx: float = 0          # pixels por tick (no chão ou no Raikiri depois do frame 11)
+    motion: int = GROUND
+    hold: dict = None      # frame -> multiplicador da taxa (pausas do Sharingan)
+    trigger: int = -1      # frame que dispara a troca de mapa
+
+
+_rate = frame_rates['default']
+_sharingan_hold = {18: 35, 20: 70, 21: 70}
+STATE_INFO = {
+    State.IDLE: StateInfo(_rate),
+    State.IDLE_LEFT: StateInfo(_rate),
+    State.WALK_RIGHT: StateInfo(_rate, dx=walk_speed),
+    State.WALK_LEFT: StateInfo(_rate, dx=-walk_speed),
+    State.RUN_RIGHT: StateInfo(_rate, dx=run_speed),
+    State.RUN_LEFT: StateInfo(_rate, dx=-run_speed),
+    State.CROUCH: StateInfo(_rate, HOLD),
+    State.CROUCH_LEFT: StateInfo(_rate, HOLD),
+    State.CROUCH_WALK: StateInfo(_rate, dx=crouch_walk_speed),
+    State.CROUCH_WALK_LEFT: StateInfo(_rate, dx=-crouch_walk_speed),
+    State.JUMP: StateInfo(_rate, done=State.IDLE, motion=JUMP),
+    State.JUMP_LEFT: StateInfo(_rate, done=State.IDLE_LEFT, motion=JUMP),
+    State.RAIKIRI: StateInfo(_rate, TIMED, State.IDLE, dx=raikiri_move_speed_slow, motion=RAIKIRI),
+    State.RAIKIRI_LEFT: StateInfo(_rate, TIMED, State.IDLE_LEFT, dx=-raikiri_move_speed_slow, motion=RAIKIRI),
+    State.ATTACK: StateInfo(frame_rates['attack'], ONCE, State.IDLE),
+    State.ATTACK_LEFT: StateInfo(frame_rates['attack'], ONCE, State.IDLE_LEFT),
+    State.ATTACK_CROUCH: StateInfo(frame_rates['crouch_attack'], ONCE, State.CROUCH, done_last=True),
+    State.ATTACK_CROUCH_LEFT: StateInfo(frame_rates['crouch_attack'], ONCE, State.CROUCH_LEFT, done_last=True),
+    # ao fim do ataque correndo, volta a correr
+    State.ATTACK_RUN: StateInfo(frame_rates['run_attack'], ONCE, State.RUN_RIGHT),
+    State.ATTACK_RUN_LEFT: StateInfo(frame_rates['run_attack'], ONCE, State.RUN_LEFT),
+    State.ATTACK_UP: StateInfo(frame_rates['up_attack'], ONCE, State.IDLE),
+    State.ATTACK_UP_LEFT: StateInfo(frame_rates['up_attack'], ONCE, State.IDLE_LEFT),
+    # nos índices 18, 20 e 21 a animação fica mais lenta; no 19 troca o mapa
+    State.SHARINGAN: StateInfo(frame_rates['sharingan'], ONCE, State.IDLE, hold=_sharingan_hold, trigger=19),
+    State.SHARINGAN_LEFT: StateInfo(frame_rates['sharingan'], ONCE, State.IDLE_LEFT, hold=_sharingan_hold, trigger=19),
+    State.WIN: StateInfo(_rate, FINAL),
+    State.WIN_LEFT: StateInfo(_rate, FINAL),
+    State.NINDOG_RIGHT: StateInfo(_rate, ONCE, State.IDLE),
+    State.NINDOG_LEFT: StateInfo(_rate, ONCE, State.IDLE_LEFT),
+}
+
+
+# Tabela por índice de estado: (taxa, modo, done, frame ao entrar em done, dx,
+# movimento, hold, trigger, total de frames)
+def compile_state_info(info=STATE_INFO, frame_counts=FRAME_COUNTS):
+    table = []
+    for state in STATES:
+        rec = info[state]
+        done = STATE_INDEX[rec.done] if rec.done is not None else -1
+        done_frame = frame_counts[rec.done] - 1 if rec.done_last else 0
+        table.append((rec.rate, rec.mode, done, done_frame, rec.dx, rec.motion,
+                      rec.hold, rec.trigger, frame_counts[state]))
+    return table
+
+INFO = compile_state_info()
+_IDLE = STATE_INDEX[State.IDLE]
+_JUMP_RIGHT = STATE_INDEX[State.JUMP]
+_JUMP_LEFT = STATE_INDEX[State.JUMP_LEFT]
+# O pulo vira de lado no ar: só entra nele com os dois lados liberados por can_enter,
+# para a virada no mesmo tick da entrada não ser vetada depois da entrada permitida
+# (a gravação guarda um veto por tick, não por troca)
+_JUMP_PAIR = {_JUMP_RIGHT: STATES[_JUMP_LEFT], _JUMP_LEFT: STATES[_JUMP_RIGHT]}
+
+# Estados em que o teclado é ignorado até a animação acabar
+INPUT_BLOCKED = (
+    State.JUMP, State.JUMP_LEFT,
+    State.ATTACK, State.ATTACK_LEFT,
+    State.ATTACK_CROUCH, State.ATTACK_CROUCH_LEFT,
+    State.ATTACK_RUN, State.ATTACK_RUN_LEFT,
+)
+_INPUT_BLOCKED = frozenset(STATE_INDEX[state] for state in INPUT_BLOCKED)
+
+# Eventos devolvidos por step() para quem desenha/toca som
+EVENT_RAIKIRI = 'raikiri'      # início do Raikiri: tocar o som
+EVENT_SHARINGAN = 'sharingan'  # troca para o mapa3: tocar o som
+EVENT_WIN = 'win'              # vitória terminada: encerrar o jogo
+
+
+# Entrada de um tick: símbolo do AFD e as teclas usadas para controlar o pulo no ar
+class Input(NamedTuple):
+    symbol: Symbol = None
+    left: bool = False
+    right: bool = False
+    shift: bool = False
+
+
+NO_INPUT = Input()
+
+
+# Campos que mudam durante o jogo, na ordem do snapshot (a largura é fixa)
+SNAPSHOT_FIELDS = (
+    'sid', 'frame_index', 'tick', 'x_pos', 'y_pos', 'jump_timer', 'jump_offset',
+    'raikiri_start', 'win_at', 'sharingan_triggered', 'sharingan_start', 'mapa3_active',
+    'fade_start',
+)
+_snapshot = attrgetter(*SNAPSHOT_FIELDS)
+
+
+# Estado completo do personagem. Com __slots__ o registro tem layout fixo e
+# snapshot()/restore() copiam só uma tupla de valores imutáveis.
+class GameState:
+    __slots__ = ('width',) + SNAPSHOT_FIELDS
+
+    def __init__(self, width, height):
+        self.width = width  # limite horizontal do movimento
+        self.sid = _IDLE  # índice do estado em STATES
+        self.frame_index = 0
+        self.tick = 0
+        self.x_pos = width // 2
+        self.y_pos = height - 50
+        self.jump_timer = 0
+        self.jump_offset = 0
+        self.raikiri_start = 0
+        self.win_at = 0  # hora de encerrar depois da vitória (0 = não venceu)
+        self.sharingan_triggered = False  # já disparamos a troca?
+        self.sharingan_start = 0  # hora em que trocamos o mapa
+        self.mapa3_active = False
+        self.fade_start = 0  # início do fade do Sharingan (usado só no desenho)
+
+    @property
+    def state(self):
+        return STATES[self.sid]
+
+    @state.setter
+    def state(self, state):
+        self.sid = STATE_INDEX[state]
+
+    # Tupla com os valores de SNAPSHOT_FIELDS
+    def snapshot(self):
+        return _snapshot(self)
+
+    def restore(self, snap):
+        (self.sid, self.frame_index, self.tick, self.x_pos, self.y_pos, self.jump_timer,
+         self.jump_offset, self.raikiri_start, self.win_at, self.sharingan_triggered,
+         self.sharingan_start, self.mapa3_active, self.fade_start) = snap
+
+
+# Determina o símbolo de entrada a partir das teclas pressionadas
+# (`pressed`: conjunto com 'SPACE', 'P', 'U', 'M', 'J', 'H', 'R', 'T', 'S', 'A', 'D', 'SHIFT')
+def choose_symbol(pressed, game):
+    if game.sid in _INPUT_BLOCKED:
+        return None
+    shift = 'SHIFT' in pressed
+    if 'SPACE' in pressed:
+        return 'SPACE'
+    elif 'P' in pressed:
+        return 'P'
+    elif 'U' in pressed:
+        return 'U'
+    elif 'M' in pressed:
+        return 'M'
+    elif 'J' in pressed and not game.sharingan_triggered:
+        return 'J'
+    elif 'H' in pressed:
+        return 'H'
+    elif 'R' in pressed and 'T' in pressed:
+        return 'R+T'
+    elif 'S' in pressed and 'A' in pressed:
+        return 'S+A'
+    elif 'S' in pressed and 'D' in pressed:
+        return 'S+D'
+    elif 'S' in pressed:
+        return 'S'
+    elif shift and 'A' in pressed:
+        return 'SHIFT+A'
+    elif shift and 'D' in pressed:
+        return 'SHIFT+D'
+    elif 'A' in pressed:
+        return 'A'
+    elif 'D' in pressed:
+        return 'D'
+    return None
+
+def read_input(pressed, game):
+    return Input(choose_symbol(pressed, game), 'A' in pressed, 'D' in pressed, 'SHIFT' in pressed)
+
+
+# Avança a simulação um tick. `now` é o tempo de simulação em ms ao fim do tick
+# (FixedTimestep.tick() no jogo).
+# `can_enter(state)` pode vetar uma transição (ex.: animação ainda carregando): vale
+# para todas, inclusive o fim de ataques, a aterrissagem e a virada no ar. Vetada, a
+# animação segura o último frame (ou o pulo segue no chão) e tenta de novo no tick seguinte.
+# `timer(fase)`, se dado, é chamado ao fim de 'delta', 'advance' e 'physics' (FrameProfiler.mark).
+# Devolve uma tupla de eventos EVENT_*.
+def step(game, inp, now, can_enter=None, timer=None):
+    events = ()
+    sid = game.sid
+    frame_index = game.frame_index
+    tick = game.tick
+    x_pos = game.x_pos
+    entrada = inp.symbol
+    if entrada == 'SPACE':
+        game.jump_timer = jump_duration
+
+    # Atualiza estado (δ)
+    prev = sid
+    sid = DELTA[sid][SYMBOL_INDEX[entrada]]
+    if sid != prev:
+        if can_enter is not None and not (can_enter(STATES[sid]) and
+                                          (sid not in _JUMP_PAIR or can_enter(_JUMP_PAIR[sid]))):
+            sid = prev
+        else:
+            frame_index = 0
+            tick = 0
+    if timer is not None:
+        timer('delta')
+
+    # Atualiza frame
+    rate, mode, done, done_frame, dx, motion, hold, trigger, count = INFO[sid]
+    if tick % rate == 0 and mode != TIMED:
+        if mode == LOOP:
+            frame_index = (frame_index + 1) % count
+        elif mode == HOLD:
+            frame_index = min(frame_index + 1, count - 1)
+        elif mode == ONCE:
+            if hold is None or tick % (rate * hold.get(frame_index, 1)) == 0:
+                if frame_index + 1 < count:
+                    frame_index += 1
+                elif can_enter is None or can_enter(STATES[done]):
+                    sid, frame_index, tick = done, done_frame, 0
+                    rate, mode, done, done_frame, dx, motion, hold, trigger, count = INFO[sid]
+        elif frame_index + 1 < count:
+            frame_index += 1
+        elif game.win_at == 0:
+            game.win_at = now + win_hold_ms
+
+    # garantia extra: nunca saia dos limites
+    frame_index = max(0, min(frame_index, count - 1))
+    if game.win_at and now >= game.win_at:
+        events += (EVENT_WIN,)
+    if timer is not None:
+        timer('advance')
+
+    # Física do pulo e movimento
+    jump_offset = 0
+    if motion == GROUND:
+        x_pos += dx
+    elif motion == JUMP:
+        if game.jump_timer > 0:
+            prog = 1 - (game.jump_timer / jump_duration)
+            jump_offset = -math.sin(prog * math.pi) * jump_height
+            game.jump_timer -= 1
+            # Flipping de direção no ar
+            if inp.left and sid == _JUMP_RIGHT:
+                flip = _JUMP_LEFT
+            elif inp.right and sid == _JUMP_LEFT:
+                flip = _JUMP_RIGHT
+            else:
+                flip = sid
+            if flip != sid and (can_enter is None or can_enter(STATES[flip])):
+                sid = flip
+            # Movimento horizontal no ar
+            if inp.shift and inp.left:
+                x_pos -= run_speed
+            elif inp.shift and inp.right:
+                x_pos += run_speed
+            elif inp.left:
+                x_pos -= walk_speed
+            elif inp.right:
+                x_pos += walk_speed
+        elif can_enter is None or can_enter(STATES[done]):
+            sid, frame_index, tick = done, 0, 0
+    else:
+        # 1) marca início e toca som apenas uma vez
+        if frame_index == 0 and game.raikiri_start == 0:
+            game.raikiri_start = now
+            events += (EVENT_RAIKIRI,)
+
+        elapsed = now - game.raikiri_start
+
+        # 2) primeiros 11 frames em 3 segundos
+        if frame_index < 11:
+            frame_index = min(int((elapsed / 3000) * 11), 11)
+
+            # animação rápida depois do 11
+        elif tick % raikiri_anim_rate_fast == 0:
+            frame_index += 1
+
+            # movimento reduzido (mas animação mais rápida) a partir do 11
+        if frame_index >= 11:
+            x_pos += dx
+
+            # final da animação…
+        if frame_index >= count:
+            if can_enter is None or can_enter(STATES[done]):
+                sid, frame_index, tick = done, 0, 0
+                game.raikiri_start = 0
+            else:
+                frame_index = count - 1
+
+    # Manter dentro da tela
+    x_pos = max(0, min(x_pos, game.width))
+
+    # —————— lógica de troca de mapa no Sharingan ——————
+    # se atingi o frame do Sharingan que troca o mapa e ainda não troquei
+    if frame_index == trigger and not game.sharingan_triggered:
+        game.sharingan_triggered = True
+        events += (EVENT_SHARINGAN,)
+        game.sharingan_start = now
+
+    # enquanto durar o periodo, mantenho mapa3
+    if game.sharingan_triggered:
+        if now - game.sharingan_start <= drucao_mapa3_ms:
+            game.mapa3_active = True
+        else:
+            # volta ao original após expirar
+            game.mapa3_active = False
+            game.sharingan_triggered = False
+    else:
+        game.mapa3_active = False
+
+    game.sid = sid
+    game.frame_index = frame_index
+    game.tick = tick + 1
+    game.x_pos = x_pos
+    game.jump_offset = jump_offset
+    if timer is not None:
+        timer('physics')
+    return events
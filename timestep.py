@@ -0,0 +1,57 @@
+# Relógio de passo fixo: a simulação anda sempre em ticks de 1/TICK_RATE s de jogo,
+# independente de quantos frames por segundo o desenho consegue fazer. Quando o
+# desenho atrasa, vários ticks rodam antes do próximo desenho (frames pulados);
+# o resto que sobra no acumulador vira `alpha` para interpolar a posição.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+# folga para o arredondamento de float não adiar um tick que já venceu
+EPSILON = 1e-6
+
+
+class FixedTimestep:
+    def __init__(self, rate=TICK_RATE, max_steps=5):
+        self.step_ms = 1000 / rate
+        self.max_steps = max_steps  # ticks por desenho; acima disso o jogo desacelera
+        self.accumulator = 0.0
+        self.time_ms = 0.0   # tempo de simulação já percorrido
+        self.steps = 0
+        self.frames = 0
+        self.skipped = 0     # frames de desenho pulados (ticks extras num mesmo desenho)
+        self.dropped_ms = 0.0
+
+    # Soma `real_ms` de tempo real e devolve quantos ticks rodar antes de desenhar
+    def advance(self, real_ms):
+        self.accumulator += real_ms
+        steps = int((self.accumulator + EPSILON) // self.step_ms)
+        self.accumulator = max(0.0, self.accumulator - steps * self.step_ms)
+        if steps > self.max_steps:
+            # atraso grande demais (ex.: janela arrastada, carga): descarta o excesso
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+        self.frames += 1
+        self.skipped += max(0, steps - 1)
+        return steps
+
+    # Marca um tick executado e devolve o tempo de simulação ao fim dele (ms)
+    def tick(self):
+        self.steps += 1
+        self.time_ms += self.step_ms
+        return self.time_ms
+
+    # Fração do próximo tick já decorrida, para interpolar o desenho (0..1)
+    @property
+    def alpha(self):
+        return self.accumulator / self.step_ms
+
+    def stats(self):
+        return {
+            'steps': self.steps,
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'dropped_ms': round(self.dropped_ms, 1),
+        }
+
+
+# Interpolação linear entre a posição do tick anterior e a do atual
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
@@ -0,0 +1,189 @@
+# Mundo maior que a tela: os mapas lado a lado, cada um na altura da superfície de
+# desenho, e uma câmera que segue o personagem. O fundo é cortado em ladrilhos de
+# TILE_SIZE × TILE_SIZE, montados (escala + convert) uma vez quando chegam perto da tela
+# e guardados num LRU; cada frame desenha só os ladrilhos visíveis. Custo por frame e
+# memória dependem do tamanho da tela, não da largura do mundo: dos mapas fica só a
+# imagem original de cada arquivo, por menor que seja o pedaço do mundo que ela cobre.
+import math
+import os
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from typing import NamedTuple
+
+import pygame
+
+from assets import base
+
+TILE_SIZE = 256
+PREFETCH_COLUMNS = 2  # colunas de ladrilhos montadas à frente da câmera
+# Sequência de mapas, da esquerda para a direita; mapa3 continua sendo o fundo do
+# Sharingan. Sprite/Mapas só tem cópias idênticas de mapa1 a mapa3.
+WORLD_MAPS = tuple(os.path.join(base, 'Mapa', name) for name in ('mapa4.jpg', 'mapa1.jpg', 'mapa2.jpg'))
+
+
+# Um mapa no mundo: imagem original e faixa [x, x + width) em pixels da superfície de desenho
+class Segment(NamedTuple):
+    image: pygame.Surface
+    x: int
+    width: int
+
+
+# Os mapas de `paths` na altura `height`, em sequência repetida `repeat` vezes
+class World:
+    def __init__(self, paths=WORLD_MAPS, height=1080, repeat=1, tile=TILE_SIZE):
+        images = {}
+        self.segments = []
+        x = 0
+        for _ in range(repeat):
+            for path in paths:
+                img = images.get(path)
+                if img is None:
+                    img = images[path] = pygame.image.load(path).convert()
+                width = round(img.get_width() * height / img.get_height())
+                self.segments.append(Segment(img, x, width))
+                x += width
+        self.starts = [seg.x for seg in self.segments]
+        self.width = x
+        self.height = height
+        self.tile = tile
+        self.columns = math.ceil(x / tile)
+        self.rows = math.ceil(height / tile)
+
+    # Ladrilho (coluna, linha): o pedaço de cada mapa que cai nele, escalado a partir da
+    # região inteira da imagem original que o cobre e recortado pelo próprio blit
+    def build_tile(self, col, row):
+        t = self.tile
+        x0, y0 = col * t, row * t
+        w, h = min(t, self.width - x0), min(t, self.height - y0)
+        tile = pygame.Surface((w, h)).convert()
+        i = bisect_right(self.starts, x0) - 1
+        while i < len(self.segments) and self.segments[i].x < x0 + w:
+            img, sx, sw = self.segments[i]
+            iw, ih = img.get_size()
+            kx, ky = iw / sw, ih / self.height  # pixels da imagem por pixel do mundo
+            u0 = int((max(sx, x0) - sx) * kx)
+            u1 = min(iw, math.ceil((min(sx + sw, x0 + w) - sx) * kx))
+            v0 = int(y0 * ky)
+            v1 = min(ih, math.ceil((y0 + h) * ky))
+            part = pygame.transform.scale(img.subsurface((u0, v0, u1 - u0, v1 - v0)),
+                                          (round((u1 - u0) / kx), round((v1 - v0) / ky)))
+            tile.blit(part, (round(sx + u0 / kx) - x0, round(v0 / ky) - y0))
+            i += 1
+        return tile
+
+
+# Câmera horizontal, em pixels da superfície de desenho: centraliza o personagem sem
+# mostrar fora do mundo e lembra a direção do último movimento (para a pré-carga)
+class Camera:
+    def __init__(self, view_width, world_width):
+        self.view_width = view_width
+        self.world_width = world_width
+        self.x = 0
+        self.direction = 0
+
+    def follow(self, x):
+        new = max(0, min(int(x) - self.view_width // 2, self.world_width - self.view_width))
+        if new != self.x:
+            self.direction = 1 if new > self.x else -1
+            self.x = new
+        return new
+
+
+# LRU de ladrilhos do mundo para uma tela `view_size`. Por padrão cabem as colunas
+# visíveis e PREFETCH_COLUMNS de cada lado, para a volta não remontar o que acabou de sair.
+class TileCache:
+    def __init__(self, world, view_size, capacity=None, ahead=PREFETCH_COLUMNS):
+        self.world = world
+        self.view_width, self.view_height = view_size
+        self.ahead = ahead
+        if capacity is None:
+            capacity = (self.view_width // world.tile + 2 + 2 * ahead) * world.rows
+        self.capacity = capacity
+        self.tiles = OrderedDict()  # (coluna, linha) -> Surface
+        self.queue = deque()
+        self.hits = 0
+        self.misses = 0  # montados na hora do desenho
+        self.prefetched = 0
+        self.evictions = 0
+
+    def get(self, col, row):
+        key = (col, row)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        self.misses += 1
+        return self._build(key)
+
+    def _build(self, key):
+        tile = self.tiles[key] = self.world.build_tile(*key)
+        if len(self.tiles) > self.capacity:
+            self.tiles.popitem(last=False)
+            self.evictions += 1
+        return tile
+
+    # Desenha o mundo visto da câmera em `x`; com `area` (retângulo da tela) só os
+    # ladrilhos que cruzam essa área, recortados por ela
+    def draw(self, target, x, area=None):
+        world, t = self.world, self.world.tile
+        region = pygame.Rect(area) if area is not None else target.get_rect()
+        first = max(0, (x + region.left) // t)
+        last = min(world.columns - 1, (x + region.right - 1) // t)
+        rows = range(max(0, region.top // t), min(world.rows, (region.bottom - 1) // t + 1))
+        batch = [(self.get(col, row), (col * t - x, row * t))
+                 for col in range(first, last + 1) for row in rows]
+        if area is not None:
+            target.set_clip(region)
+        target.blits(batch, False)
+        end = world.width - x
+        if end < region.right:
+            # mundo mais estreito que a tela
+            target.fill((0, 0, 0), (end, region.top, region.right - end, region.height))
+        if area is not None:
+            target.set_clip(None)
+
+    # Enfileira os ladrilhos das colunas logo depois da borda da tela, na direção do
+    # movimento da câmera (chamar uma vez por frame, depois de Camera.follow)
+    def prefetch(self, x, direction):
+        self.queue.clear()
+        if not direction:
+            return
+        t = self.world.tile
+        if direction > 0:
+            edge = (x + self.view_width - 1) // t
+            cols = range(edge + 1, edge + 1 + self.ahead)
+        else:
+            edge = x // t
+            cols = range(edge - 1, edge - 1 - self.ahead, -1)
+        for col in cols:
+            if 0 <= col < self.world.columns:
+                self.queue.extend((col, row) for row in range(self.world.rows)
+                                  if (col, row) not in self.tiles)
+
+    # Monta até `max_builds` ladrilhos da fila (chamar uma vez por frame, fora do desenho)
+    def pump(self, max_builds=1):
+        built = 0
+        while self.queue and built < max_builds:
+            key = self.queue.popleft()
+            if key in self.tiles:
+                continue
+            self._build(key)
+            self.prefetched += 1
+            built += 1
+
+    def stats(self):
+        size = sum(tile.get_width() * tile.get_height() * tile.get_bytesize() for tile in self.tiles.values())
+        return {'hits': self.hits, 'misses': self.misses, 'prefetched': self.prefetched,
+                'evictions': self.evictions, 'resident': len(self.tiles),
+                'resident_mb': round(size / 2**20, 1)}
+
+
+# Fundo de um frame: o mundo visto da câmera. Dois iguais (mesmo cache, mesma posição)
+# dão a mesma imagem, o que o DirtyRectRenderer usa para saber se precisa redesenhar tudo.
+class WorldView(NamedTuple):
+    tiles: TileCache
+    x: int
+
+    def draw(self, target, area=None):
+        self.tiles.draw(target, self.x, area)